@@ -0,0 +1,154 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple, TypeVar
+
+import numpy as np
+import soundfile as sf
+
+from .resample import resample
+from .streaming import downmix
+
+T = TypeVar('T', bound='AudioCache')
+
+__all__ = ['AUDIO_CACHE_MAX_BYTES', 'AudioCache', 'audioCache']
+
+AUDIO_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class _Entry:
+    """One file's mono signals, by rate: only the ones callers asked for."""
+
+    def __init__(self, sr: int):
+        self.sr = sr  # the file's native rate
+        self.signals: Dict[int, np.ndarray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        return sum(sig.nbytes for sig in self.signals.values())
+
+
+class AudioCache:
+    """
+    Process-wide cache of decoded mono audio, keyed by (path, mtime, size).
+
+    The waveform reads a file's mono signal at its native rate and analysis reads it at the
+    analysis rate; each is decoded (downmixed, and resampled where needed) once and handed out
+    read-only, so consumers on different threads share one resident copy per rate. Nothing else
+    is kept: the multichannel decode is dropped after the downmix, and a resampled signal is kept
+    without its native-rate source unless that was requested too (a later native-rate request
+    decodes the file again). Concurrent requests for the same file wait for a single decode.
+    Files are evicted least-recently-used first once the cached signals exceed `maxBytes`;
+    callers still holding a signal keep it alive. Playback streams from the file (AudioEngine)
+    and does not go through the cache.
+    """
+
+    _instance: Optional[T] = None
+
+    @classmethod
+    def getInstance(cls) -> T:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, max_bytes: int = AUDIO_CACHE_MAX_BYTES):
+        self.maxBytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: 'OrderedDict[Tuple[str, int, int], _Entry]' = OrderedDict()
+        self._decodeLocks: Dict[Tuple[str, int, int], threading.Lock] = {}
+
+    def configure(self, max_bytes: Optional[int] = None) -> 'AudioCache':
+        """Set the memory budget in bytes (0 disables caching); evicts down to it right away."""
+        if max_bytes is not None:
+            with self._lock:
+                self.maxBytes = int(max_bytes)
+                self._evict()
+        return self
+
+    @staticmethod
+    def _key(file_path: str) -> Tuple[str, int, int]:
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+
+    def _evict(self):
+        # caller holds self._lock
+        total = sum(e.nbytes for e in self._entries.values())
+        while total > self.maxBytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            total -= evicted.nbytes
+
+    def _cached(self, key: Tuple[str, int, int], sr: Optional[int]) -> Optional[Tuple[np.ndarray, int]]:
+        # caller holds self._lock
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        rate = int(sr or entry.sr)
+        sig = entry.signals.get(rate)
+        if sig is None:
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return sig, rate
+
+    def mono(self, file_path: str, sr: Optional[int] = None) -> Tuple[np.ndarray, int]:
+        """
+        (sig, sr): read-only float32 mono `file_path` at `sr` (None: the native rate), downmixed
+        and polyphase-resampled once and cached.
+        """
+        key = self._key(file_path)
+        with self._lock:
+            cached = self._cached(key, sr)
+            if cached is not None:
+                return cached
+            decode_lock = self._decodeLocks.setdefault(key, threading.Lock())
+        with decode_lock:
+            with self._lock:
+                # decoded by another thread while we waited
+                cached = self._cached(key, sr)
+                if cached is not None:
+                    return cached
+                entry = self._entries.get(key)
+                native = entry.signals.get(entry.sr) if entry is not None else None
+            try:
+                if native is None:
+                    data, native_sr = sf.read(file_path, dtype='float32', always_2d=True)
+                    native = np.ascontiguousarray(downmix(data), dtype=np.float32)
+                    native.setflags(write=False)
+                    del data
+                else:
+                    native_sr = entry.sr
+                rate = int(sr or native_sr)
+                sig = native if rate == native_sr else resample(native, native_sr, rate)
+                sig.setflags(write=False)
+            finally:
+                with self._lock:
+                    self._decodeLocks.pop(key, None)
+            with self._lock:
+                self.misses += 1
+                entry = self._entries.get(key)
+                if entry is None:
+                    # a file rewritten in place (e.g. a new recording) supersedes its older decodes
+                    for stale in [k for k in self._entries if k[0] == key[0]]:
+                        del self._entries[stale]
+                    entry = self._entries[key] = _Entry(int(native_sr))
+                entry.signals[rate] = sig
+                self._entries.move_to_end(key)
+                self._evict()
+        return sig, rate
+
+    def clear(self):
+        """Drop every cached decode."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus the number and total size of cached files."""
+        with self._lock:
+            size = sum(e.nbytes for e in self._entries.values())
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries), 'bytes': size}
+
+
+audioCache = AudioCache.getInstance()
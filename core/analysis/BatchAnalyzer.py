@@ -0,0 +1,160 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+from .adaptive import COARSE_HOP_SEC
+from .cancel import AnalysisCancelled, check_cancelled
+from .FeatureCache import FeatureCache
+from .inference import DEFAULT_BATCH_SIZE
+from .models import MODELS_DIR
+from .ModelRegistry import modelRegistry
+from .pipeline import analyze_file, analyze_models
+from .resample import ANALYSIS_SR
+
+__all__ = ['AUDIO_EXTENSIONS', 'BatchAnalyzer', 'iter_audio_files']
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.flac')
+# thread pool sizes of the BLAS / OpenMP runtimes numpy, scipy and sklearn may load
+_BLAS_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'BLIS_NUM_THREADS')
+
+# per-process state, filled once by _init_worker
+_worker = {}
+
+
+def iter_audio_files(folder: str, recursive: bool = True) -> Iterator[str]:
+    """Audio files (AUDIO_EXTENSIONS) under `folder`, in sorted order."""
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(AUDIO_EXTENSIONS):
+                yield os.path.join(root, name)
+        if not recursive:
+            break
+
+
+def _limit_blas_threads():
+    """
+    One BLAS thread for this process: the pool already runs a worker per core, and a BLAS pool
+    per worker on top would oversubscribe the CPU. Libraries loaded from here on read the
+    environment; the ones already loaded (numpy's BLAS, at least) are limited through threadpoolctl.
+    """
+    for var in _BLAS_THREAD_VARS:
+        os.environ[var] = '1'
+    try:
+        from threadpoolctl import threadpool_limits
+    except ImportError:
+        return
+    threadpool_limits(limits=1)
+
+
+def _init_worker(
+    model_choice, model_dir, batch_size, use_cache, sample_rate, vad, adaptive, coarse_hop_sec, ensemble, streaming
+):
+    # runs once per worker process: load the models a single time and reuse them for every file
+    _limit_blas_threads()
+    registry = modelRegistry.configure(model_dir)
+    _worker['model_choice'] = model_choice
+    _worker['error'] = ''
+    try:
+        if isinstance(model_choice, str):
+            _worker['models'] = registry.get(model_choice)
+        else:
+            _worker['models'] = {choice: registry.get(choice) for choice in model_choice}
+    except RuntimeError as e:
+        # reported per file by _analyze rather than breaking the pool
+        _worker['error'] = str(e)
+    _worker['batch_size'] = batch_size
+    _worker['sample_rate'] = sample_rate
+    _worker['vad'] = vad
+    _worker['adaptive'] = adaptive
+    _worker['coarse_hop_sec'] = coarse_hop_sec
+    _worker['ensemble'] = ensemble
+    _worker['streaming'] = streaming
+    _worker['cache'] = None
+    if use_cache:
+        try:
+            _worker['cache'] = FeatureCache()
+        except Exception:
+            pass
+
+
+def _analyze(file_path):
+    if _worker['error']:
+        return file_path, {'ok': False, 'error': _worker['error'], 'cancelled': False, 'timeline': [], 'summary': {}}
+    if not isinstance(_worker['model_choice'], str):
+        return file_path, analyze_models(
+            file_path, _worker['models'], ensemble=_worker['ensemble'],
+            batch_size=_worker['batch_size'], streaming=_worker['streaming'], cache=_worker['cache'],
+            sample_rate=_worker['sample_rate'], vad=_worker['vad']
+        )
+    return file_path, analyze_file(
+        file_path, _worker['model_choice'], _worker['models'],
+        batch_size=_worker['batch_size'], streaming=_worker['streaming'], cache=_worker['cache'],
+        sample_rate=_worker['sample_rate'], vad=_worker['vad'], adaptive=_worker['adaptive'],
+        coarse_hop_sec=_worker['coarse_hop_sec']
+    )
+
+
+class BatchAnalyzer:
+    """
+    Scores many recordings in parallel across a ProcessPoolExecutor.
+
+    Each worker process loads the models once (pool initializer), limits itself to one BLAS
+    thread and then runs the UI-free analyze_file pipeline for every file it is handed. Results
+    are streamed back in completion order, so a caller can report progress or write output while
+    the rest is still running.
+    With a sequence of model choices, every file is featurized once and scored by each of them
+    (analyze_models; adaptive is ignored), plus an averaged ensemble with `ensemble`.
+    """
+
+    def __init__(
+        self, model_choice: Union[str, Sequence[str]] = 'knn', model_dir: Optional[str] = None,
+        max_workers: Optional[int] = None, batch_size: int = DEFAULT_BATCH_SIZE, use_cache: bool = True,
+        sample_rate: Optional[int] = ANALYSIS_SR, vad: bool = True, adaptive: bool = False,
+        coarse_hop_sec: float = COARSE_HOP_SEC, ensemble: bool = False, streaming: Optional[bool] = None
+    ):
+        self.modelChoice = model_choice if isinstance(model_choice, str) else tuple(model_choice)
+        self.modelDir = model_dir or MODELS_DIR
+        self.maxWorkers = max_workers or os.cpu_count() or 1
+        self.batchSize = batch_size
+        self.useCache = use_cache
+        self.sampleRate = sample_rate
+        self.vad = vad
+        self.adaptive = adaptive
+        self.coarseHopSec = coarse_hop_sec
+        self.ensemble = ensemble
+        self.streaming = streaming
+
+    def run(self, file_paths: Iterable[str], cancel=None) -> Iterator[Tuple[str, dict]]:
+        """
+        Analyze every file; yields (file_path, result) as each one finishes.
+        Once `cancel` (a threading.Event) is set, files not yet started are dropped and the
+        iteration ends; files already running in a worker are left to finish.
+        """
+        file_paths = list(file_paths)
+        if not file_paths:
+            return
+        with ProcessPoolExecutor(
+            max_workers=min(self.maxWorkers, len(file_paths)),
+            initializer=_init_worker,
+            initargs=(
+                self.modelChoice, self.modelDir, self.batchSize, self.useCache, self.sampleRate, self.vad,
+                self.adaptive, self.coarseHopSec, self.ensemble, self.streaming,
+            ),
+        ) as pool:
+            futures = {pool.submit(_analyze, path): path for path in file_paths}
+            try:
+                for future in as_completed(futures):
+                    check_cancelled(cancel)
+                    try:
+                        yield future.result()
+                    except Exception as e:
+                        yield futures[future], {
+                            'ok': False, 'error': str(e), 'cancelled': False, 'timeline': [], 'summary': {}
+                        }
+            except AnalysisCancelled:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+    def runFolder(self, folder: str, recursive: bool = True, cancel=None) -> Iterator[Tuple[str, dict]]:
+        """Analyze every audio file under `folder`; yields (file_path, result) in completion order."""
+        return self.run(iter_audio_files(folder, recursive), cancel)
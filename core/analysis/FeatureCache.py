@@ -0,0 +1,146 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from time import time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+__all__ = ['FeatureCache', 'app_data_dir']
+
+_HASH_CHUNK = 1 << 20
+
+
+def app_data_dir(*parts) -> str:
+    """WaveMood folder under AppData on Windows, fallback to user home."""
+    return os.path.join(os.getenv('APPDATA') or os.path.expanduser('~'), 'WaveMood', *parts)
+
+
+class FeatureCache:
+    """
+    On-disk cache of analysis feature matrices.
+
+    Entries are keyed by the content hash of the audio file plus the extraction parameters
+    (sample rate, window/hop, frame length, ...), so re-running analysis on the same audio with
+    another model goes straight to inference. Feature matrices are stored as .npy blobs next to an
+    SQLite index that also remembers (path, mtime, size) -> content hash so unchanged files are not
+    re-hashed. Entries are evicted least-recently-used first once the blobs exceed `max_bytes`.
+    """
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory or app_data_dir('cache', 'features')
+        self.maxBytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._dbPath = os.path.join(self.directory, 'index.sqlite3')
+        with self._connect() as db:
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, blob TEXT NOT NULL, total_len INTEGER NOT NULL, '
+                'size INTEGER NOT NULL, last_access REAL NOT NULL)'
+            )
+            db.execute(
+                'CREATE TABLE IF NOT EXISTS hashes ('
+                'path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, digest TEXT NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self._dbPath, timeout=30)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def key(digest: str, **params) -> str:
+        """Cache key for a content hash and a set of extraction parameters."""
+        return digest + '|' + ','.join(f'{k}={params[k]}' for k in sorted(params))
+
+    def content_hash(self, file_path: str) -> str:
+        """BLAKE2b digest of the file contents, memoized by (path, mtime, size)."""
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        with self._lock, self._connect() as db:
+            row = db.execute('SELECT mtime_ns, size, digest FROM hashes WHERE path = ?', (path,)).fetchone()
+        if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+            return row[2]
+        h = hashlib.blake2b(digest_size=20)
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock, self._connect() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO hashes (path, mtime_ns, size, digest) VALUES (?, ?, ?, ?)',
+                (path, st.st_mtime_ns, st.st_size, digest)
+            )
+        return digest
+
+    def get(self, digest: str, **params) -> Optional[Tuple[np.ndarray, int]]:
+        """Cached (features, total_len) for the key, or None. Counts a hit or a miss."""
+        key = self.key(digest, **params)
+        with self._lock, self._connect() as db:
+            row = db.execute('SELECT blob, total_len FROM entries WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                try:
+                    features = np.load(os.path.join(self.directory, row[0]))
+                except (OSError, ValueError):
+                    db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                    row = None
+            if row is None:
+                self.misses += 1
+                return None
+            db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time(), key))
+            self.hits += 1
+            return features, int(row[1])
+
+    def put(self, digest: str, features: np.ndarray, total_len: int, **params) -> None:
+        """Store the feature matrix for the key, then evict LRU entries over the size budget."""
+        key = self.key(digest, **params)
+        blob = hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '.npy'
+        blob_path = os.path.join(self.directory, blob)
+        np.save(blob_path, np.ascontiguousarray(features, dtype=np.float32))
+        size = os.path.getsize(blob_path)
+        with self._lock, self._connect() as db:
+            db.execute(
+                'INSERT OR REPLACE INTO entries (key, blob, total_len, size, last_access) VALUES (?, ?, ?, ?, ?)',
+                (key, blob, int(total_len), size, time())
+            )
+            self._evict(db)
+
+    def _evict(self, db) -> None:
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.maxBytes:
+            return
+        for key, blob, size in db.execute('SELECT key, blob, size FROM entries ORDER BY last_access').fetchall():
+            if total <= self.maxBytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, blob))
+            except OSError:
+                pass
+            db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry (the content-hash memo is kept)."""
+        with self._lock, self._connect() as db:
+            for (blob,) in db.execute('SELECT blob FROM entries').fetchall():
+                try:
+                    os.remove(os.path.join(self.directory, blob))
+                except OSError:
+                    pass
+            db.execute('DELETE FROM entries')
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters plus the number and total size of cached entries."""
+        with self._lock, self._connect() as db:
+            count, size = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': count, 'bytes': size}
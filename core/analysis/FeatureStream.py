@@ -0,0 +1,141 @@
+import numpy as np
+
+from .features import N_FEATURES, contour_features, tail_window_features
+from .framing import frame_count, frame_energy, frame_params, frame_signal
+from .pitch import PITCH_METHOD, estimate_f0
+from .vad import frame_cover, speech_frames, speech_windows
+
+__all__ = ['FeatureStream']
+
+
+class FeatureStream:
+    """
+    Incremental window feature extractor.
+
+    Feed mono sample blocks of any size with push(); every analysis window whose frames are
+    complete comes back immediately as (starts, features), exactly as build_feature_matrix would
+    compute it for the whole signal. Only the samples and contour frames still needed by pending
+    windows are kept, so memory stays bounded by one window plus one block regardless of how much
+    audio has been pushed. Call finish() once the input ends to flush the trailing windows.
+    Pitch is estimated lazily when windows are emitted and only on the frames they cover (with
+    `vad`: the windows the voice activity pass keeps), as window_matrix does.
+    """
+
+    def __init__(self, sr: int, win: int, hop: int, pitch: str = PITCH_METHOD, vad: bool = False):
+        self.sr = int(sr)
+        self.win = int(win)
+        self.hop = int(hop)
+        self.pitch = pitch
+        self.vad = bool(vad)
+        self._frameLen, self._frameHop = frame_params(self.sr)
+        self._width = frame_count(self.win, self._frameLen, self._frameHop)
+        # raw samples, _buf[0] is sample _bufStart of the stream
+        self._buf = np.zeros(0, dtype=np.float32)
+        self._bufStart = 0
+        self._nSamples = 0
+        # contours on the whole-stream frame grid, _f0s[0] is frame _contourStart
+        self._f0s = np.zeros(0, dtype=np.float32)
+        self._energies = np.zeros(0, dtype=np.float32)
+        # per-frame speech flags (with vad) and whether the frame's f0 has been estimated yet
+        self._speech = np.zeros(0, dtype=bool)
+        self._hasF0 = np.zeros(0, dtype=bool)
+        self._contourStart = 0
+        self._nFrames = 0
+        self._nextWindow = 0
+
+    @property
+    def samples(self) -> int:
+        """Number of samples pushed so far."""
+        return self._nSamples
+
+    def push(self, block):
+        """Append mono samples; returns (starts, features) for the windows completed by this block."""
+        block = np.asarray(block).reshape(-1)
+        if block.size:
+            self._buf = block if self._buf.size == 0 else np.concatenate([self._buf, block])
+            self._nSamples += block.size
+            self._extendContours()
+        starts, features = self._emit(final=False)
+        self._trim()
+        return starts, features
+
+    def finish(self):
+        """Flush the trailing windows (those reaching past the last full frame)."""
+        starts, features = self._emit(final=True)
+        self._trim()
+        return starts, features
+
+    def _extendContours(self):
+        n_frames = frame_count(self._nSamples, self._frameLen, self._frameHop)
+        if n_frames <= self._nFrames:
+            return
+        a = self._nFrames * self._frameHop - self._bufStart
+        b = (n_frames - 1) * self._frameHop + self._frameLen - self._bufStart
+        frames = frame_signal(self._buf[a:b], self._frameLen, self._frameHop)
+        energies = frame_energy(frames)
+        self._f0s = np.concatenate([self._f0s, np.zeros(frames.shape[0], dtype=np.float32)])
+        self._hasF0 = np.concatenate([self._hasF0, np.zeros(frames.shape[0], dtype=bool)])
+        if self.vad:
+            self._speech = np.concatenate([self._speech, speech_frames(frames, self.sr, energies)])
+        self._energies = np.concatenate([self._energies, energies])
+        self._nFrames = n_frames
+
+    def _fillPitch(self, first, counts):
+        """Estimate the missing f0s of the frames covered by windows (first, counts), relative to _contourStart."""
+        todo = frame_cover(first, counts, self._f0s.size) & ~self._hasF0
+        if not np.any(todo):
+            return
+        idx = np.flatnonzero(todo)
+        a = (self._contourStart + idx[0]) * self._frameHop - self._bufStart
+        b = (self._contourStart + idx[-1]) * self._frameHop + self._frameLen - self._bufStart
+        frames = frame_signal(self._buf[a:b], self._frameLen, self._frameHop)
+        self._f0s[idx] = estimate_f0(frames[idx - idx[0]], self.sr, self.pitch)
+        self._hasF0[idx] = True
+
+    def _emit(self, final: bool):
+        n_windows = -(-self._nSamples // self.hop) if self.hop > 0 else 0
+        starts = np.arange(self._nextWindow, n_windows, dtype=np.int64) * self.hop
+        if self._width > 0:
+            first = np.rint(starts / self._frameHop).astype(np.int64)
+            if final:
+                counts = np.clip(self._nFrames - first, 0, self._width)
+            else:
+                # first is non-decreasing, so the ready windows are a prefix
+                n_ready = int(np.count_nonzero(first + self._width <= self._nFrames))
+                starts, first = starts[:n_ready], first[:n_ready]
+                counts = np.full(n_ready, self._width, dtype=np.int64)
+        else:
+            if not final:
+                starts = starts[starts + self.win <= self._nSamples]
+            first = np.zeros(starts.size, dtype=np.int64)
+            counts = np.zeros(starts.size, dtype=np.int64)
+        if starts.size == 0:
+            return starts, np.zeros((0, N_FEATURES), dtype=np.float32)
+
+        rel = first - self._contourStart
+        keep = speech_windows(self._speech, rel, counts) if self.vad else counts > 0
+        self._fillPitch(rel[keep], counts[keep])
+        features = contour_features(self._f0s, self._energies, rel, counts, self._width)
+        features[~keep & (counts > 0), 0:4] = np.nan
+        for i in np.flatnonzero(counts == 0):
+            a = int(starts[i]) - self._bufStart
+            features[i] = tail_window_features(self._buf[a:a + self.win], self.sr, self.pitch, self.vad)
+        self._nextWindow += starts.size
+        return starts, features
+
+    def _trim(self):
+        next_start = self._nextWindow * self.hop
+        keep_frame = min(int(np.rint(next_start / self._frameHop)), self._nFrames)
+        # frames still waiting for their f0 need their samples
+        keep_sample = min(self._nFrames * self._frameHop, next_start, keep_frame * self._frameHop)
+        drop = keep_sample - self._bufStart
+        if drop > 0:
+            self._buf = self._buf[drop:]
+            self._bufStart = keep_sample
+        drop = keep_frame - self._contourStart
+        if drop > 0:
+            self._f0s = self._f0s[drop:]
+            self._energies = self._energies[drop:]
+            self._speech = self._speech[drop:]
+            self._hasF0 = self._hasF0[drop:]
+            self._contourStart = keep_frame
@@ -0,0 +1,65 @@
+from typing import List
+
+from .FeatureStream import FeatureStream
+from .RunningSummary import RunningSummary
+from .inference import DEFAULT_BATCH_SIZE, predict_windows
+from .pipeline import HOP_SEC, WIN_SEC
+from .streaming import downmix
+from .timeline import timeline_entries
+
+__all__ = ['LiveAnalyzer']
+
+
+class LiveAnalyzer:
+    """
+    Emotion analysis of an audio stream as it is being captured.
+
+    push() takes the raw input blocks (e.g. from a recording queue); every time a new hop of
+    audio completes a window, that window alone is featurized and classified, so the work per
+    block is proportional to the block length and nothing already seen is analysed again.
+    Only the samples still needed by pending windows are kept (see FeatureStream). With `vad`,
+    windows without speech are labelled SILENCE_LABEL without running pitch or the model.
+    """
+
+    def __init__(
+        self, sr: int, model_choice: str, models: dict, win_sec: float = WIN_SEC, hop_sec: float = HOP_SEC,
+        batch_size: int = DEFAULT_BATCH_SIZE, vad: bool = True
+    ):
+        self.sr = int(sr)
+        self.modelChoice = model_choice
+        self.models = models or {}
+        self.batchSize = batch_size
+        self.win = int(win_sec * self.sr)
+        self.hop = int(hop_sec * self.sr)
+        self.timeline: List[dict] = []
+        self._stream = FeatureStream(self.sr, self.win, self.hop, vad=vad)
+        self._summary = RunningSummary()
+
+    @property
+    def duration(self) -> float:
+        """Seconds of audio received so far."""
+        return self._stream.samples / float(self.sr)
+
+    def push(self, block) -> List[dict]:
+        """Feed captured samples; returns the timeline entries of the windows completed by them."""
+        starts, features = self._stream.push(downmix(block))
+        # a completed window may end a few ms past the last frame read; only the tail gets clipped
+        return self._classify(starts, features, float('inf'))
+
+    def finish(self) -> List[dict]:
+        """Flush the trailing windows once the input has ended."""
+        starts, features = self._stream.finish()
+        return self._classify(starts, features, self.duration)
+
+    def summary(self) -> dict:
+        """Running summary over everything analysed so far."""
+        return self._summary.summary(self.duration)
+
+    def _classify(self, starts, features, total_sec) -> List[dict]:
+        if starts.size == 0:
+            return []
+        predictions = predict_windows(features, self.modelChoice, self.models, batch_size=self.batchSize)
+        entries = timeline_entries(starts, predictions, self.sr, self.win, total_sec)
+        self.timeline.extend(entries)
+        self._summary.add(entries)
+        return entries
@@ -0,0 +1,208 @@
+import gc
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+import numpy as np
+
+from vvecon.qt.logger import logger
+
+from .features import N_FEATURES
+from .inference import predict_windows
+from .models import MODEL_FILES, MODELS_DIR, load_models
+
+T = TypeVar('T', bound='ModelRegistry')
+
+__all__ = ['MODEL_CHOICES', 'ModelRegistry', 'available_memory', 'modelRegistry']
+
+MODEL_CHOICES = ('knn', 'mlp', 'mlp_numpy', 'knn_lp', 'mlp_lp')
+
+
+def available_memory() -> Optional[int]:
+    """Bytes of physical memory currently available, or None if it cannot be determined."""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+
+        class MemoryStatusEx(ctypes.Structure):
+            _fields_ = [
+                ('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                ('ullAvailExtendedVirtual', ctypes.c_ulonglong),
+            ]
+
+        status = MemoryStatusEx()
+        status.dwLength = ctypes.sizeof(MemoryStatusEx)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return int(status.ullAvailPhys)
+    return None
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of loaded emotion models, keyed by model choice ('knn', 'mlp').
+
+    Models are loaded once and shared by every caller in the process. preload() loads (and warms
+    up with a dummy predict, which triggers graph tracing for the MLP) in a background thread;
+    get() blocks until the requested choice is loaded. Listeners are told about every state
+    change (UNLOADED -> LOADING -> READY / FAILED) from whichever thread made it.
+    trimMemory() drops the least recently used models when system memory runs low; they are
+    transparently reloaded by the next get().
+    """
+
+    UNLOADED = 'unloaded'
+    LOADING = 'loading'
+    READY = 'ready'
+    FAILED = 'failed'
+
+    DEFAULT_MIN_AVAILABLE_BYTES = 512 * 1024 * 1024
+
+    _instance: Optional[T] = None
+
+    @classmethod
+    def getInstance(cls) -> T:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, base: Optional[str] = None, mlp: bool = True):
+        self.base = base
+        self.mlpEnabled = mlp
+        self._lock = threading.Lock()
+        self._loadLocks: Dict[str, threading.Lock] = {c: threading.Lock() for c in MODEL_CHOICES}
+        self._models: Dict[str, dict] = {}
+        self._states: Dict[str, str] = {c: self.UNLOADED for c in MODEL_CHOICES}
+        self._errors: Dict[str, str] = {}
+        self._lastUsed: Dict[str, float] = {}
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    def configure(self, base: Optional[str] = None, mlp: Optional[bool] = None) -> 'ModelRegistry':
+        """Set the model folder and whether the MLP (TensorFlow) may be loaded; call before preload()."""
+        if base is not None:
+            self.base = base
+        if mlp is not None:
+            self.mlpEnabled = mlp
+        return self
+
+    def addListener(self, callback: Callable[[str, str], None]):
+        """callback(choice, state) on every state change; may be called from a loader thread."""
+        self._listeners.append(callback)
+
+    def removeListener(self, callback: Callable[[str, str], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def state(self, choice: str) -> str:
+        return self._states.get(choice, self.UNLOADED)
+
+    def error(self, choice: str) -> str:
+        return self._errors.get(choice, '')
+
+    def isReady(self, choice: str) -> bool:
+        return self.state(choice) == self.READY
+
+    def _setState(self, choice: str, state: str):
+        self._states[choice] = state
+        for callback in list(self._listeners):
+            try:
+                callback(choice, state)
+            except Exception as e:
+                logger.error(f"Model registry listener failed: {e}")
+
+    def _load(self, choice: str, warmup: bool = False) -> Optional[dict]:
+        if choice not in self._loadLocks:
+            raise ValueError(f"Unknown model choice: {choice}")
+        with self._loadLocks[choice]:
+            with self._lock:
+                models = self._models.get(choice)
+                if models is not None:
+                    self._lastUsed[choice] = time.monotonic()
+                    return models
+            self._setState(choice, self.LOADING)
+            try:
+                started = time.perf_counter()
+                flags = {c: c == choice for c in MODEL_CHOICES}
+                flags['mlp'] = flags['mlp'] and self.mlpEnabled
+                base = self.base or MODELS_DIR
+                models = load_models(base, **flags)
+                if models.get(choice) is None:
+                    raise FileNotFoundError(
+                        f"No {choice} model could be loaded from {os.path.join(base, MODEL_FILES[choice])}"
+                    )
+                if warmup:
+                    predict_windows(np.zeros((1, N_FEATURES), dtype=np.float32), choice, models, batch_size=1)
+                logger.info(f"Loaded {choice} models in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                logger.error(f"Error loading {choice} models: {e}")
+                self._errors[choice] = str(e)
+                self._setState(choice, self.FAILED)
+                return None
+            with self._lock:
+                self._models[choice] = models
+                self._lastUsed[choice] = time.monotonic()
+                self._errors.pop(choice, None)
+            self._setState(choice, self.READY)
+            return models
+
+    def get(self, choice: str) -> dict:
+        """
+        Models for `choice`, keyed for predict_windows. Loads them (or waits for a background
+        load already in progress) if needed. Raises RuntimeError if loading failed, including when
+        the choice's model file is missing.
+        """
+        models = self._load(choice)
+        if models is None:
+            raise RuntimeError(self.error(choice) or f"{choice} models unavailable")
+        return models
+
+    def preload(self, choices: Iterable[str] = MODEL_CHOICES, warmup: bool = True) -> threading.Thread:
+        """Load and warm up `choices` in order on a daemon thread; returns the thread."""
+        choices = [c for c in choices if c != 'mlp' or self.mlpEnabled]
+        thread = threading.Thread(
+            target=lambda: [self._load(c, warmup) for c in choices], name='ModelPreload', daemon=True
+        )
+        thread.start()
+        return thread
+
+    def unload(self, choice: Optional[str] = None):
+        """Drop `choice` (default: every model); callers still holding the dict keep it alive."""
+        for c in ([choice] if choice else list(MODEL_CHOICES)):
+            with self._lock:
+                dropped = self._models.pop(c, None)
+                self._lastUsed.pop(c, None)
+            if dropped is not None:
+                self._setState(c, self.UNLOADED)
+        gc.collect()
+
+    def trimMemory(
+        self, min_available_bytes: int = DEFAULT_MIN_AVAILABLE_BYTES, keep: Iterable[str] = ()
+    ) -> Optional[str]:
+        """
+        If less than `min_available_bytes` of memory is available, unload the least recently
+        used model not listed in `keep`. Returns the unloaded choice, or None.
+        """
+        available = available_memory()
+        if available is None or available >= min_available_bytes:
+            return None
+        keep = set(keep)
+        with self._lock:
+            candidates = sorted((t, c) for c, t in self._lastUsed.items() if c not in keep)
+        if not candidates:
+            return None
+        choice = candidates[0][1]
+        logger.info(f"Low memory ({available // (1024 * 1024)} MB available), unloading {choice} models")
+        self.unload(choice)
+        return choice
+
+
+modelRegistry = ModelRegistry.getInstance()
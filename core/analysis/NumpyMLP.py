@@ -0,0 +1,151 @@
+import json
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+__all__ = ['NumpyMLP']
+
+
+def _relu(x):
+    return np.maximum(x, 0.0, out=x)
+
+
+def _softmax(x):
+    x -= x.max(axis=1, keepdims=True)
+    np.exp(x, out=x)
+    x /= x.sum(axis=1, keepdims=True)
+    return x
+
+
+def _sigmoid(x):
+    np.negative(x, out=x)
+    np.exp(x, out=x)
+    x += 1.0
+    return np.reciprocal(x, out=x)
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': _relu,
+    'softmax': _softmax,
+    'sigmoid': _sigmoid,
+    'tanh': lambda x: np.tanh(x, out=x),
+}
+
+
+class NumpyMLP:
+    """
+    TensorFlow-free forward pass of the emotion MLP (Dense-Dropout-Dense-Dense softmax).
+
+    Holds float32 dense weights plus the StandardScaler statistics and class names, so a single
+    weights file (see save/load) replaces the Keras .h5 model, the scaler and the label encoder
+    at inference time. Dropout is the identity at inference and is not stored.
+    """
+
+    def __init__(
+        self, layers: Sequence[Tuple[np.ndarray, np.ndarray, str]],
+        mean: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None,
+        classes: Optional[Sequence[str]] = None
+    ):
+        self.layers: List[Tuple[np.ndarray, np.ndarray, str]] = []
+        for kernel, bias, activation in layers:
+            if activation not in _ACTIVATIONS:
+                raise ValueError(f"Unsupported activation: {activation}")
+            self.layers.append((
+                np.ascontiguousarray(kernel, dtype=np.float32),
+                np.ascontiguousarray(bias, dtype=np.float32),
+                activation,
+            ))
+        self.mean = None if mean is None else np.asarray(mean, dtype=np.float32)
+        # StandardScaler leaves zero-variance features unscaled (scale_ == 1); multiply by the inverse
+        self.invScale = None if scale is None else (1.0 / np.asarray(scale, dtype=np.float64)).astype(np.float32)
+        self.classes_ = np.asarray(classes, dtype=str) if classes is not None else None
+
+    @property
+    def nFeatures(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @property
+    def nClasses(self) -> int:
+        return self.layers[-1][0].shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of the dense weights and biases."""
+        return sum(kernel.nbytes + bias.nbytes for kernel, bias, _ in self.layers)
+
+    def transform(self, features) -> np.ndarray:
+        """Apply the embedded scaler to an (n, n_features) matrix; returns a new float32 array."""
+        x = np.array(features, dtype=np.float32, copy=True, ndmin=2)
+        if self.mean is not None:
+            x -= self.mean
+        if self.invScale is not None:
+            x *= self.invScale
+        return x
+
+    def predict_proba(self, features) -> np.ndarray:
+        """(n, n_features) raw features -> (n, n_classes) float32 class probabilities."""
+        x = self.transform(features)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            x += bias
+            x = _ACTIVATIONS[activation](x)
+        return x
+
+    def save(self, path: str):
+        """Write weights, scaler statistics and class names to a compressed .npz file."""
+        arrays = {'activations': np.asarray([a for _, _, a in self.layers])}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel{i}'] = kernel
+            arrays[f'bias{i}'] = bias
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        if self.invScale is not None:
+            arrays['scale'] = (1.0 / self.invScale.astype(np.float64)).astype(np.float32)
+        if self.classes_ is not None:
+            arrays['classes'] = self.classes_
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'NumpyMLP':
+        with np.load(path, allow_pickle=False) as data:
+            activations = [str(a) for a in data['activations']]
+            layers = [(data[f'kernel{i}'], data[f'bias{i}'], a) for i, a in enumerate(activations)]
+            return cls(
+                layers,
+                mean=data['mean'] if 'mean' in data else None,
+                scale=data['scale'] if 'scale' in data else None,
+                classes=data['classes'] if 'classes' in data else None,
+            )
+
+    @classmethod
+    def fromKeras(cls, h5_path: str, scaler=None, encoder=None) -> 'NumpyMLP':
+        """
+        Read the Dense layers of a Keras Sequential model saved as .h5 (needs h5py, not
+        TensorFlow), with an optional fitted StandardScaler and LabelEncoder.
+        """
+        import h5py
+
+        with h5py.File(h5_path, 'r') as f:
+            config = f.attrs['model_config']
+            config = json.loads(config.decode() if isinstance(config, bytes) else config)
+            dense = [
+                layer['config'] for layer in config['config']['layers']
+                if layer['class_name'] == 'Dense'
+            ]
+            weights = f['model_weights'] if 'model_weights' in f else f
+            layers = []
+            for layer in dense:
+                group = weights[layer['name']]
+                names = [n.decode() if isinstance(n, bytes) else n for n in group.attrs['weight_names']]
+                arrays = {n.rsplit('/', 1)[-1].split(':')[0]: np.asarray(group[n]) for n in names}
+                bias = arrays.get('bias')
+                if bias is None:
+                    bias = np.zeros(arrays['kernel'].shape[1], dtype=np.float32)
+                layers.append((arrays['kernel'], bias, layer.get('activation') or 'linear'))
+        return cls(
+            layers,
+            mean=getattr(scaler, 'mean_', None),
+            scale=getattr(scaler, 'scale_', None),
+            classes=getattr(encoder, 'classes_', None),
+        )
@@ -0,0 +1,114 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .NumpyKNN import NumpyKNN
+
+__all__ = ['QuantizedKNN']
+
+_INT8_MAX = 127
+
+
+class QuantizedKNN(NumpyKNN):
+    """
+    NumpyKNN whose training matrix is stored float16- or int8-compressed.
+
+    Each feature column is stored as offset + scale * code, with codes in [-1, 1] (float16,
+    offset 0) or [-127, 127] (int8); per-column ranges come from calibration data. The codes are
+    decoded once, at load, to build the cKDTree NumpyKNN searches, so queries cost the same as the
+    float model. With the tree built, the codes replace NumpyKNN's float32 copy of the training
+    matrix; only a brute-force search (small sets, no scipy) keeps the decoded matrix as well.
+    """
+
+    DTYPES = ('float16', 'int8')
+    DECODE_ROWS = 1 << 16  # codes decoded per float64 block at load
+
+    def __init__(
+        self, codes: np.ndarray, offset: np.ndarray, scale: np.ndarray, labels: np.ndarray,
+        classes: Sequence[str], n_neighbors: int = 5, weights: str = 'uniform', use_kdtree: Optional[bool] = None
+    ):
+        if codes.dtype.name not in self.DTYPES:
+            raise ValueError(f"Unsupported quantization dtype: {codes.dtype}")
+        self.dtype = codes.dtype.name
+        self.offset = np.asarray(offset, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        train = np.empty(codes.shape, dtype=np.float32)
+        for start in range(0, len(codes), self.DECODE_ROWS):
+            block = codes[start:start + self.DECODE_ROWS].astype(np.float64)
+            block *= self.scale
+            block += self.offset
+            train[start:start + len(block)] = block
+        super().__init__(train, labels, np.asarray(classes, dtype=str), n_neighbors, weights, use_kdtree)
+        self.codes = np.ascontiguousarray(codes)
+        if self._tree is not None:
+            self.train = None  # the tree holds the (centred, float64) points it searches
+
+    @property
+    def nRows(self) -> int:
+        return self.codes.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Resident bytes: codes, labels and the decoded matrix or the tree's points."""
+        decoded = self.train.nbytes if self.train is not None else 0
+        tree = self._tree.data.nbytes if self._tree is not None else 0
+        return self.codes.nbytes + self.labels.nbytes + decoded + tree
+
+    @property
+    def storedBytes(self) -> int:
+        """Bytes of the codes and labels as saved."""
+        return self.codes.nbytes + self.nRows * np.dtype(np.int16).itemsize
+
+    @classmethod
+    def fromSklearn(
+        cls, knn, dtype: str = 'int8', calibration=None, encoder=None, percentile: float = 100.0
+    ) -> 'QuantizedKNN':
+        """
+        Compress a fitted sklearn KNeighborsClassifier (Euclidean metric). Column ranges are the
+        [100 - percentile, percentile] percentiles of `calibration` (default: the training matrix);
+        training values outside them are clipped.
+        """
+        if getattr(knn, 'effective_metric_', 'euclidean') != 'euclidean':
+            raise ValueError(f"Only Euclidean KNN models can be quantized, not {knn.effective_metric_}")
+        if dtype not in cls.DTYPES:
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        train = np.asarray(knn._fit_X, dtype=np.float64)
+        calibration = train if calibration is None else np.asarray(calibration, dtype=np.float64)
+        lo = np.percentile(calibration, 100.0 - percentile, axis=0)
+        hi = np.percentile(calibration, percentile, axis=0)
+        if dtype == 'int8':
+            offset = (lo + hi) / 2.0
+            half_range = np.maximum((hi - lo) / 2.0, 1e-12)
+        else:
+            # float16 keeps relative precision, so only scale into range and leave values uncentred
+            offset = np.zeros_like(lo)
+            half_range = np.maximum(np.maximum(np.abs(lo), np.abs(hi)), 1e-12)
+        unit = np.clip((train - offset) / half_range, -1.0, 1.0)
+        if dtype == 'int8':
+            codes = np.rint(unit * _INT8_MAX).astype(np.int8)
+            scale = half_range / _INT8_MAX
+        else:
+            codes = unit.astype(np.float16)
+            scale = half_range
+        classes = knn.classes_
+        if encoder is not None:
+            classes = encoder.inverse_transform(np.asarray(classes))
+        return cls(
+            codes, offset, scale, knn._y, [str(c) for c in classes],
+            n_neighbors=knn.n_neighbors, weights=knn.weights
+        )
+
+    def save(self, path: str):
+        np.savez_compressed(
+            path, codes=self.codes, offset=self.offset.astype(np.float32), scale=self.scale.astype(np.float32),
+            labels=self.labels.astype(np.int16), classes=self.classes_,
+            n_neighbors=np.int32(self.nNeighbors), weights=np.asarray(self.weights)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'QuantizedKNN':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                data['codes'], data['offset'], data['scale'], data['labels'], data['classes'],
+                n_neighbors=int(data['n_neighbors']), weights=str(data['weights'])
+            )
@@ -0,0 +1,108 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .NumpyMLP import _ACTIVATIONS, NumpyMLP
+
+__all__ = ['QuantizedMLP']
+
+_INT8_MAX = 127
+
+
+class QuantizedMLP(NumpyMLP):
+    """
+    NumpyMLP that keeps its kernels as float16 or int8, in memory as well as on disk.
+
+    float16 halves the kernels; int8 stores symmetric per-output-channel codes (a quarter of the
+    float32 size) plus one float32 scale per output. Each forward pass widens one layer's kernel
+    at a time to float32 (a few kilobytes for this network) and runs the same BLAS matmul as
+    NumpyMLP, so it costs about the same time while the resident weights stay compact. Layer
+    inputs are not quantized: the only error is the weights' rounding.
+    """
+
+    DTYPES = ('float16', 'int8')
+
+    def __init__(
+        self, layers: Sequence[Tuple[np.ndarray, np.ndarray, str]], dtype: str,
+        mean: Optional[np.ndarray] = None, scale: Optional[np.ndarray] = None,
+        classes: Optional[Sequence[str]] = None, kernel_scales: Optional[Sequence[np.ndarray]] = None
+    ):
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        if dtype == 'int8' and kernel_scales is None:
+            raise ValueError('int8 weights need kernel scales')
+        self.dtype = dtype
+        super().__init__(layers, mean=mean, scale=scale, classes=classes)
+        # NumpyMLP checked the activations and made float32 copies; keep the compact kernels instead
+        self.layers: List[Tuple[np.ndarray, np.ndarray, str]] = [
+            (np.ascontiguousarray(kernel, dtype=dtype), bias, activation)
+            for (kernel, _, _), (_, bias, activation) in zip(layers, self.layers)
+        ]
+        self.kernelScales: List[np.ndarray] = [np.asarray(s, dtype=np.float32) for s in (kernel_scales or [])]
+
+    @classmethod
+    def fromMLP(cls, mlp: NumpyMLP, dtype: str = 'float16') -> 'QuantizedMLP':
+        """Quantize a NumpyMLP's kernels (biases stay float32)."""
+        mean = mlp.mean
+        scale = None if mlp.invScale is None else 1.0 / mlp.invScale.astype(np.float64)
+        if dtype == 'float16':
+            layers = [(k.astype(np.float16), b, a) for k, b, a in mlp.layers]
+            return cls(layers, dtype, mean=mean, scale=scale, classes=mlp.classes_)
+        if dtype != 'int8':
+            raise ValueError(f"Unsupported quantization dtype: {dtype}")
+        layers, kernel_scales = [], []
+        for kernel, bias, activation in mlp.layers:
+            k_scale = np.maximum(np.abs(kernel).max(axis=0), 1e-12) / _INT8_MAX
+            codes = np.clip(np.rint(kernel / k_scale), -_INT8_MAX, _INT8_MAX).astype(np.int8)
+            layers.append((codes, bias, activation))
+            kernel_scales.append(k_scale)
+        return cls(layers, dtype, mean=mean, scale=scale, classes=mlp.classes_, kernel_scales=kernel_scales)
+
+    @property
+    def storedBytes(self) -> int:
+        """Bytes of the weights and biases as saved; the same arrays are resident (nbytes)."""
+        return self.nbytes
+
+    def kernel(self, i: int) -> np.ndarray:
+        """Layer `i`'s kernel widened to float32."""
+        kernel = self.layers[i][0].astype(np.float32)
+        if self.dtype == 'int8':
+            kernel *= self.kernelScales[i]
+        return kernel
+
+    def predict_proba(self, features) -> np.ndarray:
+        x = self.transform(features)
+        for i, (_, bias, activation) in enumerate(self.layers):
+            x = x @ self.kernel(i)
+            x += bias
+            x = _ACTIVATIONS[activation](x)
+        return x
+
+    def save(self, path: str):
+        arrays = {'dtype': np.asarray(self.dtype), 'activations': np.asarray([a for _, _, a in self.layers])}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel{i}'] = kernel
+            arrays[f'bias{i}'] = bias
+        for i, k_scale in enumerate(self.kernelScales):
+            arrays[f'kernel_scale{i}'] = k_scale
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        if self.invScale is not None:
+            arrays['scale'] = (1.0 / self.invScale.astype(np.float64)).astype(np.float32)
+        if self.classes_ is not None:
+            arrays['classes'] = self.classes_
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'QuantizedMLP':
+        with np.load(path, allow_pickle=False) as data:
+            dtype = str(data['dtype'])
+            activations = [str(a) for a in data['activations']]
+            layers = [(data[f'kernel{i}'], data[f'bias{i}'], a) for i, a in enumerate(activations)]
+            return cls(
+                layers, dtype,
+                mean=data['mean'] if 'mean' in data else None,
+                scale=data['scale'] if 'scale' in data else None,
+                classes=data['classes'] if 'classes' in data else None,
+                kernel_scales=[data[f'kernel_scale{i}'] for i in range(len(layers))] if dtype == 'int8' else None,
+            )
@@ -0,0 +1,39 @@
+from typing import Dict, Iterable
+
+__all__ = ['RunningSummary']
+
+
+class RunningSummary:
+    """
+    Incrementally aggregated timeline summary.
+
+    add() folds in new timeline entries in O(len(entries)); summary() returns the same
+    {label: {'duration_s', 'pct', 'avg_prob'}} dict as summarize_timeline over everything added.
+    """
+
+    def __init__(self):
+        self._durations: Dict[str, float] = {}
+        self._probSums: Dict[str, float] = {}
+        self._probCounts: Dict[str, int] = {}
+
+    def add(self, entries: Iterable[dict]) -> 'RunningSummary':
+        for w in entries:
+            lbl = w['label']
+            dur = max(0.0, w['end'] - w['start'])
+            self._durations[lbl] = self._durations.get(lbl, 0.0) + dur
+            for k, v in (w.get('probs') or {}).items():
+                self._probSums[k] = self._probSums.get(k, 0.0) + float(v)
+                self._probCounts[k] = self._probCounts.get(k, 0) + 1
+        return self
+
+    def summary(self, total_sec: float) -> dict:
+        summary = {}
+        for lbl, dur in self._durations.items():
+            pct = (dur / total_sec) * 100.0 if total_sec > 1e-6 else 0.0
+            count = self._probCounts.get(lbl)
+            avg_prob = self._probSums[lbl] / count if count else None
+            summary[lbl] = {
+                'duration_s': round(dur, 3), 'pct': round(pct, 2),
+                'avg_prob': (round(avg_prob, 4) if avg_prob is not None else None)
+            }
+        return summary
@@ -0,0 +1,58 @@
+import numpy as np
+
+from .resample import resample_context, resample_filter, resample_ratio
+
+__all__ = ['StreamResampler']
+
+
+class StreamResampler:
+    """
+    Block-by-block polyphase resampler whose concatenated output matches resample() over the
+    whole signal.
+
+    Input is consumed in runs that start and end on multiples of the decimation factor, each
+    resampled together with `pad` samples of context on both sides (more than the filter's
+    half-length), and only the output belonging to the run itself is kept.
+    """
+
+    def __init__(self, sr_in: int, sr_out: int):
+        self.up, self.down = resample_ratio(sr_in, sr_out)
+        self._h = resample_filter(self.up, self.down)
+        self._pad = resample_context(self.up, self.down)
+        self._buf = np.zeros(0, dtype=np.float32)
+        self._bufStart = 0  # input index of _buf[0]
+        self._next = 0  # input index where the next run starts (a multiple of self.down)
+
+    def _run(self, end: int, final: bool) -> np.ndarray:
+        from scipy.signal import resample_poly
+
+        lo = max(0, self._next - self._pad)
+        hi = self._bufStart + len(self._buf) if final else end + self._pad
+        y = resample_poly(self._buf[lo - self._bufStart:hi - self._bufStart], self.up, self.down, window=self._h)
+        offset = (self._next - lo) * self.up // self.down
+        if final:
+            out = y[offset:]
+        else:
+            out = y[offset:offset + (end - self._next) * self.up // self.down]
+        self._next = end
+        keep = max(0, self._next - self._pad) - self._bufStart
+        if keep > 0:
+            self._buf = self._buf[keep:]
+            self._bufStart += keep
+        return out.astype(np.float32, copy=False)
+
+    def push(self, block) -> np.ndarray:
+        """Feed mono input; returns the output samples that are now final."""
+        block = np.asarray(block, dtype=np.float32).reshape(-1)
+        if block.size:
+            self._buf = np.concatenate([self._buf, block])
+        end = (self._bufStart + len(self._buf) - self._pad) // self.down * self.down
+        if end <= self._next:
+            return np.zeros(0, dtype=np.float32)
+        return self._run(end, final=False)
+
+    def finish(self) -> np.ndarray:
+        """Flush the remaining output at the end of the signal."""
+        if self._bufStart + len(self._buf) <= self._next:
+            return np.zeros(0, dtype=np.float32)
+        return self._run(self._bufStart + len(self._buf), final=True)
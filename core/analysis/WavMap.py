@@ -0,0 +1,181 @@
+import os
+import struct
+from typing import Iterator, Optional, Union
+
+import numpy as np
+import soundfile as sf
+
+__all__ = ['WavMap', 'open_audio', 'pcm_to_float']
+
+_PCM = 0x0001
+_IEEE_FLOAT = 0x0003
+_EXTENSIBLE = 0xFFFE
+
+# (format tag, bits per sample) -> little-endian sample dtype; 24-bit PCM has no NumPy dtype
+_DTYPES = {
+    (_PCM, 8): np.dtype('u1'), (_PCM, 16): np.dtype('<i2'), (_PCM, 32): np.dtype('<i4'),
+    (_IEEE_FLOAT, 32): np.dtype('<f4'), (_IEEE_FLOAT, 64): np.dtype('<f8'),
+}
+
+
+def pcm_to_float(block: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Scale PCM samples (uint8, int16, int32 or float) to float32 in [-1, 1), the way libsndfile does.
+    Writes into `out` (same shape, float32) when given, so a caller can convert without allocating.
+    """
+    if out is None:
+        out = np.empty(block.shape, dtype=np.float32)
+    kind = block.dtype
+    if kind == np.uint8:
+        np.multiply(block, np.float32(1 / 128), out=out)
+        out -= np.float32(1.0)
+    elif kind.kind == 'i':
+        np.multiply(block, np.float32(1.0 / (1 << (8 * kind.itemsize - 1))), out=out)
+    else:
+        out[...] = block
+    return out
+
+
+class WavMap:
+    """
+    Zero-copy reader for uncompressed WAV files (PCM 8/16/32-bit, float; RIFF or RF64).
+
+    The RIFF header is parsed directly and the data chunk is exposed as a read-only
+    (frames, channels) np.memmap of the raw samples (`data`), so opening a file costs a header
+    read and samples come straight from the page cache when indexed. For code written against
+    soundfile.SoundFile, `samplerate`, `frames`, `channels`, seek(), read() and blocks() behave
+    like their SoundFile counterparts and convert only the frames read to float32.
+    Raises ValueError for anything that is not a memory-mappable WAV (see open_audio).
+    """
+
+    def __init__(self, file_path: str):
+        self.name = file_path
+        self._pos = 0
+        self.samplerate, self.channels, self.dtype, offset, self.frames = self._parseHeader(file_path)
+        if self.frames:
+            self.data = np.memmap(
+                file_path, dtype=self.dtype, mode='r', offset=offset, shape=(self.frames, self.channels)
+            )
+        else:
+            self.data = np.zeros((0, self.channels), dtype=self.dtype)
+
+    @staticmethod
+    def _parseHeader(file_path: str):
+        with open(file_path, 'rb') as f:
+            riff = f.read(12)
+            if len(riff) < 12 or riff[:4] not in (b'RIFF', b'RF64') or riff[8:12] != b'WAVE':
+                raise ValueError(f"{file_path} is not a RIFF/WAVE file")
+            file_size = os.fstat(f.fileno()).st_size
+            fmt = None
+            ds64_data_size = None
+            while True:
+                head = f.read(8)
+                if len(head) < 8:
+                    raise ValueError(f"{file_path} has no data chunk")
+                chunk_id, size = head[:4], struct.unpack('<I', head[4:])[0]
+                if chunk_id == b'ds64':
+                    # RF64: 64-bit RIFF and data sizes replace the 0xFFFFFFFF placeholders
+                    body = f.read(size)
+                    ds64_data_size = struct.unpack('<Q', body[8:16])[0]
+                    f.seek(size & 1, os.SEEK_CUR)
+                elif chunk_id == b'fmt ':
+                    body = f.read(size)
+                    if len(body) < 16:
+                        raise ValueError(f"{file_path} has a truncated fmt chunk")
+                    tag, channels, rate, _, block_align, bits = struct.unpack('<HHIIHH', body[:16])
+                    if tag == _EXTENSIBLE and len(body) >= 26:
+                        tag = struct.unpack('<H', body[24:26])[0]
+                    fmt = tag, channels, rate, block_align, bits
+                    f.seek(size & 1, os.SEEK_CUR)
+                elif chunk_id == b'data':
+                    break
+                else:
+                    f.seek(size + (size & 1), os.SEEK_CUR)
+            if fmt is None:
+                raise ValueError(f"{file_path} has no fmt chunk before its data")
+            offset = f.tell()
+        tag, channels, rate, block_align, bits = fmt
+        dtype = _DTYPES.get((tag, bits))
+        if dtype is None or not channels or block_align != channels * dtype.itemsize:
+            raise ValueError(f"{file_path}: {bits}-bit samples of format {tag:#06x} cannot be memory-mapped")
+        if size == 0xFFFFFFFF and ds64_data_size is not None:
+            size = ds64_data_size
+        # writers that stream to disk may leave the size at 0 / 0xFFFFFFFF or stop mid-chunk
+        if size in (0, 0xFFFFFFFF) or offset + size > file_size:
+            size = file_size - offset
+        return int(rate), int(channels), dtype, offset, int(size // block_align)
+
+    def __enter__(self) -> 'WavMap':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # the mapping is released once the last view of `data` is gone
+        self.data = np.zeros((0, self.channels), dtype=self.dtype)
+
+    def seek(self, frames: int, whence: int = os.SEEK_SET) -> int:
+        base = {os.SEEK_SET: 0, os.SEEK_CUR: self._pos, os.SEEK_END: self.frames}[whence]
+        self._pos = min(max(0, base + int(frames)), self.frames)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def read(
+        self, frames: int = -1, dtype: str = 'float32', always_2d: bool = False, out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        The next `frames` frames (-1: the rest) as float32, shaped like SoundFile.read. With `out`
+        (float32, (n, channels)), up to len(out) frames are converted into it and the filled part
+        is returned, as SoundFile.read does.
+        """
+        if out is not None:
+            stop = min(self.frames, self._pos + len(out))
+            filled = pcm_to_float(self.data[self._pos:stop], out=out[:stop - self._pos])
+            self._pos = stop
+            return filled
+        stop = self.frames if frames < 0 else min(self.frames, self._pos + int(frames))
+        out = pcm_to_float(self.data[self._pos:stop])
+        self._pos = stop
+        if dtype != 'float32':
+            out = out.astype(dtype)
+        if not always_2d and self.channels == 1:
+            out = out.reshape(-1)
+        return out
+
+    def blocks(
+        self, blocksize: int, dtype: str = 'float32', always_2d: bool = False, frames: int = -1
+    ) -> Iterator[np.ndarray]:
+        """Consecutive read(blocksize) blocks from the current position, like SoundFile.blocks."""
+        stop = self.frames if frames < 0 else min(self.frames, self._pos + int(frames))
+        while self._pos < stop:
+            yield self.read(min(blocksize, stop - self._pos), dtype, always_2d)
+
+    def envelope(self, points: int, blocksize: int = 1 << 20) -> np.ndarray:
+        """
+        Interleaved (min, max) of the mono signal over `points` // 2 equal stretches of the file,
+        float32: enough to draw the waveform while reading at most `blocksize` frames at a time.
+        """
+        bins = max(1, min(points // 2, self.frames))
+        out = np.zeros(2 * bins, dtype=np.float32)
+        if not self.frames:
+            return out
+        edges = np.linspace(0, self.frames, bins + 1).astype(np.int64)
+        step = max(1, blocksize * bins // self.frames)  # stretches per block
+        for i in range(0, bins, step):
+            j = min(bins, i + step)
+            mono = pcm_to_float(self.data[edges[i]:edges[j]]).mean(axis=1)
+            starts = edges[i:j] - edges[i]
+            out[2 * i:2 * j:2] = np.minimum.reduceat(mono, starts)
+            out[2 * i + 1:2 * j:2] = np.maximum.reduceat(mono, starts)
+        return out
+
+
+def open_audio(file_path: str) -> Union[WavMap, sf.SoundFile]:
+    """A WavMap for plain WAV files, otherwise a soundfile.SoundFile; both work as context managers."""
+    try:
+        return WavMap(file_path)
+    except (ValueError, OSError):
+        return sf.SoundFile(file_path)
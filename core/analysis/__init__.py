@@ -0,0 +1,77 @@
+from .framing import FRAME_SEC, frame_params, frame_count, frame_signal, frame_energy
+from .pitch import (
+    PITCH_METHODS, PITCH_METHOD, YIN_FMIN, YIN_FMAX, YIN_THRESHOLD, estimate_f0_autocorr, estimate_f0_batch,
+    estimate_f0_yin, estimate_f0,
+)
+from .windows import sliding_max, sliding_min, window_stats
+from .vad import (
+    SILENCE_LABEL, VAD_MIN_RMS, VAD_ZCR_HZ, VAD_MIN_SPEECH, frame_zcr, speech_frames, speech_windows, frame_cover,
+)
+from .features import (
+    N_FEATURES, extract_contours, feature_params, window_features, window_starts, window_frames,
+    contour_features, tail_window_features, is_speech, window_matrix, build_feature_matrix,
+)
+from .inference import DEFAULT_BATCH_SIZE, ENSEMBLE, ensemble_predictions, model_labels, predict_windows
+from .cancel import AnalysisCancelled, check_cancelled
+from .FeatureStream import FeatureStream
+from .RunningSummary import RunningSummary
+from .timeline import timeline_entries, summarize_timeline
+from .FeatureCache import FeatureCache, app_data_dir
+from .streaming import DEFAULT_BLOCKSIZE, downmix, iter_file_features, iter_signal_features, stream_timeline
+from .resample import ANALYSIS_SR, resample_ratio, resample_filter, resample_context, resampled_length, resample
+from .StreamResampler import StreamResampler
+from .AudioCache import AUDIO_CACHE_MAX_BYTES, AudioCache, audioCache
+from .WavMap import WavMap, open_audio, pcm_to_float
+from .audio import load_audio, clear_audio_cache, read_segment
+from .benchmarks import (
+    synthetic_speech, write_synthetic_wav, resample_benchmark, yin_benchmark, vad_benchmark, wav_benchmark
+)
+from .NumpyMLP import NumpyMLP
+from .NumpyKNN import NumpyKNN
+from .QuantizedMLP import QuantizedMLP
+from .QuantizedKNN import QuantizedKNN
+from .quantization import LOW_POWER_CHOICES, low_power_choice, calibration_features, quantization_report
+from .models import (
+    MLP_FILE, MLP_NUMPY_FILE, MLP_LOW_POWER_FILE, SCALER_FILE, ENCODER_FILE, KNN_FILE, KNN_ENCODER_FILE,
+    KNN_LOW_POWER_FILE, MODEL_FILES, MODELS_DIR, load_models,
+)
+from .adaptive import COARSE_HOP_SEC, MIN_CONFIDENCE, coarse_factor, refine_mask, adaptive_timeline
+from .ModelRegistry import MODEL_CHOICES, ModelRegistry, available_memory, modelRegistry
+from .pipeline import (
+    WIN_SEC, HOP_SEC, STREAMING_THRESHOLD_SEC, PROGRESS_INTERVAL_SEC, FEATURE_BLOCKSIZE, analyze_file, analyze_models
+)
+from .BatchAnalyzer import AUDIO_EXTENSIONS, BatchAnalyzer, iter_audio_files
+from .LiveAnalyzer import LiveAnalyzer
+
+__all__ = [
+    'FRAME_SEC', 'frame_params', 'frame_count', 'frame_signal', 'frame_energy',
+    'PITCH_METHODS', 'PITCH_METHOD', 'YIN_FMIN', 'YIN_FMAX', 'YIN_THRESHOLD', 'estimate_f0_autocorr',
+    'estimate_f0_batch', 'estimate_f0_yin', 'estimate_f0',
+    'sliding_max', 'sliding_min', 'window_stats',
+    'SILENCE_LABEL', 'VAD_MIN_RMS', 'VAD_ZCR_HZ', 'VAD_MIN_SPEECH', 'frame_zcr', 'speech_frames', 'speech_windows',
+    'frame_cover',
+    'N_FEATURES', 'extract_contours', 'feature_params', 'window_features', 'window_starts', 'window_frames',
+    'contour_features', 'tail_window_features', 'is_speech', 'window_matrix', 'build_feature_matrix',
+    'DEFAULT_BATCH_SIZE', 'ENSEMBLE', 'ensemble_predictions', 'model_labels', 'predict_windows',
+    'AnalysisCancelled', 'check_cancelled',
+    'FeatureStream',
+    'RunningSummary', 'timeline_entries', 'summarize_timeline',
+    'FeatureCache', 'app_data_dir',
+    'DEFAULT_BLOCKSIZE', 'downmix', 'iter_file_features', 'iter_signal_features', 'stream_timeline',
+    'ANALYSIS_SR', 'resample_ratio', 'resample_filter', 'resample_context', 'resampled_length', 'resample',
+    'StreamResampler',
+    'AUDIO_CACHE_MAX_BYTES', 'AudioCache', 'audioCache', 'load_audio', 'clear_audio_cache', 'read_segment',
+    'WavMap', 'open_audio', 'pcm_to_float',
+    'synthetic_speech', 'write_synthetic_wav', 'resample_benchmark', 'yin_benchmark', 'vad_benchmark',
+    'wav_benchmark',
+    'NumpyMLP', 'NumpyKNN', 'QuantizedMLP', 'QuantizedKNN',
+    'LOW_POWER_CHOICES', 'low_power_choice', 'calibration_features', 'quantization_report',
+    'MLP_FILE', 'MLP_NUMPY_FILE', 'MLP_LOW_POWER_FILE', 'SCALER_FILE', 'ENCODER_FILE', 'KNN_FILE',
+    'KNN_ENCODER_FILE', 'KNN_LOW_POWER_FILE', 'MODEL_FILES', 'MODELS_DIR', 'load_models',
+    'COARSE_HOP_SEC', 'MIN_CONFIDENCE', 'coarse_factor', 'refine_mask', 'adaptive_timeline',
+    'MODEL_CHOICES', 'ModelRegistry', 'available_memory', 'modelRegistry',
+    'WIN_SEC', 'HOP_SEC', 'STREAMING_THRESHOLD_SEC', 'PROGRESS_INTERVAL_SEC', 'FEATURE_BLOCKSIZE', 'analyze_file',
+    'analyze_models',
+    'AUDIO_EXTENSIONS', 'BatchAnalyzer', 'iter_audio_files',
+    'LiveAnalyzer',
+]
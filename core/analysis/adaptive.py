@@ -0,0 +1,118 @@
+import numpy as np
+
+from vvecon.qt.logger import logger
+
+from .cancel import check_cancelled
+from .features import N_FEATURES, window_matrix, window_starts
+from .framing import frame_params
+from .inference import DEFAULT_BATCH_SIZE, predict_windows
+from .pitch import PITCH_METHOD
+from .timeline import timeline_entries
+
+__all__ = ['COARSE_HOP_SEC', 'MIN_CONFIDENCE', 'coarse_factor', 'refine_mask', 'adaptive_timeline']
+
+COARSE_HOP_SEC = 4.0  # first pass hop; only every few fine windows is scored
+MIN_CONFIDENCE = 0.5  # coarse windows whose top probability is lower are re-analysed around
+_SEGMENT_WINDOWS = 64  # windows featurized per decoded segment
+
+
+def coarse_factor(coarse_hop, fine_hop):
+    """Fine hops per coarse hop; coarse windows are every k-th fine window, so they are shared exactly."""
+    return max(1, int(round(coarse_hop / float(fine_hop)))) if fine_hop > 0 else 1
+
+
+def _confidence(prediction):
+    label, probs = prediction
+    if label == 'error':
+        return 0.0
+    if not probs:
+        return 1.0  # label-only models and gated silence carry no probabilities to doubt
+    return max(probs.values())
+
+
+def refine_mask(labels, confidences, k, n_fine, min_confidence=MIN_CONFIDENCE):
+    """
+    Which of `n_fine` fine windows need their own analysis, given the predictions of the coarse
+    windows (every k-th fine window). A fine window between two coarse windows is re-analysed when
+    they disagree or either is less confident than `min_confidence`; so is every window past the
+    last coarse one. Returns (need, owner): the mask and, for the rest, the nearest coarse window.
+    """
+    labels = np.asarray(labels, dtype=object)
+    low = np.asarray(confidences, dtype=np.float64) < min_confidence
+    n_coarse = labels.size
+    j = np.arange(n_fine)
+    left = np.minimum(j // k, n_coarse - 1)
+    right = np.minimum(left + 1, n_coarse - 1)
+    on_grid = j % k == 0
+    need = ~on_grid & ((labels[left] != labels[right]) | low[left] | low[right] | (left == n_coarse - 1))
+    owner = np.where(j % k <= k // 2, left, right)
+    return need, owner
+
+
+def _featurize(read, starts, sr, win, pitch, vad):
+    """
+    Features of the windows at `starts`. Each run of overlapping windows (at most a few hundred)
+    is decoded as one segment, so the audio between windows that are further apart is skipped.
+    """
+    frame_hop = frame_params(sr)[1]
+    features = np.zeros((starts.size, N_FEATURES), dtype=np.float32)
+    breaks = np.flatnonzero(np.diff(starts) > win) + 1
+    for run in np.split(np.arange(starts.size), breaks):
+        for i in range(0, run.size, _SEGMENT_WINDOWS):
+            idx = run[i:i + _SEGMENT_WINDOWS]
+            chunk = starts[idx]
+            # segments start on a frame boundary, so their frame grid is the whole file's
+            lo = int(chunk[0]) // frame_hop * frame_hop
+            seg = read(lo, int(chunk[-1]) + win + 2 * frame_hop)
+            features[idx] = window_matrix(seg, sr, win, chunk - lo, pitch, vad)
+    return features
+
+
+def adaptive_timeline(
+    read, total_len, sr, win, hop, model_choice, models, coarse_hop=None, min_confidence=MIN_CONFIDENCE,
+    batch_size=DEFAULT_BATCH_SIZE, pitch=PITCH_METHOD, vad=False, on_entries=None, cancel=None
+):
+    """
+    Coarse-to-fine analysis over a signal of `total_len` samples that `read(start, stop)` returns
+    stretches of. The windows `coarse_hop` apart are scored first; then only the fine windows
+    (`hop` apart) between coarse windows that disagree or are unsure are featurized and scored,
+    every other fine window takes the prediction of its nearest coarse window. The result is the
+    timeline of the fine grid, as analysing every window would give, handed to `on_entries` in
+    order a batch at a time and returned as a list.
+    """
+    total_sec = total_len / float(sr) if sr else 0.0
+    starts = window_starts(total_len, hop)
+    if starts.size == 0:
+        return []
+    k = coarse_factor(coarse_hop or COARSE_HOP_SEC * sr, hop)
+    coarse = starts[::k]
+    check_cancelled(cancel)
+    coarse_predictions = predict_windows(
+        _featurize(read, coarse, sr, win, pitch, vad), model_choice, models, batch_size=batch_size
+    )
+    need, owner = refine_mask(
+        [p[0] for p in coarse_predictions], [_confidence(p) for p in coarse_predictions], k, starts.size,
+        min_confidence
+    )
+
+    entries = []
+    block = max(k, batch_size)
+    for lo in range(0, starts.size, block):
+        check_cancelled(cancel)
+        hi = min(lo + block, starts.size)
+        predictions = [coarse_predictions[o] for o in owner[lo:hi]]
+        todo = np.flatnonzero(need[lo:hi])
+        if todo.size:
+            fine = predict_windows(
+                _featurize(read, starts[lo + todo], sr, win, pitch, vad), model_choice, models, batch_size=batch_size
+            )
+            for i, prediction in zip(todo, fine):
+                predictions[i] = prediction
+        batch = timeline_entries(starts[lo:hi], predictions, sr, win, total_sec)
+        entries.extend(batch)
+        if on_entries is not None:
+            on_entries(batch)
+    logger.debug(
+        f"Adaptive analysis: {coarse.size} coarse + {int(need.sum())} fine of {starts.size} windows scored"
+    )
+    return entries
@@ -0,0 +1,48 @@
+import numpy as np
+
+from .AudioCache import audioCache
+from .resample import ANALYSIS_SR, resample, resample_context, resample_ratio, resampled_length
+from .streaming import downmix
+
+__all__ = ['load_audio', 'clear_audio_cache', 'read_segment']
+
+
+def load_audio(file_path, sr=ANALYSIS_SR):
+    """
+    Decode `file_path` to a mono float32 signal at `sr` (None keeps the native rate),
+    polyphase-resampling it once. The signal is kept in the shared AudioCache keyed by
+    (path, mtime, size), so re-analysing the same file (e.g. with another model) or redrawing its
+    waveform skips decoding. Returns (sig, sr); `sig` is read-only.
+    """
+    return audioCache.mono(file_path, sr)
+
+
+def clear_audio_cache():
+    """Drop every cached decoded/resampled signal."""
+    audioCache.clear()
+
+
+def read_segment(sound_file, start, stop, sr=None):
+    """
+    Mono float32 samples [start, stop) of an open soundfile.SoundFile or WavMap, counted at rate `sr`
+    (None: the file's own rate). Only that stretch is decoded; when resampling, enough context is
+    decoded around it that the result matches resampling the whole file.
+    """
+    native_sr = sound_file.samplerate
+    rate = int(sr or native_sr)
+    start = max(0, int(start))
+    stop = min(int(stop), resampled_length(sound_file.frames, native_sr, rate))
+    if stop <= start:
+        return np.zeros(0, dtype=np.float32)
+    if rate == native_sr:
+        sound_file.seek(start)
+        return downmix(sound_file.read(stop - start, dtype='float32', always_2d=True))
+    up, down = resample_ratio(native_sr, rate)
+    pad = resample_context(up, down)
+    # start decoding on a multiple of `down`, so output sample indices stay integral
+    lo = max(0, start * down // up // down * down - pad)
+    hi = min(sound_file.frames, -(-stop * down // up) + pad)
+    sound_file.seek(lo)
+    data = downmix(sound_file.read(hi - lo, dtype='float32', always_2d=True))
+    offset = lo * up // down
+    return resample(data, native_sr, rate)[start - offset:stop - offset]
@@ -0,0 +1,217 @@
+import gc
+import os
+import time
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+from .features import build_feature_matrix, is_speech
+from .framing import frame_params, frame_signal
+from .inference import DEFAULT_BATCH_SIZE, predict_windows
+from .pitch import estimate_f0_batch, estimate_f0_yin
+from .resample import ANALYSIS_SR, resample
+from .streaming import DEFAULT_BLOCKSIZE
+from .WavMap import WavMap, pcm_to_float
+
+__all__ = [
+    'synthetic_speech', 'write_synthetic_wav', 'resample_benchmark', 'yin_benchmark', 'vad_benchmark', 'wav_benchmark'
+]
+
+
+def synthetic_speech(duration_sec: float, sr: int, seed: int = 0, speech_ratio: float = 1.0) -> np.ndarray:
+    """
+    Speech-like test signal: a harmonic voice with a wandering 90-300 Hz pitch, syllable-rate
+    amplitude modulation, pauses and a little noise; float32 in [-1, 1].
+    With `speech_ratio` < 1 the voice only takes that share of every 10 s, the rest is dead air
+    (faint 50 Hz hum and noise), as in a mostly silent recording.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(duration_sec * sr)
+    t = np.arange(n) / sr
+    f0 = 180 + 80 * np.sin(2 * np.pi * 0.3 * t) + 30 * np.sin(2 * np.pi * 2.1 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sr
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.5)
+    sig = 0.3 * voice * envelope + 0.01 * rng.standard_normal(n)
+    sig = sig / max(np.max(np.abs(sig)), 1e-9)
+    if speech_ratio < 1.0:
+        air = 0.003 * np.sin(2 * np.pi * 50 * t) + 0.002 * rng.standard_normal(n)
+        sig = np.where(t % 10.0 < 10.0 * speech_ratio, sig, air)
+    return sig.astype(np.float32)
+
+
+def write_synthetic_wav(
+    file_path: str, duration_sec: float, sr: int, channels: int = 1, chunk_sec: float = 60.0
+) -> str:
+    """
+    Write `duration_sec` of synthetic_speech as a 16-bit PCM WAV (like the app's recordings), one
+    `chunk_sec` chunk at a time, so multi-GB test files never have to fit in memory. RF64 is used
+    past the 4 GB RIFF limit. Returns `file_path`.
+    """
+    chunk = synthetic_speech(min(chunk_sec, duration_sec), sr)
+    chunk = np.repeat(chunk[:, None], channels, axis=1)
+    total = int(duration_sec * sr)
+    fmt = 'RF64' if total * channels * 2 >= 1 << 32 else 'WAV'
+    with sf.SoundFile(file_path, 'w', sr, channels, 'PCM_16', format=fmt) as f:
+        for start in range(0, total, len(chunk)):
+            f.write(chunk[:total - start])
+    return file_path
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _rss_growth(func) -> Optional[int]:
+    """Resident memory added by func() while its result is still held."""
+    gc.collect()
+    before = _rss_bytes()
+    held = func()
+    after = _rss_bytes()
+    del held
+    gc.collect()
+    return after - before if before is not None and after is not None else None
+
+
+def _best_of(func, repeats):
+    best = float('inf')
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        out = func()
+        best = min(best, time.perf_counter() - started)
+    return best, out
+
+
+def resample_benchmark(
+    sig, sr: int, sample_rate: Optional[int] = ANALYSIS_SR, win_sec: float = 1.0, hop_sec: float = 0.5,
+    repeats: int = 3
+) -> dict:
+    """
+    Feature-stage timing of `sig` at its native rate `sr` versus resampling it to `sample_rate`
+    first: {'native_s', 'resample_s', 'features_s', 'speedup', 'windows_native', 'windows'}.
+    Times are the best of `repeats`; 'speedup' compares native features against resample + features.
+    """
+    sig = np.asarray(sig, dtype=np.float32)
+    native_s, (starts, _) = _best_of(
+        lambda: build_feature_matrix(sig, sr, int(win_sec * sr), int(hop_sec * sr)), repeats
+    )
+    rate = int(sample_rate or sr)
+    resample_s, low = _best_of(lambda: resample(sig, sr, rate), repeats)
+    features_s, (low_starts, _) = _best_of(
+        lambda: build_feature_matrix(low, rate, int(win_sec * rate), int(hop_sec * rate)), repeats
+    )
+    return {
+        'native_s': native_s,
+        'resample_s': resample_s,
+        'features_s': features_s,
+        'speedup': native_s / max(resample_s + features_s, 1e-12),
+        'windows_native': int(starts.size),
+        'windows': int(low_starts.size),
+    }
+
+
+def yin_benchmark(sig, sr: int, frame_len: Optional[int] = None, repeats: int = 3, tolerance: float = 1e-3) -> dict:
+    """
+    Time estimate_f0_yin against the FFT autocorrelation estimator and, where librosa is installed,
+    check it against librosa.yin on the same frames (center=False, 50% overlap):
+    {'frames', 'yin_s', 'autocorr_s', 'librosa_s', 'max_rel_err', 'agreement'}; the librosa
+    entries are None without librosa. 'agreement' is the share of frames within `tolerance`
+    relative error. `frame_len` defaults to the analysis frame (see frame_params).
+    """
+    sig = np.asarray(sig, dtype=np.float32)
+    frame_len = int(frame_len or frame_params(sr)[0])
+    hop = frame_len // 2
+    frames = frame_signal(sig, frame_len, hop)
+    yin_s, f0s = _best_of(lambda: estimate_f0_yin(frames, sr), repeats)
+    autocorr_s, _ = _best_of(lambda: estimate_f0_batch(frames, sr), repeats)
+    result = {
+        'frames': int(frames.shape[0]), 'yin_s': yin_s, 'autocorr_s': autocorr_s,
+        'librosa_s': None, 'max_rel_err': None, 'agreement': None,
+    }
+    try:
+        import librosa
+    except ImportError:
+        return result
+    from .pitch import YIN_FMAX, YIN_FMIN, YIN_THRESHOLD
+
+    librosa_s, ref = _best_of(lambda: librosa.yin(
+        sig, fmin=YIN_FMIN, fmax=min(YIN_FMAX, sr / 2), sr=sr, frame_length=frame_len, hop_length=hop,
+        trough_threshold=YIN_THRESHOLD, center=False
+    ), repeats)
+    rel = np.abs(f0s - ref) / np.maximum(np.abs(ref), 1e-12)
+    result.update(librosa_s=librosa_s, max_rel_err=float(np.max(rel)), agreement=float(np.mean(rel <= tolerance)))
+    return result
+
+
+def vad_benchmark(
+    sig, sr: int, model_choice: str = 'knn', models: Optional[dict] = None, win_sec: float = 1.0,
+    hop_sec: float = 0.5, batch_size: int = DEFAULT_BATCH_SIZE, repeats: int = 3
+) -> dict:
+    """
+    Features + inference time of `sig` without and with voice activity gating:
+    {'windows', 'speech_windows', 'off_s', 'on_s', 'speedup'} (best of `repeats`).
+    """
+    sig = np.asarray(sig, dtype=np.float32)
+    models = models or {}
+    win, hop = int(win_sec * sr), int(hop_sec * sr)
+
+    def run(vad):
+        _, features = build_feature_matrix(sig, sr, win, hop, vad=vad)
+        predict_windows(features, model_choice, models, batch_size=batch_size)
+        return features
+
+    off_s, features = _best_of(lambda: run(False), repeats)
+    on_s, gated = _best_of(lambda: run(True), repeats)
+    return {
+        'windows': int(features.shape[0]),
+        'speech_windows': int(np.count_nonzero(is_speech(gated))),
+        'off_s': off_s,
+        'on_s': on_s,
+        'speedup': off_s / max(on_s, 1e-12),
+    }
+
+
+def wav_benchmark(file_path: str, repeats: int = 3, blocksize: int = DEFAULT_BLOCKSIZE) -> dict:
+    """
+    Reading a WAV file with sf.read (a full float32 decode, as the audio cache does) versus WavMap
+    (header parse + memory map): open-to-first-sample latency, resident memory added while the
+    result is held, and a block-wise pass over the whole file (peak level, as block-wise analysis
+    reads it) through soundfile and through the map:
+    {'frames', 'file_bytes', 'sf_first_s', 'map_first_s', 'sf_rss_bytes', 'map_rss_bytes',
+    'sf_scan_s', 'map_scan_s'}. Times are the best of `repeats`, so the page cache is warm;
+    the RSS entries are None where /proc is not available.
+    """
+    def sf_first():
+        data, _ = sf.read(file_path, dtype='float32', always_2d=True)
+        return data, float(data[0, 0]) if data.size else None
+
+    def map_first():
+        wav = WavMap(file_path)
+        return wav, float(pcm_to_float(wav.data[:1])[0, 0]) if wav.frames else None
+
+    def sf_scan():
+        with sf.SoundFile(file_path) as f:
+            return max((float(np.max(np.abs(b))) for b in f.blocks(blocksize, dtype='float32')), default=0.0)
+
+    def map_scan():
+        with WavMap(file_path) as f:
+            return max((float(np.max(np.abs(b))) for b in f.blocks(blocksize)), default=0.0)
+
+    map_first_s, (wav, _) = _best_of(map_first, repeats)
+    sf_first_s, _ = _best_of(sf_first, repeats)
+    return {
+        'frames': wav.frames,
+        'file_bytes': os.path.getsize(file_path),
+        'sf_first_s': sf_first_s,
+        'map_first_s': map_first_s,
+        'sf_rss_bytes': _rss_growth(sf_first),
+        'map_rss_bytes': _rss_growth(map_first),
+        'sf_scan_s': _best_of(sf_scan, repeats)[0],
+        'map_scan_s': _best_of(map_scan, repeats)[0],
+    }
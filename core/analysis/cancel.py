@@ -0,0 +1,17 @@
+__all__ = ['AnalysisCancelled', 'check_cancelled']
+
+
+class AnalysisCancelled(Exception):
+    """Raised inside an analysis when its cancellation token has been set."""
+
+    def __str__(self):
+        return 'Analysis cancelled'
+
+
+def check_cancelled(cancel):
+    """
+    Raise AnalysisCancelled if `cancel` (a threading.Event or anything with is_set(), or None)
+    has been set. Called between blocks and batches so a superseded job stops promptly.
+    """
+    if cancel is not None and cancel.is_set():
+        raise AnalysisCancelled()
@@ -0,0 +1,153 @@
+import numpy as np
+
+from .framing import frame_params, frame_count, frame_signal, frame_energy
+from .pitch import PITCH_METHOD, estimate_f0
+from .vad import VAD_MIN_SPEECH, frame_cover, speech_frames, speech_windows
+from .windows import window_stats
+
+__all__ = [
+    'N_FEATURES', 'extract_contours', 'feature_params', 'window_features', 'window_starts', 'window_frames',
+    'contour_features', 'tail_window_features', 'is_speech', 'window_matrix', 'build_feature_matrix',
+]
+
+N_FEATURES = 8
+
+
+def extract_contours(sig, sr, pitch=PITCH_METHOD):
+    """
+    Frame a 1-D signal (one window or the whole file) and compute per-frame arrays:
+    f0_contour, energy_contour — these mirror the original ML_feed expectations.
+    `pitch` selects the f0 estimator (see PITCH_METHODS).
+    """
+    frame_len, hop = frame_params(sr)
+    frames = frame_signal(sig, frame_len, hop)
+    if frames.shape[1] == 0:
+        return np.zeros(1, dtype=np.float32), np.zeros(1, dtype=np.float32)
+    energies = frame_energy(frames)
+    f0s = estimate_f0(frames, sr, pitch)
+    return f0s, energies
+
+
+def feature_params(sr, win, hop, pitch=PITCH_METHOD, vad=False):
+    """Every parameter the feature matrix depends on, e.g. for keying cached features."""
+    frame_len, frame_hop = frame_params(sr)
+    return {
+        'sr': int(sr), 'win': int(win), 'hop': int(hop), 'frame_len': frame_len, 'frame_hop': frame_hop,
+        'pitch': pitch, 'vad': int(bool(vad)),
+    }
+
+
+def window_features(f0s, energies):
+    """ML_feed-like vector: mean/var/max/min of the f0 contour followed by the same for energy."""
+    if f0s.size == 0 or energies.size == 0:
+        return np.zeros(N_FEATURES, dtype=np.float32)
+    return np.array([
+        np.mean(f0s), np.var(f0s), np.max(f0s), np.min(f0s),
+        np.mean(energies), np.var(energies), np.max(energies), np.min(energies)
+    ], dtype=np.float32)
+
+
+def window_starts(total_len, hop):
+    """Start sample of every sliding analysis window, `hop` samples apart, over `total_len` samples."""
+    if total_len <= 0 or hop <= 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.arange(0, total_len, hop, dtype=np.int64)
+
+
+def window_frames(starts, total_len, sr, win):
+    """
+    Map analysis windows onto the whole-signal frame grid.
+    Returns (first, counts, width): index of each window's first frame (the grid frame nearest to
+    the window start), how many grid frames it covers, and the frame count of a full window.
+    """
+    frame_len, hop = frame_params(sr)
+    width = frame_count(win, frame_len, hop)
+    n_frames = frame_count(total_len, frame_len, hop)
+    first = np.rint(np.asarray(starts, dtype=np.float64) / hop).astype(np.int64)
+    counts = np.clip(n_frames - first, 0, width)
+    return first, counts, width
+
+
+def contour_features(f0s, energies, first, counts, width):
+    """(n_windows, 8) feature matrix from whole-signal contours via sliding-window reductions."""
+    features = np.zeros((first.size, N_FEATURES), dtype=np.float32)
+    features[:, 0:4] = np.stack(window_stats(f0s, first, counts, width), axis=1)
+    features[:, 4:8] = np.stack(window_stats(energies, first, counts, width), axis=1)
+    return features
+
+
+def tail_window_features(seg, sr, pitch=PITCH_METHOD, vad=False):
+    """
+    Features of a window that holds no full grid frame (framed on its own). With `vad`, a
+    window without speech keeps its energy statistics but gets NaN pitch columns. An empty
+    segment gives a zero row; any shorter-than-a-frame segment is framed as one short frame.
+    """
+    if len(seg) == 0:
+        return np.zeros(N_FEATURES, dtype=np.float32)
+    if vad:
+        frame_len, hop = frame_params(sr)
+        frames = frame_signal(seg, frame_len, hop)
+        if frames.shape[1] > 0:
+            energies = frame_energy(frames)
+            if np.mean(speech_frames(frames, sr, energies)) < VAD_MIN_SPEECH:
+                features = window_features(np.zeros(1, dtype=np.float32), energies)
+                features[0:4] = np.nan
+                return features
+    f0s, energies = extract_contours(seg, sr, pitch)
+    return window_features(f0s, energies)
+
+
+def is_speech(features):
+    """Rows of a feature matrix that were not gated out as non-speech (their pitch columns are set)."""
+    return ~np.isnan(np.asarray(features)[:, 0])
+
+
+def window_matrix(sig, sr, win, starts, pitch=PITCH_METHOD, vad=False):
+    """
+    (len(starts), 8) feature matrix for the windows of `win` samples starting at `starts`
+    (sample offsets into `sig`, any spacing). The energy contour covers the whole signal on a
+    single frame grid, pitch is only estimated on the grid frames the windows cover (with `vad`:
+    the windows the voice activity pass keeps); per-window statistics then come from sliding
+    reductions over the contours. Windows that hold no full grid frame (a signal shorter than one
+    frame, the very tail) are framed on their own. Windows gated out by `vad` keep their energy
+    statistics but get NaN pitch columns (see is_speech).
+    A segment of a longer signal gives the same rows as the whole signal as long as it starts on
+    a frame boundary (a multiple of the frame hop) and reaches past the last window's frames.
+    """
+    starts = np.asarray(starts, dtype=np.int64)
+    features = np.zeros((starts.size, N_FEATURES), dtype=np.float32)
+    if starts.size == 0:
+        return features
+    first, counts, width = window_frames(starts, len(sig), sr, win)
+    if width > 0 and np.any(counts > 0):
+        frame_len, frame_hop = frame_params(sr)
+        frames = frame_signal(sig, frame_len, frame_hop)
+        energies = frame_energy(frames)
+        keep = speech_windows(speech_frames(frames, sr, energies), first, counts) if vad else counts > 0
+        needed = frame_cover(first[keep], counts[keep], frames.shape[0])
+        if np.all(needed):
+            f0s = estimate_f0(frames, sr, pitch)
+        else:
+            f0s = np.zeros(frames.shape[0], dtype=np.float32)
+            if np.any(needed):
+                f0s[needed] = estimate_f0(frames[needed], sr, pitch)
+        features = contour_features(f0s, energies, first, counts, width)
+        features[~keep & (counts > 0), 0:4] = np.nan
+    for i in np.flatnonzero(counts == 0):
+        idx = starts[i]
+        features[i] = tail_window_features(sig[idx: idx + win], sr, pitch, vad)
+    return features
+
+
+def build_feature_matrix(sig, sr, win, hop, pitch=PITCH_METHOD, vad=False):
+    """
+    Phase one of the analysis: compute the (n_windows, 8) feature matrix for every sliding
+    window of `win` samples, `hop` samples apart (see window_matrix). Returns (starts, features).
+    Contours are computed once over the whole signal, so frames shared by overlapping windows
+    are only analysed once.
+    With `vad`, a cheap energy / zero-crossing pass (see vad.speech_frames) classifies the windows
+    first and pitch is only estimated on the frames of speech windows; the other windows keep
+    their energy statistics but get NaN pitch columns (see is_speech).
+    """
+    starts = window_starts(len(sig), hop)
+    return starts, window_matrix(sig, sr, win, starts, pitch, vad)
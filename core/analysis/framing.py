@@ -0,0 +1,42 @@
+import numpy as np
+
+__all__ = ['FRAME_SEC', 'frame_params', 'frame_count', 'frame_signal', 'frame_energy']
+
+FRAME_SEC = 0.06  # 60ms analysis frames
+
+
+def frame_params(sr):
+    """Return (frame_len, hop) in samples for the 60ms / 50% overlap analysis frames."""
+    frame_len = int(sr * FRAME_SEC)
+    hop = int(frame_len // 2)
+    if frame_len < 16:
+        frame_len = 256
+        hop = 128
+    return frame_len, hop
+
+
+def frame_count(n_samples, frame_len, hop):
+    """Number of full frames of `frame_len` samples, `hop` apart, that fit in `n_samples`."""
+    if n_samples < frame_len:
+        return 0
+    return 1 + (n_samples - frame_len) // hop
+
+
+def frame_signal(sig, frame_len, hop):
+    """
+    Split a 1-D signal into a (n_frames, frame_len) matrix without copying.
+    The result is a read-only strided view over `sig`. A signal shorter than one frame
+    becomes a single (short) frame, matching the behaviour of the original frame loop.
+    """
+    sig = np.asarray(sig)
+    if sig.size < frame_len:
+        return sig.reshape(1, -1)
+    return np.lib.stride_tricks.sliding_window_view(sig, frame_len)[::hop]
+
+
+def frame_energy(frames):
+    """RMS energy of every frame (row) of a frame matrix, computed in one batched reduction."""
+    if frames.shape[0] == 0 or frames.shape[1] == 0:
+        return np.zeros(frames.shape[0], dtype=np.float32)
+    power = np.einsum('ij,ij->i', frames, frames) / frames.shape[1]
+    return np.sqrt(power).astype(np.float32)
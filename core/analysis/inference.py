@@ -0,0 +1,131 @@
+import numpy as np
+
+from .features import is_speech
+from .vad import SILENCE_LABEL
+
+__all__ = ['DEFAULT_BATCH_SIZE', 'ENSEMBLE', 'ensemble_predictions', 'model_labels', 'predict_windows']
+
+DEFAULT_BATCH_SIZE = 1024
+ENSEMBLE = 'ensemble'  # key of the averaged-probability timeline next to the per-model ones
+
+
+def model_labels(models, n_classes):
+    """Class names from the label encoder, or stringified indices when no encoder is loaded."""
+    encoder = models.get('encoder')
+    if encoder is not None:
+        return list(encoder.classes_)
+    return [str(i) for i in range(n_classes)]
+
+
+def _class_names(classes, encoder):
+    """A classifier's classes_ (or predictions) as names: integer classes go through `encoder`."""
+    classes = np.asarray(classes)
+    if encoder is not None and classes.dtype.kind in 'iu':
+        classes = encoder.inverse_transform(classes)
+    return [str(c) for c in classes]
+
+
+def _heuristic(features):
+    # fallback: use energy-based heuristic on the mean window RMS
+    out = []
+    for avg_rms in features[:, 4]:
+        if avg_rms < 0.02:
+            label = 'neutral'
+        elif avg_rms < 0.08:
+            label = 'calm'
+        else:
+            label = 'excited'
+        out.append((label, {label: 1.0}))
+    return out
+
+
+def _predict_batch(batch, model_choice, models):
+    if model_choice in ('mlp_numpy', 'mlp_lp', 'knn_lp') and models.get(model_choice) is not None:
+        # NumPy / quantized backends carry their own scaler and class names
+        model = models[model_choice]
+        probs = model.predict_proba(batch)
+        if model.classes_ is not None:
+            return _label_rows(probs, list(model.classes_))
+    elif model_choice == 'mlp' and models.get('mlp') is not None:
+        scaler = models.get('scaler')
+        scaled = scaler.transform(batch) if scaler is not None else batch
+        probs = np.asarray(models['mlp'].predict(scaled, batch_size=len(scaled), verbose=0))
+        probs = probs.reshape(len(batch), -1)
+    elif model_choice == 'knn' and models.get('knn') is not None:
+        knn = models['knn']
+        encoder = models.get('knn_encoder')
+        if not hasattr(knn, 'predict_proba'):
+            return [(label, None) for label in _class_names(knn.predict(batch), encoder)]
+        return _label_rows(np.asarray(knn.predict_proba(batch)), _class_names(knn.classes_, encoder))
+    else:
+        return _heuristic(batch)
+    return _label_rows(probs, model_labels(models, probs.shape[1]))
+
+
+def _label_rows(probs, labels):
+    return [
+        (labels[int(np.argmax(row))], dict(zip(labels, [float(x) for x in row])))
+        for row in probs
+    ]
+
+
+def predict_windows(features, model_choice, models, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Phase two of the analysis: run the scaler and the selected model over the whole
+    (n_windows, 8) feature matrix, `batch_size` rows per call.
+    Returns one (label, probs) pair per window; probs is a {label: probability} dict or None.
+    Windows gated out as non-speech (NaN pitch columns, see build_feature_matrix) skip the model
+    and come back as (SILENCE_LABEL, None).
+    """
+    features = np.asarray(features, dtype=np.float32)
+    batch_size = max(1, int(batch_size or DEFAULT_BATCH_SIZE))
+    speech = is_speech(features)
+    if not speech.all():
+        predictions = [(SILENCE_LABEL, None)] * features.shape[0]
+        voiced = predict_windows(features[speech], model_choice, models, batch_size)
+        for i, prediction in zip(np.flatnonzero(speech), voiced):
+            predictions[i] = prediction
+        return predictions
+    predictions = []
+    for start in range(0, features.shape[0], batch_size):
+        batch = features[start:start + batch_size]
+        try:
+            predictions.extend(_predict_batch(batch, model_choice, models))
+        except Exception:
+            predictions.extend(('error', {'error': 1.0}) for _ in range(batch.shape[0]))
+    return predictions
+
+
+def ensemble_predictions(predictions):
+    """
+    Average several models' predict_windows output for the same windows into one (label, probs)
+    list. Probabilities are averaged per label over the models that scored a window (a model without
+    probabilities counts as 1.0 for its label, failed windows are left out) and the label is the
+    argmax. Windows no model scored stay SILENCE_LABEL, or 'error' if every model failed.
+    Raises ValueError if two models' probabilities are over different labels.
+    """
+    out = []
+    labels = None
+    for rows in zip(*predictions):
+        sums = {}
+        n = 0
+        for label, probs in rows:
+            if label == 'error' or (label == SILENCE_LABEL and probs is None):
+                continue
+            if probs is not None:
+                if labels is None:
+                    labels = probs.keys()
+                elif probs.keys() != labels:
+                    raise ValueError(
+                        f"Cannot ensemble models with different labels: {sorted(labels)} vs {sorted(probs)}"
+                    )
+            for k, v in (probs or {label: 1.0}).items():
+                sums[k] = sums.get(k, 0.0) + float(v)
+            n += 1
+        if not n:
+            silent = any(label == SILENCE_LABEL for label, _ in rows)
+            out.append((SILENCE_LABEL, None) if silent else ('error', {'error': 1.0}))
+            continue
+        probs = {k: v / n for k, v in sums.items()}
+        out.append((max(probs, key=probs.get), probs))
+    return out
@@ -0,0 +1,83 @@
+import os
+from typing import Dict, Optional
+
+from vvecon.qt.logger import logger
+
+from .NumpyKNN import NumpyKNN
+from .NumpyMLP import NumpyMLP
+from .QuantizedKNN import QuantizedKNN
+from .QuantizedMLP import QuantizedMLP
+
+__all__ = [
+    'MLP_FILE', 'MLP_NUMPY_FILE', 'MLP_LOW_POWER_FILE', 'SCALER_FILE', 'ENCODER_FILE', 'KNN_FILE',
+    'KNN_ENCODER_FILE', 'KNN_LOW_POWER_FILE', 'MODEL_FILES', 'MODELS_DIR', 'load_models',
+]
+
+MLP_FILE = 'emotiondetector_mlp_model.h5'
+MLP_NUMPY_FILE = 'emotiondetector_mlp_weights.npz'  # see NumpyMLP / python -m wavemood export-mlp
+MLP_LOW_POWER_FILE = 'emotiondetector_mlp_weights_lp.npz'  # see QuantizedMLP / python -m wavemood quantize
+SCALER_FILE = 'emotiondetectornlw_scaler.pkl'  # the MLP's StandardScaler
+ENCODER_FILE = 'emotiondetectornlw_labelencoder.pkl'  # the MLP's LabelEncoder
+KNN_FILE = 'knn_emotion_model.pkl'
+KNN_ENCODER_FILE = 'emotion_labelencoderknn.pkl'  # names the KNN's integer classes
+KNN_LOW_POWER_FILE = 'knn_emotion_model_lp.npz'  # see QuantizedKNN / python -m wavemood quantize
+# model choice -> the file its model is loaded from
+MODEL_FILES = {
+    'mlp': MLP_FILE, 'mlp_numpy': MLP_NUMPY_FILE, 'mlp_lp': MLP_LOW_POWER_FILE, 'knn': KNN_FILE,
+    'knn_lp': KNN_LOW_POWER_FILE,
+}
+# the models shipped with the app, wherever it is started from
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'res', 'nlm')
+
+
+def load_models(
+    base: Optional[str] = None, mlp: bool = True, knn: bool = True, mlp_numpy: bool = True,
+    mlp_lp: bool = True, knn_lp: bool = True
+) -> Dict[str, object]:
+    """
+    Load the emotion models/scalers/encoders found in `base` (default: MODELS_DIR, res/nlm).
+    Returns a dict keyed for predict_windows ('mlp', 'mlp_numpy', 'mlp_lp', 'knn', 'knn_lp',
+    'scaler', 'encoder', 'knn_encoder'); missing or skipped files give None. TensorFlow is only imported when
+    `mlp` is requested and the model file exists; joblib only when `mlp` or `knn` is. The NumPy
+    and quantized (low-power) models carry their own scaler and class names. A Euclidean sklearn
+    KNN is converted to the batched NumpyKNN backend; 'knn_encoder' names its classes.
+    """
+    base = base or MODELS_DIR
+    models = {
+        'mlp': None, 'mlp_numpy': None, 'mlp_lp': None, 'scaler': None, 'encoder': None, 'knn': None,
+        'knn_encoder': None, 'knn_lp': None,
+    }
+    for key, wanted, name, cls in (
+        ('mlp_numpy', mlp_numpy, MLP_NUMPY_FILE, NumpyMLP),
+        ('mlp_lp', mlp_lp, MLP_LOW_POWER_FILE, QuantizedMLP),
+        ('knn_lp', knn_lp, KNN_LOW_POWER_FILE, QuantizedKNN),
+    ):
+        path = os.path.join(base, name)
+        if wanted and os.path.exists(path):
+            models[key] = cls.load(path)
+    if not (mlp or knn):
+        return models
+    import joblib
+
+    mlp_path = os.path.join(base, MLP_FILE)
+    if mlp and os.path.exists(mlp_path):
+        try:
+            from tensorflow.saved_model import load as load_model
+        except Exception as e:
+            logger.error(f"Error importing TensorFlow/Keras: {str(e)}")
+        else:
+            models['mlp'] = load_model(mlp_path)
+    for key, name in (
+        ('scaler', SCALER_FILE), ('encoder', ENCODER_FILE), ('knn', KNN_FILE), ('knn_encoder', KNN_ENCODER_FILE)
+    ):
+        if key in ('knn', 'knn_encoder') and not knn:
+            continue
+        path = os.path.join(base, name)
+        if os.path.exists(path):
+            models[key] = joblib.load(path)
+    if models['knn'] is not None:
+        try:
+            models['knn'] = NumpyKNN.fromSklearn(models['knn'])
+        except (AttributeError, ValueError) as e:
+            logger.info(f"Using the scikit-learn KNN as is: {e}")
+    return models
@@ -0,0 +1,294 @@
+import time
+
+import numpy as np
+import soundfile as sf
+
+from vvecon.qt.logger import logger
+
+from .adaptive import COARSE_HOP_SEC, MIN_CONFIDENCE, adaptive_timeline
+from .audio import load_audio, read_segment
+from .cancel import AnalysisCancelled, check_cancelled
+from .features import N_FEATURES, feature_params, window_starts
+from .inference import DEFAULT_BATCH_SIZE, ENSEMBLE, ensemble_predictions, predict_windows
+from .models import MODEL_FILES
+from .resample import ANALYSIS_SR, resampled_length
+from .RunningSummary import RunningSummary
+from .streaming import iter_file_features, iter_signal_features
+from .timeline import timeline_entries
+from .WavMap import open_audio
+
+__all__ = [
+    'WIN_SEC', 'HOP_SEC', 'STREAMING_THRESHOLD_SEC', 'PROGRESS_INTERVAL_SEC', 'FEATURE_BLOCKSIZE', 'analyze_file',
+    'analyze_models',
+]
+
+WIN_SEC = 1.0
+HOP_SEC = 0.5
+STREAMING_THRESHOLD_SEC = 600  # analyse longer files block by block
+PROGRESS_INTERVAL_SEC = 0.25  # at most ~4 partial updates per second
+FEATURE_BLOCKSIZE = 1 << 21  # in-memory samples featurized between progress/cancel points (~95 s at 22.05 kHz)
+
+
+class _TimelineBuilder:
+    """
+    Collects timeline entries and a running summary; entries added between two progress
+    emissions are coalesced into a single on_progress call no more often than `interval`.
+    """
+
+    def __init__(self, total_sec, on_progress=None, interval=PROGRESS_INTERVAL_SEC):
+        self.totalSec = total_sec
+        self.entries = []
+        self._summary = RunningSummary()
+        self._pending = []
+        self._onProgress = on_progress
+        self._interval = interval
+        self._lastEmit = time.monotonic()
+
+    def extend(self, entries):
+        self.entries.extend(entries)
+        self._summary.add(entries)
+        if self._onProgress is None:
+            return
+        self._pending.extend(entries)
+        if time.monotonic() - self._lastEmit >= self._interval:
+            self.flush()
+
+    def flush(self):
+        if self._onProgress is None or not self._pending:
+            return
+        processed = self._pending[-1]['end']
+        self._onProgress({
+            'entries': self._pending,
+            'summary': self._summary.summary(processed),
+            'processed_sec': processed,
+            'total_sec': self.totalSec,
+        })
+        self._pending = []
+        self._lastEmit = time.monotonic()
+
+    def summary(self):
+        return self._summary.summary(self.totalSec)
+
+
+def _predict_into(builders, starts, features, models, batch_size, sr, win):
+    """
+    Run every model in `models` ({model_choice: models}) over the same feature rows and hand each
+    model's entries to its builder; an ENSEMBLE builder gets the averaged probabilities.
+    """
+    predictions = {
+        choice: predict_windows(features, choice, choice_models, batch_size=batch_size)
+        for choice, choice_models in models.items()
+    }
+    if ENSEMBLE in builders:
+        predictions[ENSEMBLE] = ensemble_predictions(list(predictions.values()))
+    for key, key_predictions in predictions.items():
+        builder = builders[key]
+        builder.extend(timeline_entries(starts, key_predictions, sr, win, builder.totalSec))
+
+
+def _predict_progressively(builders, starts, features, models, batch_size, sr, win, cancel=None):
+    """Run the models over `features` one batch at a time, handing each batch's entries to `builders`."""
+    for i in range(0, len(features), batch_size):
+        check_cancelled(cancel)
+        _predict_into(builders, starts[i:i + batch_size], features[i:i + batch_size], models, batch_size, sr, win)
+
+
+def _predict_chunks(builders, chunks, models, batch_size, sr, win, cancel=None):
+    """
+    Predict each (starts, features) chunk as feature extraction yields it, so progress and
+    cancellation follow the expensive feature stage; returns the whole feature matrix.
+    """
+    feature_chunks = []
+    for starts, features in chunks:
+        feature_chunks.append(features)
+        _predict_progressively(builders, starts, features, models, batch_size, sr, win, cancel)
+        check_cancelled(cancel)  # before the next block is featurized
+    return np.concatenate(feature_chunks) if feature_chunks else np.zeros((0, N_FEATURES), dtype=np.float32)
+
+
+def _analyze(
+    file_path, models, ensemble, batch_size, streaming, streaming_threshold_sec, cache, win_sec, hop_sec,
+    on_progress, progress_interval, cancel, sample_rate, vad, adaptive=False, coarse_hop_sec=COARSE_HOP_SEC,
+    min_confidence=MIN_CONFIDENCE
+):
+    """Shared body of analyze_file and analyze_models; `models` is {model_choice: models}."""
+    result = {
+        'ok': False, 'error': '', 'cancelled': False, 'timeline': [], 'summary': {}, 'models': {}, 'ensemble': None
+    }
+    try:
+        for model_choice, choice_models in models.items():
+            # no silent fallback to the energy heuristic when the model itself is missing
+            if choice_models.get(model_choice) is None:
+                raise FileNotFoundError(
+                    f"No {model_choice} model loaded ({MODEL_FILES.get(model_choice, 'unknown model choice')})"
+                )
+        batch_size = batch_size or DEFAULT_BATCH_SIZE
+        keys = list(models) + ([ENSEMBLE] if ensemble else [])
+        # progress follows the ensemble, or the first model
+        primary = keys[-1] if ensemble else keys[0]
+
+        def make_builders(total_sec):
+            return {
+                key: _TimelineBuilder(total_sec, on_progress if key == primary else None, progress_interval)
+                for key in keys
+            }
+
+        info = sf.info(file_path)
+        if streaming is None:
+            streaming = info.duration > streaming_threshold_sec
+
+        # cached features skip decoding and feature extraction entirely
+        digest = None
+        params = {}
+        cached = None
+        analysis_sr = int(sample_rate or info.samplerate)
+        if cache is not None and analysis_sr:
+            params = feature_params(
+                analysis_sr, int(win_sec * analysis_sr), int(hop_sec * analysis_sr), vad=vad
+            )
+            try:
+                digest = cache.content_hash(file_path)
+                cached = cache.get(digest, **params)
+            except Exception as e:
+                logger.error(f"Feature cache lookup failed: {e}")
+
+        if cached is not None:
+            features, total_len = cached
+            sr = params['sr']
+            win = params['win']
+            builders = make_builders(total_len / float(sr))
+            starts = window_starts(total_len, params['hop'])
+            _predict_progressively(builders, starts, features, models, batch_size, sr, win, cancel)
+        elif adaptive:
+            (model_choice, choice_models), = models.items()
+            sr = analysis_sr
+            features = None  # only some windows get featurized, nothing to cache
+            with open_audio(file_path) as f:
+                if streaming:
+                    total_len = resampled_length(f.frames, f.samplerate, sr)
+
+                    def read(start, stop):
+                        return read_segment(f, start, stop, sr)
+                else:
+                    sig, sr = load_audio(file_path, sample_rate)
+                    total_len = len(sig)
+
+                    def read(start, stop):
+                        return sig[start:stop]
+                builders = make_builders(total_len / float(sr) if sr else 0.0)
+                adaptive_timeline(
+                    read, total_len, sr, int(win_sec * sr), int(hop_sec * sr), model_choice, choice_models,
+                    coarse_hop=int(coarse_hop_sec * sr), min_confidence=min_confidence, batch_size=batch_size,
+                    vad=vad, on_entries=builders[model_choice].extend, cancel=cancel
+                )
+        elif streaming:
+            sr = analysis_sr
+            win = int(win_sec * sr)
+            hop = int(hop_sec * sr)
+            builders = make_builders(info.duration)
+            with open_audio(file_path) as f:
+                chunks = iter_file_features(f, win, hop, sr=sr, vad=vad)
+                features = _predict_chunks(builders, chunks, models, batch_size, sr, win, cancel)
+                total_len = resampled_length(f.frames, f.samplerate, sr)
+        else:
+            # mono float32 at the analysis rate, decoded and resampled once per file
+            sig, sr = load_audio(file_path, sample_rate)
+            total_len = len(sig)
+            builders = make_builders(total_len / float(sr) if sr else 0.0)
+            win = int(win_sec * sr)
+            hop = int(hop_sec * sr)
+            if win <= 0:
+                win = total_len
+                hop = win
+            check_cancelled(cancel)
+            # features block by block (the same rows as build_feature_matrix), each block's windows
+            # scored as soon as they are ready
+            chunks = iter_signal_features(sig, sr, win, hop, blocksize=FEATURE_BLOCKSIZE, vad=vad)
+            features = _predict_chunks(builders, chunks, models, batch_size, sr, win, cancel)
+        builders[primary].flush()
+
+        if cached is None and digest is not None and features is not None:
+            try:
+                cache.put(digest, features, total_len, **params)
+            except Exception as e:
+                logger.error(f"Feature cache store failed: {e}")
+        if cache is not None:
+            logger.debug(f"Feature cache: {cache.stats()}")
+
+        timelines = {key: {'timeline': b.entries, 'summary': b.summary()} for key, b in builders.items()}
+        result['ok'] = True
+        result['timeline'] = timelines[primary]['timeline']
+        result['summary'] = timelines[primary]['summary']
+        result['ensemble'] = timelines.pop(ENSEMBLE, None)
+        result['models'] = timelines
+        return result
+    except AnalysisCancelled as e:
+        result['error'] = str(e)
+        result['cancelled'] = True
+        return result
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+
+
+def analyze_file(
+    file_path, model_choice='mlp', models=None, batch_size=DEFAULT_BATCH_SIZE, streaming=None,
+    streaming_threshold_sec=STREAMING_THRESHOLD_SEC, cache=None, win_sec=WIN_SEC, hop_sec=HOP_SEC,
+    on_progress=None, progress_interval=PROGRESS_INTERVAL_SEC, cancel=None, sample_rate=ANALYSIS_SR, vad=True,
+    adaptive=False, coarse_hop_sec=COARSE_HOP_SEC, min_confidence=MIN_CONFIDENCE
+):
+    """
+    Segment a file into overlapping windows, extract features per window, predict per-window
+    emotion and probabilities with `models` (see load_models) and aggregate results.
+    Features are extracted block by block (contours framed once per block, shared by overlapping
+    windows) and each block's windows are scored as soon as they are ready, in batches of up to
+    `batch_size` rows.
+    Audio is polyphase-resampled once to `sample_rate` (None: the file's native rate) before
+    feature extraction; the decoded and resampled signals are cached in-process (see load_audio).
+    With `vad`, an energy / zero-crossing pass classifies the windows first: windows without
+    speech skip pitch estimation and the model and are labelled SILENCE_LABEL in the timeline.
+    With `adaptive`, windows `coarse_hop_sec` apart are scored first and only the stretches where
+    neighbouring coarse windows disagree or score below `min_confidence` are analysed at the full
+    `hop_sec` resolution (see adaptive_timeline); the timeline keeps the fine window grid.
+    With `streaming` (default: files longer than `streaming_threshold_sec`) the file is decoded
+    block by block instead, keeping memory constant regardless of the file duration; plain WAV
+    files are read through a memory map (see WavMap) rather than decoded.
+    With a FeatureCache, feature matrices are looked up by audio content and extraction
+    parameters first, so re-running with another model skips straight to inference.
+    `on_progress`, if given, is called from the analysing thread with partial results
+    ({'entries', 'summary', 'processed_sec', 'total_sec'}) at most every `progress_interval`
+    seconds; entries produced in between are coalesced into the next call.
+    `cancel` (a threading.Event) is checked between feature blocks and inference batches; once
+    set, the analysis stops and returns with 'cancelled' set.
+    Returns a dict result: {'ok', 'error', 'cancelled', 'timeline', 'summary'}.
+    """
+    result = _analyze(
+        file_path, {model_choice: models or {}}, False, batch_size, streaming, streaming_threshold_sec, cache,
+        win_sec, hop_sec, on_progress, progress_interval, cancel, sample_rate, vad, adaptive, coarse_hop_sec,
+        min_confidence
+    )
+    del result['models'], result['ensemble']
+    return result
+
+
+def analyze_models(
+    file_path, models, ensemble=False, batch_size=DEFAULT_BATCH_SIZE, streaming=None,
+    streaming_threshold_sec=STREAMING_THRESHOLD_SEC, cache=None, win_sec=WIN_SEC, hop_sec=HOP_SEC,
+    on_progress=None, progress_interval=PROGRESS_INTERVAL_SEC, cancel=None, sample_rate=ANALYSIS_SR, vad=True
+):
+    """
+    Like analyze_file, but scores every model in `models` ({model_choice: models}, e.g. from
+    modelRegistry.get) in one pass: the file is decoded and featurized once and each batch of
+    feature rows is fed to every model, so another model only adds its inference time.
+    With `ensemble`, the models' probabilities are also averaged per window (see ensemble_predictions).
+    `on_progress` follows the ensemble timeline, or the first model's without `ensemble`.
+    Returns {'ok', 'error', 'cancelled', 'timeline', 'summary', 'models', 'ensemble'}: 'models' maps
+    each model choice to its {'timeline', 'summary'}, 'ensemble' is the averaged {'timeline', 'summary'}
+    (None without `ensemble`), and 'timeline' / 'summary' repeat the ensemble's or the first model's.
+    """
+    if not models:
+        raise ValueError('analyze_models needs at least one model')
+    return _analyze(
+        file_path, dict(models), ensemble, batch_size, streaming, streaming_threshold_sec, cache, win_sec, hop_sec,
+        on_progress, progress_interval, cancel, sample_rate, vad
+    )
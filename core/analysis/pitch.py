@@ -0,0 +1,141 @@
+import numpy as np
+
+__all__ = [
+    'PITCH_METHODS', 'PITCH_METHOD', 'YIN_FMIN', 'YIN_FMAX', 'YIN_THRESHOLD', 'estimate_f0_autocorr',
+    'estimate_f0_batch', 'estimate_f0_yin', 'estimate_f0',
+]
+
+PITCH_METHODS = ('yin', 'autocorr')
+PITCH_METHOD = 'yin'  # what the models were trained on (librosa.yin in tests/my version.py)
+# librosa.yin settings of the training script
+YIN_FMIN = 50
+YIN_FMAX = 8000
+YIN_THRESHOLD = 0.1
+
+
+def estimate_f0_autocorr(frame, sr, fmin=50, fmax=800):
+    """
+    Estimate f0 for a short frame using autocorrelation. Returns f0 in Hz or 0.0.
+    Reference (per-frame, O(n²)) implementation; the analysis engine uses estimate_f0 (YIN by default).
+    """
+    try:
+        # window and zero-mean
+        x = frame - np.mean(frame)
+        if x.size < 3:
+            return 0.0
+        corr = np.correlate(x, x, mode='full')
+        corr = corr[corr.size // 2:]
+        # ignore zero-lag
+        corr[0] = 0.0
+        # define lag range
+        min_lag = int(sr / fmax) if fmax > 0 else 1
+        max_lag = int(sr / fmin) if fmin > 0 else len(corr) - 1
+        max_lag = min(max_lag, len(corr) - 1)
+        if max_lag <= min_lag:
+            return 0.0
+        peak_region = corr[min_lag:max_lag + 1]
+        if peak_region.size == 0:
+            return 0.0
+        peak = np.argmax(peak_region) + min_lag
+        if corr[peak] <= 0:
+            return 0.0
+        f0 = float(sr) / float(peak) if peak > 0 else 0.0
+        return float(f0)
+    except Exception:
+        return 0.0
+
+
+def estimate_f0_batch(frames, sr, fmin=50, fmax=800, chunk_frames=512):
+    """
+    Estimate f0 for every row of a (n_frames, frame_len) matrix.
+    All autocorrelations of a chunk are computed with one batched FFT (Wiener-Khinchin) and the
+    peak is searched over the fmin/fmax lag band in a single vectorized argmax. Returns the same
+    contour as estimate_f0_autocorr applied frame by frame, as a float32 array.
+    """
+    frames = np.asarray(frames)
+    n_frames, n = frames.shape
+    f0s = np.zeros(n_frames, dtype=np.float32)
+    if n_frames == 0 or n < 3:
+        return f0s
+    min_lag = int(sr / fmax) if fmax > 0 else 1
+    max_lag = int(sr / fmin) if fmin > 0 else n - 1
+    max_lag = min(max_lag, n - 1)
+    if max_lag <= min_lag:
+        return f0s
+    # zero-padding to >= n + max_lag keeps the circular correlation free of wrap-around
+    # for every lag we search, so it equals the linear one over that band
+    nfft = 1 << (n + max_lag - 1).bit_length()
+    for start in range(0, n_frames, chunk_frames):
+        block = np.asarray(frames[start:start + chunk_frames], dtype=np.float32)
+        x = (block - block.mean(axis=1, keepdims=True)).astype(np.float64)
+        spec = np.fft.rfft(x, n=nfft, axis=1)
+        corr = np.fft.irfft(spec.real * spec.real + spec.imag * spec.imag, n=nfft, axis=1)[:, :max_lag + 1]
+        # FFT round-off leaves tiny non-zero values where the direct sum is exactly zero
+        tol = corr[:, 0] * 1e-12
+        corr[:, 0] = 0.0
+        band = corr[:, min_lag:]
+        peak = np.argmax(band, axis=1)
+        peak_val = band[np.arange(band.shape[0]), peak]
+        lag = peak + min_lag
+        voiced = (peak_val > tol) & (peak_val > 0) & (lag > 0)
+        f0s[start:start + block.shape[0]] = np.where(voiced, float(sr) / np.maximum(lag, 1), 0.0)
+    return f0s
+
+
+def estimate_f0_yin(frames, sr, fmin=YIN_FMIN, fmax=YIN_FMAX, threshold=YIN_THRESHOLD, chunk_frames=256):
+    """
+    YIN f0 estimate for every row of a (n_frames, frame_len) matrix, following librosa.yin
+    (center=False) step by step without depending on librosa: the difference function of each
+    chunk of frames comes from one batched FFT autocorrelation and a cumulative energy sum, then
+    the cumulative-mean normalisation, the absolute-threshold trough search (global minimum when
+    no trough is below `threshold`) and the parabolic refinement run vectorized over all frames.
+    Like librosa, every frame gets an estimate (silence included). Returns a float32 array.
+    """
+    frames = np.asarray(frames)
+    n_frames, n = frames.shape
+    f0s = np.zeros(n_frames, dtype=np.float32)
+    fmax = min(fmax, sr / 2)
+    min_period = max(int(np.floor(sr / fmax)), 1)
+    max_period = min(int(np.ceil(sr / fmin)), n - 1)
+    if n_frames == 0 or max_period - min_period < 2:
+        return f0s
+    # lags up to max_period stay free of wrap-around with this much zero-padding
+    nfft = 1 << (n + max_period - 1).bit_length()
+    lags = np.arange(min_period, max_period + 1, dtype=np.float64)
+    tiny = np.finfo(np.float64).tiny
+    for start in range(0, n_frames, chunk_frames):
+        x = np.asarray(frames[start:start + chunk_frames], dtype=np.float64)
+        spec = np.fft.rfft(x, n=nfft, axis=1)
+        acf = np.fft.irfft(spec.real * spec.real + spec.imag * spec.imag, n=nfft, axis=1)[:, :max_period + 1]
+        # d(k) = 2 * (acf(0) - acf(k)) - sum_{m<k} x(m)^2, for k = 1..max_period
+        diff = 2.0 * (acf[:, :1] - acf[:, 1:]) - np.cumsum(x[:, :max_period] ** 2, axis=1)
+        # cumulative mean normalised difference over the lag band [min_period, max_period]
+        cmnd = diff[:, min_period - 1:] / (np.cumsum(diff, axis=1)[:, min_period - 1:] / lags + tiny)
+
+        # parabolic shift of every interior lag, zero when the optimum falls outside [k-1, k+1]
+        a = cmnd[:, 2:] + cmnd[:, :-2] - 2.0 * cmnd[:, 1:-1]
+        b = (cmnd[:, 2:] - cmnd[:, :-2]) / 2.0
+        shifts = np.zeros_like(cmnd)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            shifts[:, 1:-1] = np.where(np.abs(b) >= np.abs(a), 0.0, -b / a)
+
+        # local minima (strict on the left, as librosa.util.localmin), the first lag against its neighbour
+        trough = np.empty(cmnd.shape, dtype=bool)
+        trough[:, 0] = cmnd[:, 0] < cmnd[:, 1]
+        trough[:, 1:-1] = (cmnd[:, 1:-1] < cmnd[:, :-2]) & (cmnd[:, 1:-1] <= cmnd[:, 2:])
+        trough[:, -1] = cmnd[:, -1] < cmnd[:, -2]
+        below = trough & (cmnd < threshold)
+        best = np.where(below.any(axis=1), np.argmax(below, axis=1), np.argmin(cmnd, axis=1))
+        period = min_period + best + shifts[np.arange(best.size), best]
+        with np.errstate(divide='ignore'):
+            f0s[start:start + best.size] = sr / period
+    return f0s
+
+
+def estimate_f0(frames, sr, method=PITCH_METHOD):
+    """f0 contour of a frame matrix with the given PITCH_METHODS estimator."""
+    if method == 'yin':
+        return estimate_f0_yin(frames, sr)
+    if method == 'autocorr':
+        return estimate_f0_batch(frames, sr)
+    raise ValueError(f"Unknown pitch method: {method}")
@@ -0,0 +1,78 @@
+import time
+from typing import Iterable, Optional
+
+import numpy as np
+import soundfile as sf
+
+from .features import N_FEATURES, build_feature_matrix
+from .resample import ANALYSIS_SR, resample
+from .streaming import downmix
+
+__all__ = ['LOW_POWER_CHOICES', 'low_power_choice', 'calibration_features', 'quantization_report']
+
+# model choice -> its quantized low-power counterpart
+LOW_POWER_CHOICES = {'mlp': 'mlp_lp', 'mlp_numpy': 'mlp_lp', 'knn': 'knn_lp'}
+
+
+def low_power_choice(model_choice: str) -> str:
+    """Quantized counterpart of `model_choice` ('mlp_lp' / 'knn_lp'); other choices are returned as is."""
+    return LOW_POWER_CHOICES.get(model_choice, model_choice)
+
+
+def calibration_features(
+    paths: Iterable[str], win_sec: float = 1.0, hop_sec: float = 0.5, sample_rate: Optional[int] = ANALYSIS_SR
+) -> np.ndarray:
+    """Window feature matrix over the audio files in `paths`, stacked, to calibrate quantization with."""
+    chunks = []
+    for path in paths:
+        data, native_sr = sf.read(path, dtype='float32', always_2d=True)
+        sr = int(sample_rate or native_sr)
+        sig = resample(downmix(data), native_sr, sr)
+        _, features = build_feature_matrix(sig, sr, int(win_sec * sr), int(hop_sec * sr))
+        chunks.append(features)
+    return np.concatenate(chunks) if chunks else np.zeros((0, N_FEATURES))
+
+
+def _latency_ms(model, features, batch_size, repeats):
+    batch = features[:batch_size]
+    model.predict_proba(batch)  # warm-up
+    started = time.perf_counter()
+    for _ in range(repeats):
+        model.predict_proba(batch)
+    return (time.perf_counter() - started) / repeats * 1000.0
+
+
+def quantization_report(
+    reference, quantized, features, labels: Optional[Iterable[str]] = None,
+    batch_size: int = 1024, repeats: int = 20, reference_classes=None, reference_bytes: Optional[int] = None
+) -> dict:
+    """
+    Accuracy versus latency of `quantized` against its float `reference` (both expose predict_proba
+    and classes_) on the (n, n_features) `features`: top-1 agreement, probability error, accuracy
+    against the true `labels` when given, milliseconds per `batch_size` rows, resident sizes
+    ('*_bytes', nbytes) and the quantized file size ('quantized_stored_bytes').
+    `reference_classes` names the reference's columns when its classes_ are encoded indices.
+    """
+    features = np.asarray(features, dtype=np.float32)
+    ref = np.asarray(reference.predict_proba(features), dtype=np.float64)
+    out = np.asarray(quantized.predict_proba(features), dtype=np.float64)
+    ref_classes = np.asarray(reference.classes_ if reference_classes is None else reference_classes).astype(str)
+    out_classes = np.asarray(quantized.classes_).astype(str)
+    ref_top = ref_classes[ref.argmax(axis=1)]
+    out_top = out_classes[out.argmax(axis=1)]
+    report = {
+        'rows': int(features.shape[0]),
+        'agreement': float(np.mean(ref_top == out_top)),
+        'max_abs_prob_error': float(np.max(np.abs(ref - out))) if ref.shape == out.shape else None,
+        'mean_abs_prob_error': float(np.mean(np.abs(ref - out))) if ref.shape == out.shape else None,
+        'reference_ms': _latency_ms(reference, features, batch_size, repeats),
+        'quantized_ms': _latency_ms(quantized, features, batch_size, repeats),
+        'reference_bytes': reference_bytes if reference_bytes is not None else getattr(reference, 'nbytes', None),
+        'quantized_bytes': getattr(quantized, 'nbytes', None),
+        'quantized_stored_bytes': getattr(quantized, 'storedBytes', None),
+    }
+    if labels is not None:
+        labels = np.asarray(list(labels)).astype(str)
+        report['reference_accuracy'] = float(np.mean(ref_top == labels))
+        report['quantized_accuracy'] = float(np.mean(out_top == labels))
+    return report
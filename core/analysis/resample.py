@@ -0,0 +1,59 @@
+from functools import lru_cache
+from math import gcd
+
+import numpy as np
+
+__all__ = ['ANALYSIS_SR', 'resample_ratio', 'resample_filter', 'resample_context', 'resampled_length', 'resample']
+
+ANALYSIS_SR = 22050  # rate the models were trained at (librosa's default load rate)
+
+
+def resample_ratio(sr_in: int, sr_out: int):
+    """(up, down) polyphase factors, reduced, taking `sr_in` to `sr_out`."""
+    g = gcd(int(sr_in), int(sr_out))
+    return int(sr_out) // g, int(sr_in) // g
+
+
+def resampled_length(n: int, sr_in: int, sr_out: int) -> int:
+    """Number of samples resample() produces for `n` input samples."""
+    if not sr_out or int(sr_in) == int(sr_out):
+        return int(n)
+    up, down = resample_ratio(sr_in, sr_out)
+    return -(-int(n) * up // down)
+
+
+@lru_cache(maxsize=8)
+def resample_filter(up: int, down: int) -> np.ndarray:
+    """
+    Anti-aliasing low-pass FIR for resample_poly (Kaiser window, beta 5, as scipy's default),
+    designed once per ratio instead of on every call.
+    """
+    from scipy.signal import firwin
+
+    half_len = 10 * max(up, down)
+    h = firwin(2 * half_len + 1, 1.0 / max(up, down), window=('kaiser', 5.0)).astype(np.float32)
+    h.setflags(write=False)
+    return h
+
+
+def resample_context(up: int, down: int) -> int:
+    """
+    Input samples of context, a multiple of `down`, that a resampled segment needs on each side
+    to come out the same as that stretch of the whole signal resampled at once.
+    """
+    half_len = (len(resample_filter(up, down)) - 1) // 2
+    return -(-(half_len // up + 2) // down) * down
+
+
+def resample(sig, sr_in: int, sr_out: int = ANALYSIS_SR) -> np.ndarray:
+    """
+    Polyphase-resample a mono signal from `sr_in` to `sr_out`; returns float32.
+    The signal is returned unchanged (as float32) when the rates already match.
+    """
+    sig = np.asarray(sig, dtype=np.float32)
+    if not sr_out or int(sr_in) == int(sr_out) or sig.size == 0:
+        return sig
+    from scipy.signal import resample_poly
+
+    up, down = resample_ratio(sr_in, sr_out)
+    return resample_poly(sig, up, down, window=resample_filter(up, down)).astype(np.float32, copy=False)
@@ -0,0 +1,80 @@
+import numpy as np
+
+from .FeatureStream import FeatureStream
+from .inference import DEFAULT_BATCH_SIZE, predict_windows
+from .StreamResampler import StreamResampler
+from .timeline import timeline_entries
+from .WavMap import open_audio
+
+__all__ = ['DEFAULT_BLOCKSIZE', 'downmix', 'iter_file_features', 'iter_signal_features', 'stream_timeline']
+
+DEFAULT_BLOCKSIZE = 1 << 18  # ~6 s at 44.1 kHz per decoded block
+
+
+def downmix(block):
+    """(frames, channels) block -> mono 1-D array."""
+    if block.ndim > 1 and block.shape[1] > 1:
+        return np.mean(block, axis=1)
+    return block.reshape(-1)
+
+
+def iter_file_features(sound_file, win, hop, blocksize=DEFAULT_BLOCKSIZE, sr=None, vad=False):
+    """
+    Decode an open soundfile.SoundFile or WavMap block by block (float32), downmix each block on
+    the fly and yield (starts, features) for the windows completed so far. Window state is carried across
+    block boundaries by a FeatureStream, so only one block is ever resident.
+    With `sr` set (and different from the file's rate) every block is polyphase-resampled on the
+    way in; `win`, `hop` and the yielded starts are then in samples at `sr`.
+    `vad` gates non-speech windows out of pitch estimation (see FeatureStream).
+    """
+    rate = int(sr or sound_file.samplerate)
+    stream = FeatureStream(rate, win, hop, vad=vad)
+    resampler = StreamResampler(sound_file.samplerate, rate) if rate != sound_file.samplerate else None
+    for block in sound_file.blocks(blocksize=blocksize, dtype='float32', always_2d=True):
+        mono = downmix(block)
+        starts, features = stream.push(resampler.push(mono) if resampler else mono)
+        if starts.size:
+            yield starts, features
+    if resampler:
+        starts, features = stream.push(resampler.finish())
+        if starts.size:
+            yield starts, features
+    starts, features = stream.finish()
+    if starts.size:
+        yield starts, features
+
+
+def iter_signal_features(sig, sr, win, hop, blocksize=DEFAULT_BLOCKSIZE, vad=False):
+    """
+    In-memory counterpart of iter_file_features: push a 1-D signal through a FeatureStream
+    `blocksize` samples at a time and yield (starts, features) as windows complete. The rows equal
+    build_feature_matrix's, but the caller gets control back after every block (progress, cancel).
+    """
+    stream = FeatureStream(sr, win, hop, vad=vad)
+    for i in range(0, len(sig), blocksize):
+        starts, features = stream.push(sig[i:i + blocksize])
+        if starts.size:
+            yield starts, features
+    starts, features = stream.finish()
+    if starts.size:
+        yield starts, features
+
+
+def stream_timeline(
+    file_path, model_choice, models, win_sec=1.0, hop_sec=0.5,
+    batch_size=DEFAULT_BATCH_SIZE, blocksize=DEFAULT_BLOCKSIZE, sr=None, vad=True
+):
+    """
+    Bounded-memory analysis: yields lists of timeline entries as the file is decoded.
+    Peak memory is one decoded block plus one window, independent of the file duration.
+    `sr` resamples to an analysis rate on the fly (None: the file's own rate); with `vad`,
+    windows without speech are labelled SILENCE_LABEL without running pitch or the model.
+    """
+    with open_audio(file_path) as f:
+        total_sec = f.frames / float(f.samplerate) if f.samplerate else 0.0
+        sr = int(sr or f.samplerate)
+        win = int(win_sec * sr)
+        hop = int(hop_sec * sr)
+        for starts, features in iter_file_features(f, win, hop, blocksize, sr, vad):
+            predictions = predict_windows(features, model_choice, models, batch_size=batch_size)
+            yield timeline_entries(starts, predictions, sr, win, total_sec)
@@ -0,0 +1,20 @@
+import numpy as np
+
+from .RunningSummary import RunningSummary
+
+__all__ = ['timeline_entries', 'summarize_timeline']
+
+
+def timeline_entries(starts, predictions, sr, win, total_sec):
+    """Timeline dicts ({'start', 'end', 'label', 'probs'}) for windows starting at `starts` samples."""
+    entries = []
+    for idx, (pred_label, pred_probs) in zip(np.asarray(starts).tolist(), predictions):
+        t_start = idx / float(sr)
+        t_end = min(total_sec, (idx + win) / float(sr))
+        entries.append({'start': t_start, 'end': t_end, 'label': pred_label, 'probs': pred_probs})
+    return entries
+
+
+def summarize_timeline(windows_info, total_sec):
+    """Aggregate per-label durations, percentage of the file and average probability."""
+    return RunningSummary().add(windows_info).summary(total_sec)
@@ -0,0 +1,58 @@
+import numpy as np
+
+from .framing import frame_energy
+
+__all__ = [
+    'SILENCE_LABEL', 'VAD_MIN_RMS', 'VAD_ZCR_HZ', 'VAD_MIN_SPEECH', 'frame_zcr', 'speech_frames',
+    'speech_windows', 'frame_cover',
+]
+
+SILENCE_LABEL = 'silence'  # timeline label of windows the VAD finds no speech in
+VAD_MIN_RMS = 0.01  # frames quieter than this are dead air
+# zero crossings per second of speech frames: below is mains hum / rumble, above is hiss
+VAD_ZCR_HZ = (150.0, 5000.0)
+VAD_MIN_SPEECH = 0.1  # share of a window's frames that must be speech
+
+
+def frame_zcr(frames, sr):
+    """Zero crossings per second of every frame (row) of a frame matrix."""
+    frames = np.asarray(frames)
+    if frames.shape[0] == 0 or frames.shape[1] < 2:
+        return np.zeros(frames.shape[0], dtype=np.float32)
+    signs = np.signbit(frames)
+    crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    return (crossings * (float(sr) / (frames.shape[1] - 1))).astype(np.float32)
+
+
+def speech_frames(frames, sr, energies=None, min_rms=VAD_MIN_RMS, zcr_hz=VAD_ZCR_HZ):
+    """
+    Energy / zero-crossing voice activity decision for every frame: loud enough and with a
+    crossing rate in the speech band. `energies` may pass the frames' RMS if already computed.
+    """
+    if energies is None:
+        energies = frame_energy(frames)
+    zcr = frame_zcr(frames, sr)
+    return (np.asarray(energies) >= min_rms) & (zcr >= zcr_hz[0]) & (zcr <= zcr_hz[1])
+
+
+def speech_windows(speech, first, counts, min_speech=VAD_MIN_SPEECH):
+    """
+    Windows (frames first[k]:first[k] + counts[k] of the per-frame `speech` flags) in which at
+    least `min_speech` of the frames hold speech. Windows without frames are not speech.
+    """
+    first = np.asarray(first, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    csum = np.concatenate([[0], np.cumsum(np.asarray(speech, dtype=np.int64))])
+    end = np.minimum(first + counts, csum.size - 1)
+    start = np.minimum(first, end)
+    voiced = csum[end] - csum[start]
+    return (counts > 0) & (voiced >= min_speech * np.maximum(counts, 1))
+
+
+def frame_cover(first, counts, n_frames):
+    """Boolean mask of the frames covered by any of the windows (first[k], counts[k])."""
+    edges = np.zeros(n_frames + 1, dtype=np.int64)
+    first = np.clip(np.asarray(first, dtype=np.int64), 0, n_frames)
+    np.add.at(edges, first, 1)
+    np.add.at(edges, np.clip(first + np.asarray(counts, dtype=np.int64), 0, n_frames), -1)
+    return np.cumsum(edges[:-1]) > 0
@@ -0,0 +1,67 @@
+import numpy as np
+
+__all__ = ['sliding_max', 'sliding_min', 'window_stats']
+
+
+def sliding_max(x, width):
+    """
+    Max of every run of `width` consecutive values of `x` (length len(x) - width + 1).
+    Uses the van Herk/Gil-Werman block prefix/suffix scheme, so the cost does not grow with `width`.
+    """
+    x = np.asarray(x)
+    n = x.size
+    if width <= 1:
+        return x.copy()
+    if n < width:
+        return np.zeros(0, dtype=x.dtype)
+    pad = (-n) % width
+    blocks = np.concatenate([x, np.full(pad, -np.inf, dtype=x.dtype)]).reshape(-1, width)
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    i = np.arange(n - width + 1)
+    return np.maximum(suffix[i], prefix[i + width - 1])
+
+
+def sliding_min(x, width):
+    """Min of every run of `width` consecutive values of `x`."""
+    return -sliding_max(-np.asarray(x), width)
+
+
+def window_stats(x, first, counts, width):
+    """
+    Population mean, variance, max and min of x[first[k]:first[k] + counts[k]] for every window k.
+    Mean and variance come from shifted cumulative sums; max/min of full-width windows come from
+    sliding_max/sliding_min, the (few) shorter tail windows are reduced directly.
+    Windows with counts[k] == 0 get zeros.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    first = np.asarray(first, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    n_win = first.size
+    mean = np.zeros(n_win)
+    var = np.zeros(n_win)
+    vmax = np.zeros(n_win)
+    vmin = np.zeros(n_win)
+    if n_win == 0 or x.size == 0:
+        return mean, var, vmax, vmin
+
+    # shift by the global mean to keep the running sums (and the variance) well conditioned
+    shift = float(np.mean(x))
+    y = x - shift
+    c1 = np.concatenate([[0.0], np.cumsum(y)])
+    c2 = np.concatenate([[0.0], np.cumsum(y * y)])
+    valid = counts > 0
+    s, e, n = first[valid], first[valid] + counts[valid], counts[valid]
+    m = (c1[e] - c1[s]) / n
+    mean[valid] = m + shift
+    var[valid] = np.maximum((c2[e] - c2[s]) / n - m * m, 0.0)
+
+    full = counts == width
+    if np.any(full):
+        vmax[full] = sliding_max(x, width)[first[full]]
+        vmin[full] = sliding_min(x, width)[first[full]]
+    for k in np.flatnonzero(valid & ~full):
+        seg = x[first[k]:first[k] + counts[k]]
+        vmax[k] = seg.max()
+        vmin[k] = seg.min()
+    return mean, var, vmax, vmin
@@ -0,0 +1,467 @@
+import math
+import queue
+import threading
+from time import perf_counter
+from typing import Callable, List, Optional, TypeVar
+
+import numpy as np
+
+from core.analysis import open_audio
+from vvecon.qt.logger import logger
+
+from .CallbackStats import CallbackStats
+from .RingBuffer import RingBuffer
+
+T = TypeVar('T', bound='AudioEngine')
+
+__all__ = ['PREFETCH_SEC', 'RECORD_BUFFER_SEC', 'AudioEngine', 'audioEngine']
+
+PREFETCH_SEC = 0.3  # decoded audio kept ready ahead of the output callback
+RECORD_BUFFER_SEC = 2.0  # captured audio the engine thread may fall behind by before input is dropped
+
+_CLOSE = 'close'
+
+
+class _Track:
+    """A file opened for playback at `startFrame`, with its decoded-ahead ring."""
+
+    def __init__(self, file_path: str, start_frame: int, prefetch_sec: float):
+        self.filePath = file_path
+        self.source = open_audio(file_path)
+        self.samplerate = int(self.source.samplerate)
+        self.channels = int(self.source.channels)
+        self.frames = int(self.source.frames)
+        self.startFrame = min(max(0, int(start_frame)), self.frames)
+        self.source.seek(self.startFrame)
+        self.ring = RingBuffer(max(1024, int(prefetch_sec * self.samplerate)), self.channels)
+        self.chunk = max(1, self.ring.capacity // 4)
+        self.played = 0  # frames handed to the device; advanced by the output callback only
+        self.eof = False
+
+    @property
+    def frame(self) -> int:
+        return self.startFrame + self.played
+
+    @property
+    def drained(self) -> bool:
+        """Every frame of the file has been handed to the device."""
+        return self.eof and not self.ring.readable()
+
+    def fill(self):
+        """Decode into the free part of the ring; sets eof at the end of the file."""
+        filled = 0
+        for region in self.ring.writeRegions():
+            if not len(region):
+                continue
+            got = len(self.source.read(dtype='float32', always_2d=True, out=region))
+            filled += got
+            if got < len(region):
+                self.eof = True
+                break
+        self.ring.commitWrite(filled)
+
+    def close(self):
+        self.source.close()
+
+
+class AudioEngine:
+    """
+    Process-wide audio transport: playback and recording behind a command queue.
+
+    play(), pause(), seek(), stop(), record() and stopRecording() only enqueue a command and return.
+    A single engine thread, started with the first command, runs them in order, keeps the playback
+    ring decoded ahead and drains the recording ring; it sleeps on the queue when there is nothing
+    to do. The output and input streams are opened once (again only if the sample rate or channel
+    count changes) and started/stopped by the transport; pause keeps the output running on silence,
+    so it stops and resumes on an exact frame. Both callbacks only copy between the device and a
+    RingBuffer and update `playbackStats` / `recordStats`.
+
+    Listeners get callback(state, info) on every transport change, from the engine thread:
+    PLAYING, PAUSED, STOPPED, FINISHED (end of file), RECORDING, RECORDED (after the last block was
+    delivered) and ERROR (info['error']). A recording's `sink` gets each captured (frames, channels)
+    float32 block, then None when it ends, also when it could not start (already recording, no input
+    device); it runs on the engine thread, so keep it short.
+    """
+
+    PLAYING = 'playing'
+    PAUSED = 'paused'
+    STOPPED = 'stopped'
+    FINISHED = 'finished'
+    RECORDING = 'recording'
+    RECORDED = 'recorded'
+    ERROR = 'error'
+
+    _instance: Optional[T] = None
+
+    @classmethod
+    def getInstance(cls) -> T:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, prefetch_sec: float = PREFETCH_SEC, record_buffer_sec: float = RECORD_BUFFER_SEC):
+        self.prefetchSec = prefetch_sec
+        self.recordBufferSec = record_buffer_sec
+        self._commands: 'queue.Queue' = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._threadLock = threading.Lock()
+        self._listeners: List[Callable[[str, dict], None]] = []
+        # playback: owned by the engine thread, read by the output callback
+        self._output = None
+        self._outputFormat = None
+        self._track: Optional[_Track] = None
+        self._paused = False
+        self.playbackStats = CallbackStats('playback', 0)
+        self.level = 0.0  # RMS of the last output block, scaled to 0..1 for a VU meter
+        # recording
+        self._input = None
+        self._inputFormat = None
+        self._capture: Optional[RingBuffer] = None
+        self._recordedFrames = 0
+        self._sink: Optional[Callable[[Optional[np.ndarray]], None]] = None
+        self.recording = False
+        self.recordStats = CallbackStats('recording', 0)
+
+    # --- listeners ---
+    def addListener(self, callback: Callable[[str, dict], None]):
+        """callback(state, info) on every transport change; called from the engine thread."""
+        self._listeners.append(callback)
+
+    def removeListener(self, callback: Callable[[str, dict], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, state: str, **info):
+        track = self._track
+        if track is not None:
+            info.setdefault('file', track.filePath)
+            info.setdefault('frame', track.frame)
+            info.setdefault('position', track.frame / track.samplerate if track.samplerate else 0.0)
+        for callback in list(self._listeners):
+            try:
+                callback(state, info)
+            except Exception as e:
+                logger.error(f"Audio engine listener failed: {e}")
+
+    # --- state (any thread) ---
+    @property
+    def filePath(self) -> Optional[str]:
+        track = self._track
+        return track.filePath if track is not None else None
+
+    @property
+    def frame(self) -> int:
+        """Frame of the loaded file the device has played up to (0 when nothing is loaded)."""
+        track = self._track
+        return track.frame if track is not None else 0
+
+    @property
+    def position(self) -> float:
+        """Playback position in seconds."""
+        track = self._track
+        return track.frame / track.samplerate if track is not None and track.samplerate else 0.0
+
+    @property
+    def playing(self) -> bool:
+        return self._track is not None and not self._paused
+
+    # --- commands (any thread; never block) ---
+    def _send(self, command: str, *args):
+        with self._threadLock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='AudioEngine', daemon=True)
+                self._thread.start()
+        self._commands.put((command, args))
+
+    def play(self, file_path: Optional[str] = None, frame: Optional[int] = None):
+        """
+        Play `file_path` from `frame` (default: the start). Without a path, or with the file that is
+        already loaded and no frame, resume where playback was paused.
+        """
+        self._send('play', file_path, frame)
+
+    def pause(self):
+        self._send('pause')
+
+    def seek(self, position: float):
+        """Move playback of the loaded file to `position` seconds, keeping it playing or paused."""
+        self._send('seek', position)
+
+    def stop(self):
+        """Stop playback and unload the file."""
+        self._send('stop')
+
+    def record(
+        self, samplerate: int, channels: int = 1, sink: Optional[Callable[[Optional[np.ndarray]], None]] = None
+    ):
+        """
+        Start capturing float32 audio from the default input. `sink` gets this recording's blocks and
+        then None, before RECORDED is reported, so a new recording never receives the previous one's audio.
+        """
+        self._send('record', samplerate, channels, sink)
+
+    def stopRecording(self):
+        self._send('stopRecording')
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop everything, close the streams and end the engine thread (application shutdown)."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._commands.put((_CLOSE, ()))
+        if thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # --- real-time callbacks: no allocations, locks or blocking ---
+    def _outputCallback(self, outdata, frames, time_info, status):
+        started = perf_counter()
+        track = self._track
+        n = 0
+        if track is not None and not self._paused:
+            n = track.ring.read(outdata)
+            track.played += n
+            if n < frames and not track.eof:
+                # the engine thread fell behind: the gap is played as silence
+                self.playbackStats.underflows += 1
+        if n < frames:
+            outdata[n:].fill(0)
+        if n:
+            flat = outdata[:n].reshape(-1)  # a view: outdata is C-contiguous
+            self.level = min(1.0, math.sqrt(float(np.dot(flat, flat)) / flat.size) * 20.0)
+        else:
+            self.level = 0.0
+        self.playbackStats.record(status, started, frames)
+
+    def _inputCallback(self, indata, frames, time_info, status):
+        started = perf_counter()
+        capture = self._capture
+        if self.recording and capture is not None:
+            n = capture.write(indata)
+            if n < frames:
+                self.recordStats.overflows += 1
+                self.recordStats.droppedFrames += frames - n
+        self.recordStats.record(status, started, frames)
+
+    # --- engine thread ---
+    def _run(self):
+        while True:
+            try:
+                command, args = self._commands.get(timeout=self._idleWait())
+            except queue.Empty:
+                command, args = None, ()
+            if command == _CLOSE:
+                self._shutdown()
+                return
+            if command is not None:
+                try:
+                    getattr(self, '_' + command)(*args)
+                except Exception as e:
+                    logger.error(f"Audio engine {command} failed: {e}")
+                    self._emit(self.ERROR, command=command, error=str(e))
+            try:
+                self._service()
+            except Exception as e:
+                logger.error(f"Audio engine error: {e}")
+                self._unload()
+                self._emit(self.ERROR, command=None, error=str(e))
+
+    def _idleWait(self) -> Optional[float]:
+        """How long the engine thread may sleep on the queue: None (until a command) when idle."""
+        waits = []
+        track = self._track
+        if track is not None and not self._paused:
+            waits.append(track.chunk / float(track.samplerate) / 2)
+        if self.recording and self._capture is not None:
+            waits.append(self._capture.capacity / float(self._inputFormat[0]) / 8)
+        return min(waits) if waits else None
+
+    def _service(self):
+        """Keep the playback ring decoded ahead, hand captured audio on, notice the end of the file."""
+        if self.recording:
+            self._drainCapture()
+        track = self._track
+        if track is None or self._paused:
+            return
+        if not track.eof and track.ring.writable() >= track.chunk:
+            track.fill()
+        if track.drained:
+            self._stopOutput()
+            self._emit(self.FINISHED)
+            self._unload()
+
+    def _ensureOutput(self, samplerate: int, channels: int):
+        if self._output is not None and self._outputFormat == (samplerate, channels):
+            return
+        import sounddevice as sd
+
+        self._closeOutput()
+        self._output = sd.OutputStream(
+            samplerate=samplerate, channels=channels, dtype='float32', callback=self._outputCallback
+        )
+        self._outputFormat = (samplerate, channels)
+
+    def _stopOutput(self):
+        if self._output is not None and self._output.active:
+            self._output.stop()
+        self.level = 0.0
+        self._logStats(self.playbackStats)
+
+    def _closeOutput(self):
+        output, self._output = self._output, None
+        self._outputFormat = None
+        if output is not None:
+            try:
+                output.stop()
+            finally:
+                output.close()
+
+    def _load(self, file_path: str, frame: int) -> _Track:
+        track = _Track(file_path, frame, self.prefetchSec)
+        track.fill()
+        return track
+
+    def _unload(self):
+        track, self._track = self._track, None
+        self._paused = False
+        if track is not None:
+            track.close()
+
+    @staticmethod
+    def _logStats(stats: CallbackStats):
+        if not stats.callbacks:
+            return
+        if stats.xruns:
+            logger.warning(stats.summary())
+        else:
+            logger.info(stats.summary())
+
+    # commands, run on the engine thread
+    def _play(self, file_path: Optional[str], frame: Optional[int]):
+        track = self._track
+        if track is not None and (file_path is None or file_path == track.filePath) and frame is None:
+            if self._paused:
+                self._paused = False
+                self._emit(self.PLAYING)
+            return
+        if file_path is None:
+            raise ValueError('No file to play')
+        new = self._load(file_path, frame or 0)
+        self._ensureOutput(new.samplerate, new.channels)
+        # the callback picks the new track up on its next block
+        self._paused = False
+        self._track = new
+        if track is not None:
+            track.close()
+        self.playbackStats.samplerate = new.samplerate
+        if not self._output.active:
+            self.playbackStats.reset()
+            self._output.start()
+        self._emit(self.PLAYING)
+
+    def _pause(self):
+        if self._track is not None and not self._paused:
+            self._paused = True
+            self._emit(self.PAUSED)
+
+    def _seek(self, position: float):
+        track = self._track
+        if track is None:
+            return
+        new = self._load(track.filePath, int(round(position * track.samplerate)))
+        self._track = new
+        track.close()
+        self._emit(self.PAUSED if self._paused else self.PLAYING)
+
+    def _stop(self):
+        if self._track is None:
+            return
+        self._stopOutput()
+        self._emit(self.STOPPED)
+        self._unload()
+
+    def _record(self, samplerate: int, channels: int, sink):
+        started = False
+        try:
+            if self.recording:
+                return
+            samplerate, channels = int(samplerate), int(channels)
+            if self._input is None or self._inputFormat != (samplerate, channels):
+                import sounddevice as sd
+
+                self._closeInput()
+                self._capture = RingBuffer(max(1024, int(self.recordBufferSec * samplerate)), channels)
+                self._input = sd.InputStream(
+                    samplerate=samplerate, channels=channels, dtype='float32', callback=self._inputCallback
+                )
+                self._inputFormat = (samplerate, channels)
+            # the input stream is stopped, so neither side of the ring is running
+            self._capture.reset()
+            self._recordedFrames = 0
+            self.recordStats.samplerate = samplerate
+            self.recordStats.reset()
+            self.recording = True
+            try:
+                self._input.start()
+            except Exception:
+                self.recording = False
+                raise
+            self._sink = sink
+            started = True
+        finally:
+            if not started:
+                # this recording never ran: end its sink anyway, its consumer waits for the None
+                self._deliver(sink, None)
+        self._emit(self.RECORDING, samplerate=samplerate)
+
+    def _stopRecording(self):
+        if not self.recording:
+            return
+        try:
+            # stop() returns once the last callback has run
+            self._input.stop()
+        finally:
+            self.recording = False
+        self._drainCapture()
+        self._deliver(self._sink, None)
+        self._sink = None
+        self._logStats(self.recordStats)
+        self._emit(self.RECORDED, frames=self._recordedFrames, samplerate=self._inputFormat[0])
+
+    def _drainCapture(self):
+        available = self._capture.readable()
+        if not available:
+            return
+        block = np.empty((available, self._capture.channels), dtype=np.float32)
+        self._capture.read(block)
+        self._recordedFrames += available
+        self._deliver(self._sink, block)
+
+    @staticmethod
+    def _deliver(sink, block: Optional[np.ndarray]):
+        if sink is None:
+            return
+        try:
+            sink(block)
+        except Exception as e:
+            logger.error(f"Audio engine recording sink failed: {e}")
+
+    def _closeInput(self):
+        inp, self._input = self._input, None
+        self._inputFormat = None
+        if inp is not None:
+            try:
+                inp.stop()
+            finally:
+                inp.close()
+
+    def _shutdown(self):
+        try:
+            if self.recording:
+                self._stopRecording()
+            self._stop()
+        finally:
+            self._closeOutput()
+            self._closeInput()
+
+
+audioEngine = AudioEngine.getInstance()
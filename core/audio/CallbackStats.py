@@ -0,0 +1,78 @@
+from time import perf_counter
+from typing import Dict
+
+__all__ = ['CallbackStats']
+
+
+class CallbackStats:
+    """
+    Counters for a real-time audio callback.
+
+    The callback updates plain attributes (no lock, no arrays), the UI and the logs read them:
+    callbacks run, last/max/total time spent in the callback, overruns (a callback that took longer
+    than the audio its block holds), underflows (output ran dry: the device reported it or the
+    player had no decoded audio ready) and overflows (input was lost: the device reported it or the
+    recording ring was full). Readers may see a snapshot that is one callback stale.
+    """
+
+    def __init__(self, name: str, samplerate: int):
+        self.name = name
+        self.samplerate = int(samplerate)
+        self.reset()
+
+    def reset(self):
+        self.callbacks = 0
+        self.frames = 0
+        self.lastDuration = 0.0
+        self.maxDuration = 0.0
+        self.totalDuration = 0.0
+        self.overruns = 0
+        self.underflows = 0
+        self.overflows = 0
+        self.droppedFrames = 0  # input frames that did not fit in the ring
+
+    def record(self, status, started: float, frames: int):
+        """Account for one callback that began at perf_counter() `started`; call it last in the callback."""
+        duration = perf_counter() - started
+        self.callbacks += 1
+        self.frames += frames
+        self.lastDuration = duration
+        self.totalDuration += duration
+        if duration > self.maxDuration:
+            self.maxDuration = duration
+        if duration * self.samplerate > frames:
+            self.overruns += 1
+        if status:
+            if status.output_underflow or status.input_underflow:
+                self.underflows += 1
+            if status.input_overflow or status.output_overflow:
+                self.overflows += 1
+
+    @property
+    def xruns(self) -> int:
+        return self.underflows + self.overflows
+
+    def snapshot(self) -> Dict[str, float]:
+        """Counters plus durations in milliseconds and the callback load (time in callback / audio time)."""
+        calls = self.callbacks
+        frames = self.frames
+        total = self.totalDuration
+        return {
+            'callbacks': calls,
+            'last_ms': self.lastDuration * 1000.0,
+            'mean_ms': total / calls * 1000.0 if calls else 0.0,
+            'max_ms': self.maxDuration * 1000.0,
+            'load': total * self.samplerate / frames if frames else 0.0,
+            'overruns': self.overruns,
+            'underflows': self.underflows,
+            'overflows': self.overflows,
+            'dropped_frames': self.droppedFrames,
+        }
+
+    def summary(self) -> str:
+        s = self.snapshot()
+        return (
+            f"{self.name}: {s['callbacks']} callbacks, mean {s['mean_ms']:.3f} ms, max {s['max_ms']:.3f} ms, "
+            f"load {s['load']:.1%}, {s['overruns']} overruns, {s['underflows']} underflows, "
+            f"{s['overflows']} overflows ({s['dropped_frames']} frames dropped)"
+        )
@@ -0,0 +1,72 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+__all__ = ['RingBuffer']
+
+
+class RingBuffer:
+    """
+    Single-producer / single-consumer ring of (frames, channels) samples.
+
+    One thread writes (write() or writeRegions() + commitWrite()) and one thread reads (read()).
+    Neither side takes a lock: the producer only advances the write count and the consumer only the
+    read count, each after its copy is done, so the other side never sees a half-copied block.
+    The storage is allocated once; reads and writes copy straight between it and the caller's arrays.
+    """
+
+    def __init__(self, capacity: int, channels: int = 1, dtype=np.float32):
+        self.capacity = max(1, int(capacity))
+        self.channels = int(channels)
+        self._data = np.zeros((self.capacity, self.channels), dtype=dtype)
+        self._written = 0  # frames ever written; advanced by the producer only
+        self._read = 0  # frames ever read; advanced by the consumer only
+
+    def readable(self) -> int:
+        """Frames waiting to be read."""
+        return self._written - self._read
+
+    def writable(self) -> int:
+        """Free frames."""
+        return self.capacity - (self._written - self._read)
+
+    def writeRegions(self, frames: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Views of the free space (up to `frames`), in order; the second is empty unless the space
+        wraps around. Fill them in place (e.g. SoundFile.read(out=...)) and publish with commitWrite().
+        """
+        free = self.writable()
+        if frames is not None:
+            free = min(free, int(frames))
+        start = self._written % self.capacity
+        first = min(free, self.capacity - start)
+        return self._data[start:start + first], self._data[:free - first]
+
+    def commitWrite(self, frames: int):
+        """Publish `frames` frames filled through writeRegions()."""
+        self._written += int(frames)
+
+    def write(self, block: np.ndarray) -> int:
+        """Copy as much of `block` as fits; returns the number of frames written."""
+        first, second = self.writeRegions(len(block))
+        n = len(first)
+        first[...] = block[:n]
+        second[...] = block[n:n + len(second)]
+        n += len(second)
+        self.commitWrite(n)
+        return n
+
+    def read(self, out: np.ndarray) -> int:
+        """Copy up to len(out) frames into `out`; returns the number of frames read."""
+        n = min(len(out), self.readable())
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        out[first:n] = self._data[:n - first]
+        self._read += n
+        return n
+
+    def reset(self):
+        """Drop everything buffered; only while neither side is running."""
+        self._written = 0
+        self._read = 0
@@ -0,0 +1,9 @@
+from .CallbackStats import CallbackStats
+from .RingBuffer import RingBuffer
+from .AudioEngine import PREFETCH_SEC, RECORD_BUFFER_SEC, AudioEngine, audioEngine
+
+__all__ = [
+    'CallbackStats',
+    'RingBuffer',
+    'PREFETCH_SEC', 'RECORD_BUFFER_SEC', 'AudioEngine', 'audioEngine',
+]
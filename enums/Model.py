@@ -5,4 +5,5 @@ __all__ = ['Model']
 
 class Model(Enum):
     MLP = 'MLP'
+    MLP_NUMPY = 'MLP NumPy'
     KNN = 'KNN'
@@ -34,6 +34,7 @@ class AppTheme(ThemeMeta):
         default=Theme.LIGHT,
         logo='wavemood.jpg',
         mlp='mlp.png',
+        mlp_numpy='mlp.png',
         knn='knn.png',
         recording='recording.gif',
     )
@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_array_equal
+
+from core.analysis import COARSE_HOP_SEC, HOP_SEC, coarse_factor, load_models, pipeline, refine_mask, synthetic_speech
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SR = 22050
+
+
+def test_refine_mask_only_refines_doubtful_stretches():
+    # coarse windows are fine windows 0, 4, 8, 12
+    labels = ['happy', 'happy', 'sad', 'sad']
+    confidences = [0.9, 0.9, 0.9, 0.3]
+    need, owner = refine_mask(labels, confidences, 4, 15)
+    assert_array_equal(np.flatnonzero(need), [5, 6, 7, 9, 10, 11, 13, 14])
+    # the rest take their nearest coarse window
+    assert_array_equal(owner[[0, 1, 2, 3, 4, 8, 12]], [0, 0, 0, 1, 1, 2, 3])
+
+
+def test_coarse_factor():
+    assert coarse_factor(4.0, 0.5) == 8
+    assert coarse_factor(0.2, 0.5) == 1
+    assert coarse_factor(4.0, 0) == 1
+
+
+@pytest.fixture(scope='module')
+def knn_models():
+    return load_models(os.path.join(ROOT, 'res', 'nlm'), knn=True, mlp=False, mlp_numpy=False)
+
+
+@pytest.fixture(scope='module')
+def speech_wav(tmp_path_factory):
+    path = tmp_path_factory.mktemp('audio') / 'speech.wav'
+    sf.write(str(path), synthetic_speech(40.0, SR, speech_ratio=0.7), SR)
+    return str(path)
+
+
+def _spans(result):
+    return [(e['start'], e['end'], e['label']) for e in result['timeline']]
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_refining_everything_matches_full_analysis(speech_wav, knn_models, streaming):
+    full = pipeline.analyze_file(speech_wav, 'knn', knn_models, streaming=streaming)
+    adaptive = pipeline.analyze_file(
+        speech_wav, 'knn', knn_models, streaming=streaming, adaptive=True, min_confidence=1.01
+    )
+    assert adaptive['ok']
+    assert adaptive['timeline'] == full['timeline']
+
+
+def test_adaptive_keeps_the_fine_grid_and_the_coarse_predictions(speech_wav, knn_models):
+    full = pipeline.analyze_file(speech_wav, 'knn', knn_models, streaming=False)
+    adaptive = pipeline.analyze_file(speech_wav, 'knn', knn_models, streaming=False, adaptive=True)
+    assert adaptive['ok']
+    assert [s[:2] for s in _spans(adaptive)] == [s[:2] for s in _spans(full)]
+    k = coarse_factor(COARSE_HOP_SEC, HOP_SEC)
+    assert adaptive['timeline'][::k] == full['timeline'][::k]
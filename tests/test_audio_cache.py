@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_allclose
+
+from core.analysis import AudioCache, resample
+
+SR = 44100
+
+
+@pytest.fixture
+def stereo_wav(tmp_path):
+    path = tmp_path / 'stereo.wav'
+    t = np.arange(2 * SR) / SR
+    sig = np.stack([0.3 * np.sin(2 * np.pi * 220 * t), 0.2 * np.sin(2 * np.pi * 330 * t)], axis=1)
+    sf.write(str(path), sig.astype(np.float32), SR)
+    return str(path)
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    read = sf.read
+
+    def counting_read(*args, **kwargs):
+        calls.append(args[0])
+        return read(*args, **kwargs)
+
+    monkeypatch.setattr(sf, 'read', counting_read)
+    return calls
+
+
+def test_resampled_signal_is_kept_without_its_native_source(stereo_wav, decodes):
+    cache = AudioCache()
+    sig, sr = cache.mono(stereo_wav, 22050)
+    data, _ = sf.read(stereo_wav, dtype='float32', always_2d=True)
+    assert sr == 22050 and not sig.flags.writeable
+    assert_allclose(sig, resample(data.mean(axis=1), SR, 22050), atol=1e-6)
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'entries': 1, 'bytes': sig.nbytes}
+
+    again, _ = cache.mono(stereo_wav, 22050)
+    assert again is sig
+    assert cache.stats()['hits'] == 1 and len(decodes) == 2  # the cache's decode plus the reference read above
+
+
+def test_native_signal_is_reused_for_other_rates(stereo_wav, decodes):
+    cache = AudioCache()
+    native, sr = cache.mono(stereo_wav, None)
+    resampled, _ = cache.mono(stereo_wav, 22050)
+    assert sr == SR and len(decodes) == 1
+    assert cache.stats()['bytes'] == native.nbytes + resampled.nbytes
+
+
+def test_concurrent_requests_decode_once(stereo_wav, decodes):
+    cache = AudioCache()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.mono(stereo_wav, 22050)[0])) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(decodes) == 1
+    assert all(sig is results[0] for sig in results)
+
+
+def test_least_recently_used_file_is_evicted(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'{i}.wav'
+        sf.write(str(path), np.zeros(SR, dtype=np.float32), SR)
+        paths.append(str(path))
+    cache = AudioCache(max_bytes=2 * SR * 4)
+    cache.mono(paths[0], None)
+    cache.mono(paths[1], None)
+    cache.mono(paths[0], None)
+    cache.mono(paths[2], None)
+    assert cache.stats()['entries'] == 2
+    cache.mono(paths[0], None)
+    assert cache.stats()['hits'] == 2  # paths[0] survived; paths[1] was the one dropped
@@ -0,0 +1,209 @@
+import queue
+import sys
+import time
+import types
+
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_array_equal
+
+from core.analysis import synthetic_speech
+from core.audio import AudioEngine, CallbackStats
+
+SR = 16000
+BLOCK = 512
+
+
+class _Stream:
+    """Device stand-in: the test drives the callback by hand, nothing runs on its own."""
+
+    fail_start = False
+    opened = []
+
+    def __init__(self, samplerate, channels, dtype, callback):
+        self.samplerate = samplerate
+        self.channels = channels
+        self.callback = callback
+        self.active = False
+        self.opened.append(self)
+
+    def start(self):
+        if self.fail_start:
+            raise RuntimeError('no input device')
+        self.active = True
+
+    def stop(self):
+        self.active = False
+
+    def close(self):
+        self.active = False
+
+
+@pytest.fixture
+def fake_sd(monkeypatch):
+    module = types.SimpleNamespace(
+        InputStream=type('InputStream', (_Stream,), {'opened': []}),
+        OutputStream=type('OutputStream', (_Stream,), {'opened': []}),
+    )
+    monkeypatch.setitem(sys.modules, 'sounddevice', module)
+    return module
+
+
+def _engine(**kwargs):
+    engine = AudioEngine(**kwargs)
+    events = queue.Queue()
+    engine.addListener(lambda state, info: events.put((state, info)))
+    engine.events = events
+    return engine
+
+
+@pytest.fixture
+def engine(fake_sd):
+    engine = _engine()
+    yield engine
+    engine.close(timeout=5)
+
+
+def _next_state(engine, *states):
+    while True:
+        state, info = engine.events.get(timeout=5)
+        if state in states:
+            return state, info
+
+
+@pytest.fixture
+def wav(tmp_path):
+    path = str(tmp_path / 'speech.wav')
+    sf.write(path, synthetic_speech(1.3, SR), SR, subtype='PCM_16')
+    return path
+
+
+def _pull(engine, frames=BLOCK):
+    """One output callback, as the device would run it once the engine thread has decoded ahead."""
+    track = engine._track
+    deadline = time.monotonic() + 5
+    while track is not None and track.ring.readable() < frames and not track.eof:
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+    outdata = np.zeros((frames, engine._outputFormat[1]), dtype=np.float32)
+    engine._output.callback(outdata, frames, None, None)
+    return outdata
+
+
+def _sink():
+    blocks = queue.Queue()
+    return blocks, blocks.put
+
+
+def test_failed_record_still_ends_the_sink(engine, fake_sd):
+    fake_sd.InputStream.fail_start = True
+    blocks, sink = _sink()
+    engine.record(16000, sink=sink)
+    state, info = _next_state(engine, AudioEngine.ERROR, AudioEngine.RECORDING)
+    assert state == AudioEngine.ERROR and info['command'] == 'record'
+    assert blocks.get(timeout=5) is None
+    assert not engine.recording
+
+
+def test_record_while_recording_ends_the_second_sink(engine):
+    first, first_sink = _sink()
+    second, second_sink = _sink()
+    engine.record(16000, sink=first_sink)
+    _next_state(engine, AudioEngine.RECORDING)
+    engine.record(16000, sink=second_sink)
+    assert second.get(timeout=5) is None
+    assert first.empty()
+    engine.stopRecording()
+    _next_state(engine, AudioEngine.RECORDED)
+    assert first.get(timeout=5) is None
+
+
+def test_playback_streams_the_whole_file(engine, wav):
+    expected = sf.read(wav, dtype='float32', always_2d=True)[0]
+    engine.play(wav)
+    _next_state(engine, AudioEngine.PLAYING)
+    blocks = []
+    while engine._track is not None and not engine._track.drained:
+        blocks.append(_pull(engine))
+    played = np.concatenate(blocks)
+    assert_array_equal(played[:len(expected)], expected)
+    assert not played[len(expected):].any()
+    _next_state(engine, AudioEngine.FINISHED)
+    assert engine.playbackStats.underflows == 0
+    assert engine.playbackStats.callbacks == len(blocks)
+
+
+def _status(**flags):
+    names = ('input_underflow', 'input_overflow', 'output_underflow', 'output_overflow')
+    return types.SimpleNamespace(**{name: flags.get(name, False) for name in names})
+
+
+def test_callback_stats_count_xruns_and_overruns():
+    stats = CallbackStats('test', SR)
+    stats.record(None, time.perf_counter(), BLOCK)
+    stats.record(_status(output_underflow=True), time.perf_counter(), BLOCK)
+    stats.record(_status(input_overflow=True), time.perf_counter() - 1.0, BLOCK)  # a second on 32 ms of audio
+    snapshot = stats.snapshot()
+    assert (snapshot['callbacks'], snapshot['underflows'], snapshot['overflows'], snapshot['overruns']) == (3, 1, 1, 1)
+    assert stats.xruns == 2
+    assert snapshot['max_ms'] >= 1000.0 and snapshot['load'] > 1.0
+    stats.reset()
+    assert stats.xruns == 0 and stats.snapshot()['callbacks'] == 0
+
+
+def test_full_record_ring_drops_and_counts_input(fake_sd):
+    engine = _engine(record_buffer_sec=0.01)
+    blocks, sink = _sink()
+    try:
+        engine.record(SR, sink=sink)
+        _next_state(engine, AudioEngine.RECORDING)
+        capacity = engine._capture.capacity
+        indata = np.ones((capacity + 300, 1), dtype=np.float32)
+        engine._input.callback(indata, len(indata), None, None)
+        assert engine.recordStats.overflows == 1
+        assert engine.recordStats.droppedFrames == 300
+        engine.stopRecording()
+        _, info = _next_state(engine, AudioEngine.RECORDED)
+    finally:
+        engine.close(timeout=5)
+    received = []
+    while (block := blocks.get(timeout=5)) is not None:
+        received.append(block)
+    assert info['frames'] == capacity == sum(len(b) for b in received)
+
+
+def test_pause_seek_and_resume_on_exact_frames(engine, fake_sd, wav):
+    expected = sf.read(wav, dtype='float32', always_2d=True)[0]
+    engine.play(wav)
+    _next_state(engine, AudioEngine.PLAYING)
+    assert_array_equal(_pull(engine), expected[:BLOCK])
+    engine.pause()
+    _next_state(engine, AudioEngine.PAUSED)
+    # paused output keeps running on silence without moving the position
+    assert not _pull(engine).any() and engine.frame == BLOCK
+    engine.seek(0.5)
+    _, info = _next_state(engine, AudioEngine.PAUSED)
+    assert info['frame'] == SR // 2
+    engine.play()
+    _next_state(engine, AudioEngine.PLAYING)
+    assert_array_equal(_pull(engine), expected[SR // 2:SR // 2 + BLOCK])
+    engine.stop()
+    _next_state(engine, AudioEngine.STOPPED)
+    assert engine.filePath is None and not engine.playing
+
+
+def test_output_stream_is_reused_for_the_same_format(engine, fake_sd, wav, tmp_path):
+    other = str(tmp_path / 'other.wav')
+    sf.write(other, synthetic_speech(0.5, SR), SR)
+    stereo = str(tmp_path / 'stereo.wav')
+    sf.write(stereo, np.zeros((SR // 2, 2), dtype=np.float32), SR)
+    for path in (wav, other, wav):
+        engine.play(path)
+        _, info = _next_state(engine, AudioEngine.PLAYING)
+        assert info['file'] == path
+    assert len(fake_sd.OutputStream.opened) == 1
+    engine.play(stereo)
+    _next_state(engine, AudioEngine.PLAYING)
+    assert len(fake_sd.OutputStream.opened) == 2
+    assert engine._output is fake_sd.OutputStream.opened[-1] and engine._output.channels == 2
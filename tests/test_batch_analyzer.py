@@ -0,0 +1,33 @@
+import importlib
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from core.analysis import BatchAnalyzer, synthetic_speech
+
+# the package exports the class under the module's name
+batch_module = importlib.import_module('core.analysis.BatchAnalyzer')
+SR = 22050
+
+
+def test_worker_limits_itself_to_one_blas_thread(monkeypatch):
+    threadpoolctl = pytest.importorskip('threadpoolctl')
+    for var in batch_module._BLAS_THREAD_VARS:
+        monkeypatch.delenv(var, raising=False)
+    np.ones((64, 64)) @ np.ones((64, 64))  # make sure numpy's BLAS is loaded
+    with threadpoolctl.threadpool_limits(limits=None):  # restores this process's limits afterwards
+        batch_module._limit_blas_threads()
+        info = threadpoolctl.threadpool_info()
+        assert info and all(pool['num_threads'] == 1 for pool in info)
+    assert all(os.environ[var] == '1' for var in batch_module._BLAS_THREAD_VARS)
+
+
+def test_folder_is_analysed_by_several_workers(tmp_path):
+    for i in range(3):
+        sf.write(str(tmp_path / f'{i}.wav'), synthetic_speech(3.0, SR, seed=i), SR)
+    (tmp_path / 'notes.txt').write_text('not audio')
+    results = dict(BatchAnalyzer('knn', max_workers=2, use_cache=False).runFolder(str(tmp_path)))
+    assert sorted(os.path.basename(p) for p in results) == ['0.wav', '1.wav', '2.wav']
+    assert all(r['ok'] and r['timeline'] for r in results.values())
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+import joblib
+import numpy as np
+import soundfile as sf
+
+from core.analysis import ENCODER_FILE, KNN_FILE
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# runs `python -m wavemood ...` and reports which heavy packages ended up imported
+_PROBE = """
+import json, runpy, sys
+sys.argv[0] = 'wavemood'
+try:
+    runpy.run_module('wavemood', run_name='__main__', alter_sys=True)
+    rc = 0
+except SystemExit as e:
+    rc = e.code or 0
+heavy = sorted(m for m in sys.modules if m.split('.')[0] in ('PyQt6', 'tensorflow'))
+print('PROBE ' + json.dumps({'rc': rc, 'heavy': heavy}), file=sys.stderr)
+"""
+
+
+def test_analyze_cold_start_loads_neither_qt_nor_tensorflow(tmp_path):
+    wav = tmp_path / 'tone.wav'
+    t = np.arange(3 * 22050) / 22050
+    sf.write(str(wav), (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), 22050)
+    out = tmp_path / 'result.json'
+    proc = subprocess.run(
+        [
+            sys.executable, '-c', _PROBE, 'analyze', str(wav), '--model', 'mlp_numpy', '--no-vad', '--no-cache',
+            '-o', str(out),
+        ],
+        # outside the repo: the bundled models are found relative to the package, not the cwd
+        cwd=str(tmp_path), env=dict(os.environ, PYTHONPATH=ROOT), capture_output=True, text=True, timeout=300,
+    )
+    probe = [line for line in proc.stderr.splitlines() if line.startswith('PROBE ')]
+    assert proc.returncode == 0, proc.stderr
+    assert probe, proc.stderr
+    report = json.loads(probe[-1][len('PROBE '):])
+    assert report['rc'] == 0, proc.stderr
+    assert report['heavy'] == []
+    result = json.loads(out.read_text())[str(wav)]
+    assert result['ok'], result
+    emotions = set(joblib.load(os.path.join(ROOT, 'res', 'nlm', ENCODER_FILE)).classes_)
+    assert result['summary'] and set(result['summary']) <= emotions
+    assert {entry['label'] for entry in result['timeline']} <= emotions
+
+
+def test_analyze_without_model_files_fails(tmp_path):
+    wav = tmp_path / 'tone.wav'
+    sf.write(str(wav), np.zeros(22050, dtype=np.float32), 22050)
+    out = tmp_path / 'result.json'
+    proc = subprocess.run(
+        [
+            sys.executable, '-m', 'wavemood', 'analyze', str(wav), '--model', 'knn', '--models-dir', str(tmp_path),
+            '--no-cache', '-o', str(out),
+        ],
+        cwd=ROOT, capture_output=True, text=True, timeout=300,
+    )
+    result = json.loads(out.read_text())[str(wav)]
+    assert not result['ok']
+    assert KNN_FILE in result['error']
@@ -0,0 +1,67 @@
+import os
+import time
+
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from core.analysis import FeatureCache
+
+PARAMS = {'sr': 22050, 'win': 22050, 'hop': 11025}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return FeatureCache(str(tmp_path / 'cache'))
+
+
+def _features(rows, seed=0):
+    return np.random.default_rng(seed).standard_normal((rows, 8)).astype(np.float32)
+
+
+def _blob(cache):
+    (name,) = [f for f in os.listdir(cache.directory) if f.endswith('.npy')]
+    return os.path.join(cache.directory, name)
+
+
+def test_hits_and_misses_are_counted(cache):
+    features = _features(10)
+    assert cache.get('abc', **PARAMS) is None
+    cache.put('abc', features, 12345, **PARAMS)
+    cached, total_len = cache.get('abc', **PARAMS)
+    assert_array_equal(cached, features)
+    assert total_len == 12345
+    # other extraction parameters are another entry
+    assert cache.get('abc', **dict(PARAMS, hop=5512)) is None
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'entries': 1, 'bytes': os.path.getsize(_blob(cache))}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    features = _features(1000)
+    probe = FeatureCache(str(tmp_path / 'probe'))
+    probe.put('x', features, 1, **PARAMS)
+    entry_bytes = probe.stats()['bytes']
+
+    cache = FeatureCache(str(tmp_path / 'cache'), max_bytes=2 * entry_bytes)
+    for digest in ('a', 'b'):
+        cache.put(digest, features, 1, **PARAMS)
+        time.sleep(0.01)
+    assert cache.get('a', **PARAMS) is not None
+    time.sleep(0.01)
+    cache.put('c', features, 1, **PARAMS)
+    stats = cache.stats()
+    assert stats['entries'] == 2 and stats['bytes'] <= 2 * entry_bytes
+    assert cache.get('b', **PARAMS) is None
+    assert cache.get('a', **PARAMS) is not None and cache.get('c', **PARAMS) is not None
+    assert len([f for f in os.listdir(cache.directory) if f.endswith('.npy')]) == 2
+
+
+def test_content_hash_follows_the_file(cache, tmp_path):
+    path = tmp_path / 'a.wav'
+    path.write_bytes(b'one')
+    first = cache.content_hash(str(path))
+    assert cache.content_hash(str(path)) == first
+    path.write_bytes(b'two!')
+    assert cache.content_hash(str(path)) != first
+    (tmp_path / 'copy.wav').write_bytes(b'two!')
+    assert cache.content_hash(str(tmp_path / 'copy.wav')) == cache.content_hash(str(path))
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_allclose, assert_array_equal
+
+from core.analysis import (
+    FeatureStream, PITCH_METHODS, build_feature_matrix, iter_file_features, iter_signal_features, open_audio,
+    synthetic_speech,
+)
+
+SR = 16000
+WIN = SR
+HOP = SR // 2
+
+
+@pytest.fixture(scope='module')
+def signal():
+    # half dead air, so the VAD has windows to gate; the odd length leaves a partial tail window
+    return synthetic_speech(25.3, SR, speech_ratio=0.5)
+
+
+def _stream(sig, blocksize, pitch, vad):
+    stream = FeatureStream(SR, WIN, HOP, pitch=pitch, vad=vad)
+    parts = [stream.push(sig[i:i + blocksize]) for i in range(0, len(sig), blocksize)]
+    parts.append(stream.finish())
+    return np.concatenate([s for s, _ in parts]), np.concatenate([f for _, f in parts])
+
+
+@pytest.mark.parametrize('pitch', PITCH_METHODS)
+@pytest.mark.parametrize('vad', [False, True])
+@pytest.mark.parametrize('blocksize', [1000, 4096, HOP, WIN + 1, 1 << 17])
+def test_stream_matches_whole_signal(signal, blocksize, pitch, vad):
+    expected_starts, expected = build_feature_matrix(signal, SR, WIN, HOP, pitch=pitch, vad=vad)
+    starts, features = _stream(signal, blocksize, pitch, vad)
+    assert_array_equal(starts, expected_starts)
+    assert_allclose(features, expected, rtol=1e-5, atol=1e-6, equal_nan=True)
+    if vad:
+        assert np.isnan(features[:, 0]).any() and not np.isnan(features[:, 0]).all()
+
+
+def test_stream_memory_stays_bounded(signal):
+    stream = FeatureStream(SR, WIN, HOP)
+    for i in range(0, len(signal), 4096):
+        stream.push(signal[i:i + 4096])
+        assert stream._buf.size <= WIN + HOP + 4096
+    assert stream.samples == len(signal)
+
+
+def test_signal_iterator_matches_whole_signal(signal):
+    expected_starts, expected = build_feature_matrix(signal, SR, WIN, HOP, vad=True)
+    parts = list(iter_signal_features(signal, SR, WIN, HOP, blocksize=3 * HOP, vad=True))
+    assert len(parts) > 1
+    assert_array_equal(np.concatenate([s for s, _ in parts]), expected_starts)
+    assert_allclose(np.concatenate([f for _, f in parts]), expected, rtol=1e-5, atol=1e-6, equal_nan=True)
+
+
+def test_file_iterator_matches_whole_file(signal, tmp_path):
+    path = str(tmp_path / 'speech.wav')
+    sf.write(path, signal, SR, subtype='FLOAT')
+    expected_starts, expected = build_feature_matrix(signal, SR, WIN, HOP, vad=True)
+    with open_audio(path) as f:
+        parts = list(iter_file_features(f, WIN, HOP, blocksize=5000, vad=True))
+    assert_array_equal(np.concatenate([s for s, _ in parts]), expected_starts)
+    assert_allclose(np.concatenate([f for _, f in parts]), expected, rtol=1e-5, atol=1e-6, equal_nan=True)
@@ -0,0 +1,52 @@
+import os
+
+import joblib
+import pytest
+import soundfile as sf
+
+from core.analysis import (
+    ENSEMBLE, KNN_ENCODER_FILE, MODEL_CHOICES, SILENCE_LABEL, analyze_models, ensemble_predictions, load_models,
+    synthetic_speech
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT, 'res', 'nlm')
+SR = 22050
+
+
+@pytest.fixture(scope='module')
+def emotions():
+    return set(joblib.load(os.path.join(MODELS_DIR, KNN_ENCODER_FILE)).classes_)
+
+
+@pytest.fixture(scope='module')
+def speech_wav(tmp_path_factory):
+    path = tmp_path_factory.mktemp('audio') / 'speech.wav'
+    sf.write(str(path), synthetic_speech(8.0, SR, seed=3), SR)
+    return str(path)
+
+
+def _models(*choices):
+    return {c: load_models(MODELS_DIR, **{k: k == c for k in MODEL_CHOICES}) for c in choices}
+
+
+@pytest.mark.parametrize('choices', [('knn', 'mlp_numpy'), ('knn', 'knn_lp', 'mlp_lp')])
+def test_model_and_ensemble_labels_are_emotion_names(speech_wav, emotions, choices):
+    result = analyze_models(speech_wav, _models(*choices), ensemble=True)
+    assert result['ok'], result['error']
+    for key, timeline in [(c, result['models'][c]['timeline']) for c in choices] + [
+        (ENSEMBLE, result['ensemble']['timeline'])
+    ]:
+        scored = [e for e in timeline if e['label'] != SILENCE_LABEL]
+        assert scored, key
+        for entry in scored:
+            assert set(entry['probs']) == emotions, key
+    for summary in [result['models'][c]['summary'] for c in choices] + [result['ensemble']['summary']]:
+        assert set(summary) - {SILENCE_LABEL} <= emotions
+
+
+def test_ensemble_rejects_different_label_sets():
+    a = [('happy', {'happy': 0.7, 'sad': 0.3})]
+    b = [('6', {'6': 0.9, '2': 0.1})]
+    with pytest.raises(ValueError):
+        ensemble_predictions([a, b])
@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from core.analysis import MODELS_DIR, ModelRegistry
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_bundled_models_are_the_default():
+    assert os.path.samefile(MODELS_DIR, os.path.join(ROOT, 'res', 'nlm'))
+    registry = ModelRegistry()
+    assert registry.get('mlp_numpy')['mlp_numpy'] is not None
+    assert registry.state('mlp_numpy') == ModelRegistry.READY
+
+
+def test_missing_model_file_is_a_failed_load(tmp_path):
+    registry = ModelRegistry(base=str(tmp_path))
+    states = []
+    registry.addListener(lambda choice, state: states.append((choice, state)))
+    with pytest.raises(RuntimeError, match='emotiondetector_mlp_weights.npz'):
+        registry.get('mlp_numpy')
+    assert registry.state('mlp_numpy') == ModelRegistry.FAILED
+    assert states == [('mlp_numpy', ModelRegistry.LOADING), ('mlp_numpy', ModelRegistry.FAILED)]
@@ -0,0 +1,59 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+from sklearn.neighbors import KNeighborsClassifier
+
+from core.analysis import KNN_FILE, MODELS_DIR, NumpyKNN
+
+
+@pytest.fixture(scope='module')
+def data():
+    rng = np.random.default_rng(0)
+    train = rng.standard_normal((1500, 8)) * [1, 10, 100, 1, 1, 0.1, 5, 50]
+    labels = rng.integers(0, 4, len(train))
+    # queries near training rows, plus a few exact copies (infinite 'distance' weights)
+    queries = train[rng.integers(0, len(train), 400)] + rng.normal(0, 0.05, (400, 8))
+    queries[:10] = train[:10]
+    return train.astype(np.float32), labels, queries.astype(np.float32)
+
+
+@pytest.mark.parametrize('weights', ['uniform', 'distance'])
+@pytest.mark.parametrize('use_kdtree', [True, False])
+def test_matches_sklearn(data, weights, use_kdtree):
+    train, labels, queries = data
+    knn = KNeighborsClassifier(n_neighbors=5, weights=weights).fit(train, labels)
+    fast = NumpyKNN.fromSklearn(knn, use_kdtree=use_kdtree)
+    assert (fast._tree is not None) == use_kdtree
+    distances, indices = knn.kneighbors(queries)
+    fast_distances, fast_indices = fast.kneighbors(queries)
+    assert_array_equal(fast_indices, indices)
+    assert_allclose(fast_distances, distances, rtol=1e-12, atol=1e-12)
+    if weights == 'uniform':
+        assert_array_equal(fast.predict_proba(queries), knn.predict_proba(queries))
+    else:
+        # the inverse distances are summed in another order than sklearn's, so the last bit may differ
+        assert_allclose(fast.predict_proba(queries), knn.predict_proba(queries), rtol=1e-12, atol=0)
+    assert_array_equal(fast.predict(queries), knn.predict(queries))
+
+
+def test_blocked_search_matches_single_block(data, monkeypatch):
+    train, labels, queries = data
+    fast = NumpyKNN(train, labels, np.arange(4), use_kdtree=False)
+    whole = fast.kneighbors(queries)
+    monkeypatch.setattr(NumpyKNN, 'BLOCK_ELEMENTS', 400 * 64)
+    blocked = fast.kneighbors(queries)
+    assert_array_equal(blocked[1], whole[1])
+    assert_array_equal(blocked[0], whole[0])
+
+
+@pytest.mark.parametrize('use_kdtree', [True, False])
+def test_shipped_model_matches_sklearn(use_kdtree):
+    knn = joblib.load(os.path.join(MODELS_DIR, KNN_FILE))
+    rng = np.random.default_rng(1)
+    train = np.asarray(knn._fit_X)
+    queries = train[rng.integers(0, len(train), 300)] * (1 + rng.normal(0, 0.02, (300, train.shape[1])))
+    fast = NumpyKNN.fromSklearn(knn, use_kdtree=use_kdtree)
+    assert_array_equal(fast.predict(queries), knn.predict(queries))
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from core.analysis import NumpyMLP
+
+h5py = pytest.importorskip('h5py')
+sklearn_nn = pytest.importorskip('sklearn.neural_network')
+sklearn_preprocessing = pytest.importorskip('sklearn.preprocessing')
+
+CLASSES = ['angry', 'calm', 'happy', 'sad']
+
+
+@pytest.fixture(scope='module')
+def fitted():
+    rng = np.random.default_rng(0)
+    # feature columns on very different scales, like the real window features
+    x = rng.normal(size=(400, 8)) * np.array([700, 1e6, 3000, 120, 0.01, 4e-5, 0.02, 3e-5])
+    y = rng.integers(0, len(CLASSES), size=len(x))
+    scaler = sklearn_preprocessing.StandardScaler().fit(x)
+    clf = sklearn_nn.MLPClassifier(hidden_layer_sizes=(16, 8), max_iter=300, random_state=0)
+    clf.fit(scaler.transform(x), y)
+    encoder = sklearn_preprocessing.LabelEncoder().fit(CLASSES)
+    return x, scaler, clf, encoder
+
+
+def _write_keras_h5(path, clf):
+    """A minimal Keras-layout .h5 of clf's Dense stack (what NumpyMLP.fromKeras reads)."""
+    activations = ['relu'] * (len(clf.coefs_) - 1) + ['softmax']
+    names = [f'dense_{i}' for i in range(len(clf.coefs_))]
+    layers = [{'class_name': 'InputLayer', 'config': {'name': 'input'}}]
+    for name, activation in zip(names, activations):
+        layers.append({'class_name': 'Dense', 'config': {'name': name, 'activation': activation}})
+        layers.append({'class_name': 'Dropout', 'config': {'name': f'{name}_dropout', 'rate': 0.3}})
+    with h5py.File(path, 'w') as f:
+        f.attrs['model_config'] = json.dumps({'class_name': 'Sequential', 'config': {'layers': layers}})
+        weights = f.create_group('model_weights')
+        for name, kernel, bias in zip(names, clf.coefs_, clf.intercepts_):
+            group = weights.create_group(name)
+            group.attrs['weight_names'] = [f'{name}/kernel:0'.encode(), f'{name}/bias:0'.encode()]
+            group[f'{name}/kernel:0'] = kernel.astype(np.float32)
+            group[f'{name}/bias:0'] = bias.astype(np.float32)
+
+
+def test_forward_pass_matches_sklearn(fitted):
+    x, scaler, clf, encoder = fitted
+    activations = ['relu'] * (len(clf.coefs_) - 1) + ['softmax']
+    mlp = NumpyMLP(
+        list(zip(clf.coefs_, clf.intercepts_, activations)), mean=scaler.mean_, scale=scaler.scale_,
+        classes=encoder.classes_
+    )
+    expected = clf.predict_proba(scaler.transform(x))
+    assert_allclose(mlp.predict_proba(x), expected, rtol=1e-4, atol=1e-6)
+    assert list(mlp.classes_) == CLASSES
+
+
+def test_keras_export_round_trip(fitted, tmp_path):
+    x, scaler, clf, encoder = fitted
+    h5 = tmp_path / 'mlp.h5'
+    _write_keras_h5(str(h5), clf)
+    mlp = NumpyMLP.fromKeras(str(h5), scaler, encoder)
+    assert [a for _, _, a in mlp.layers] == ['relu', 'relu', 'softmax']
+    expected = clf.predict_proba(scaler.transform(x))
+    assert_allclose(mlp.predict_proba(x), expected, rtol=1e-4, atol=1e-6)
+    npz = tmp_path / 'mlp.npz'
+    mlp.save(str(npz))
+    assert_allclose(NumpyMLP.load(str(npz)).predict_proba(x), mlp.predict_proba(x), rtol=0, atol=0)
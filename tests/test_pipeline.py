@@ -0,0 +1,77 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from core.analysis import load_models, pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SR = 22050
+
+
+@pytest.fixture(scope='module')
+def knn_models():
+    return load_models(os.path.join(ROOT, 'res', 'nlm'), knn=True, mlp=False, mlp_numpy=False)
+
+
+@pytest.fixture(scope='module')
+def long_wav(tmp_path_factory):
+    path = tmp_path_factory.mktemp('audio') / 'speechlike.wav'
+    t = np.arange(60 * SR) / SR
+    voiced = np.sin(2 * np.pi * 0.3 * t) > -0.5
+    sig = 0.3 * np.sin(2 * np.pi * (140 + 40 * np.sin(t)) * t) * voiced
+    sf.write(str(path), sig.astype(np.float32), SR)
+    return str(path)
+
+
+def _spans(result):
+    return [(e['start'], e['label']) for e in result['timeline']]
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # ~6 s feature blocks so a one-minute file goes through several of them
+    monkeypatch.setattr(pipeline, 'FEATURE_BLOCKSIZE', 1 << 17)
+
+
+def test_in_memory_progress_follows_feature_blocks(long_wav, knn_models, small_blocks):
+    updates = []
+    result = pipeline.analyze_file(
+        long_wav, 'knn', knn_models, streaming=False, progress_interval=0, on_progress=updates.append
+    )
+    assert result['ok']
+    assert len(updates) > 5
+    processed = [u['processed_sec'] for u in updates]
+    assert processed == sorted(processed)
+    assert processed[0] < 0.25 * updates[0]['total_sec']
+    assert sum(len(u['entries']) for u in updates) == len(result['timeline'])
+
+
+def test_in_memory_blocks_match_single_pass(long_wav, knn_models, small_blocks, monkeypatch):
+    blocked = pipeline.analyze_file(long_wav, 'knn', knn_models, streaming=False)
+    monkeypatch.setattr(pipeline, 'FEATURE_BLOCKSIZE', 1 << 30)
+    whole = pipeline.analyze_file(long_wav, 'knn', knn_models, streaming=False)
+    assert _spans(blocked) == _spans(whole)
+
+
+def test_in_memory_cancel_stops_between_feature_blocks(long_wav, knn_models, small_blocks, monkeypatch):
+    cancel = threading.Event()
+    featurized = []
+    iter_signal_features = pipeline.iter_signal_features
+
+    def counting(*args, **kwargs):
+        for chunk in iter_signal_features(*args, **kwargs):
+            featurized.append(len(chunk[0]))
+            yield chunk
+
+    def on_progress(update):
+        cancel.set()
+
+    monkeypatch.setattr(pipeline, 'iter_signal_features', counting)
+    result = pipeline.analyze_file(
+        long_wav, 'knn', knn_models, streaming=False, progress_interval=0, on_progress=on_progress, cancel=cancel
+    )
+    assert result['cancelled'] and not result['ok']
+    assert len(featurized) == 1
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from core.analysis.pitch import estimate_f0_autocorr, estimate_f0_batch
+
+SR = 22050
+FRAME_LEN = 1024
+
+
+def _frames(signal, hop=FRAME_LEN // 2):
+    starts = range(0, len(signal) - FRAME_LEN + 1, hop)
+    return np.stack([signal[s:s + FRAME_LEN] for s in starts]).astype(np.float32)
+
+
+def _tone(f0, duration=0.5, harmonics=1):
+    t = np.arange(int(duration * SR)) / SR
+    return sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, harmonics + 1))
+
+
+def _assert_matches_reference(frames):
+    expected = np.array([estimate_f0_autocorr(frame, SR) for frame in frames], dtype=np.float32)
+    np.testing.assert_allclose(estimate_f0_batch(frames, SR), expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('f0', [60.0, 110.0, 220.0, 440.0, 790.0])
+def test_batch_matches_reference_on_sines(f0):
+    _assert_matches_reference(_frames(_tone(f0)))
+
+
+@pytest.mark.parametrize('f0', [98.0, 196.0, 330.0])
+def test_batch_matches_reference_on_harmonic_tones(f0):
+    _assert_matches_reference(_frames(_tone(f0, harmonics=6)))
+
+
+def test_batch_matches_reference_on_silence():
+    frames = np.zeros((8, FRAME_LEN), dtype=np.float32)
+    assert not estimate_f0_batch(frames, SR).any()
+    _assert_matches_reference(frames)
+
+
+def test_batch_matches_reference_across_chunks():
+    rng = np.random.default_rng(0)
+    signal = np.concatenate([_tone(150.0, 1.0, harmonics=3), 0.1 * rng.standard_normal(SR), np.zeros(SR // 2)])
+    frames = _frames(signal)
+    expected = np.array([estimate_f0_autocorr(frame, SR) for frame in frames], dtype=np.float32)
+    np.testing.assert_allclose(estimate_f0_batch(frames, SR, chunk_frames=7), expected, rtol=1e-6)
@@ -0,0 +1,54 @@
+import os
+
+import joblib
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from core.analysis import KNN_FILE, MLP_NUMPY_FILE, MODELS_DIR, NumpyKNN, NumpyMLP, QuantizedKNN, QuantizedMLP
+
+
+@pytest.fixture(scope='module')
+def mlp():
+    return NumpyMLP.load(os.path.join(MODELS_DIR, MLP_NUMPY_FILE))
+
+
+@pytest.fixture(scope='module')
+def knn():
+    return joblib.load(os.path.join(MODELS_DIR, KNN_FILE))
+
+
+@pytest.fixture(scope='module')
+def features(knn):
+    rng = np.random.default_rng(0)
+    train = np.asarray(knn._fit_X, dtype=np.float32)
+    return train[rng.integers(0, len(train), 300)] * (1 + rng.normal(0, 0.02, (300, train.shape[1]))).astype(np.float32)
+
+
+@pytest.mark.parametrize('dtype, agreement', [('float16', 1.0), ('int8', 0.98)])
+def test_quantized_mlp_keeps_compact_weights(mlp, features, tmp_path, dtype, agreement):
+    q = QuantizedMLP.fromMLP(mlp, dtype)
+    assert all(kernel.dtype == np.dtype(dtype) for kernel, _, _ in q.layers)
+    assert q.nbytes < mlp.nbytes
+    ref = mlp.predict_proba(features)
+    out = q.predict_proba(features)
+    assert np.mean(ref.argmax(axis=1) == out.argmax(axis=1)) >= agreement
+    assert_allclose(out, ref, atol=0.02)
+    path = str(tmp_path / 'mlp_lp.npz')
+    q.save(path)
+    loaded = QuantizedMLP.load(path)
+    assert loaded.dtype == dtype
+    assert_allclose(loaded.predict_proba(features), out, rtol=0, atol=0)
+
+
+@pytest.mark.parametrize('dtype', ['float16', 'int8'])
+def test_quantized_knn_searches_its_decoded_matrix(knn, features, tmp_path, dtype):
+    q = QuantizedKNN.fromSklearn(knn, dtype)
+    assert q.nbytes < NumpyKNN.fromSklearn(knn).nbytes
+    decoded = NumpyKNN(q.codes.astype(np.float64) * q.scale + q.offset, q.labels, q.classes_, q.nNeighbors, q.weights)
+    assert_allclose(q.predict_proba(features), decoded.predict_proba(features))
+    path = str(tmp_path / 'knn_lp.npz')
+    q.save(path)
+    loaded = QuantizedKNN.load(path)
+    assert np.array_equal(loaded.codes, q.codes)
+    assert_allclose(loaded.predict_proba(features), q.predict_proba(features))
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from core.analysis import ANALYSIS_SR, StreamResampler, resample, resampled_length, synthetic_speech
+
+
+@pytest.mark.parametrize('sr_in', [8000, 16000, 44100, 48000])
+@pytest.mark.parametrize('blocksize', [61, 997, 4096, 1 << 16])
+def test_stream_matches_one_shot(sr_in, blocksize):
+    sig = synthetic_speech(3.01, sr_in)
+    expected = resample(sig, sr_in, ANALYSIS_SR)
+    stream = StreamResampler(sr_in, ANALYSIS_SR)
+    parts = [stream.push(sig[i:i + blocksize]) for i in range(0, len(sig), blocksize)]
+    parts.append(stream.finish())
+    out = np.concatenate(parts)
+    assert out.dtype == np.float32
+    assert len(out) == len(expected) == resampled_length(len(sig), sr_in, ANALYSIS_SR)
+    assert_allclose(out, expected, rtol=0, atol=1e-6)
+
+
+def test_stream_shorter_than_the_filter():
+    sig = synthetic_speech(0.002, 44100)
+    stream = StreamResampler(44100, ANALYSIS_SR)
+    out = np.concatenate([stream.push(sig), stream.finish()])
+    assert_allclose(out, resample(sig, 44100, ANALYSIS_SR), rtol=0, atol=1e-6)
+
+
+def test_same_rate_is_passed_through():
+    sig = synthetic_speech(0.5, ANALYSIS_SR)
+    assert resample(sig, ANALYSIS_SR, ANALYSIS_SR) is sig
+    assert resampled_length(len(sig), ANALYSIS_SR, ANALYSIS_SR) == len(sig)
@@ -0,0 +1,47 @@
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from core.audio import RingBuffer
+
+
+def test_reads_back_what_was_written_across_the_wrap():
+    rng = np.random.default_rng(0)
+    ring = RingBuffer(1000, channels=2)
+    signal = rng.standard_normal((20000, 2)).astype(np.float32)
+    written = read = 0
+    out = []
+    while read < len(signal):
+        written += ring.write(signal[written:written + int(rng.integers(1, 700))])
+        block = np.empty((int(rng.integers(1, 700)), 2), dtype=np.float32)
+        n = ring.read(block)
+        out.append(block[:n])
+        read += n
+        assert ring.readable() == written - read and ring.writable() == ring.capacity - ring.readable()
+    assert_array_equal(np.concatenate(out), signal)
+
+
+def test_full_and_empty_ring_copy_what_they_can():
+    ring = RingBuffer(8)
+    assert ring.write(np.arange(12, dtype=np.float32)[:, None]) == 8
+    assert ring.write(np.ones((1, 1), dtype=np.float32)) == 0
+    out = np.full((10, 1), -1, dtype=np.float32)
+    assert ring.read(out) == 8
+    assert_array_equal(out[:8, 0], np.arange(8))
+    assert_array_equal(out[8:, 0], [-1, -1])
+    assert ring.read(out) == 0
+
+
+def test_write_regions_fill_in_place():
+    ring = RingBuffer(8)
+    ring.write(np.zeros((6, 1), dtype=np.float32))
+    ring.read(np.empty((5, 1), dtype=np.float32))
+    first, second = ring.writeRegions()
+    assert (len(first), len(second)) == (2, 5)
+    first[:, 0] = [1, 2]
+    second[:, 0] = [3, 4, 5, 6, 7]
+    ring.commitWrite(7)
+    out = np.empty((8, 1), dtype=np.float32)
+    assert ring.read(out) == 8
+    assert_array_equal(out[:, 0], [0, 1, 2, 3, 4, 5, 6, 7])
+    first, second = ring.writeRegions(3)
+    assert len(first) + len(second) == 3
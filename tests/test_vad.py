@@ -0,0 +1,62 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_array_equal
+
+from core.analysis import (
+    SILENCE_LABEL, build_feature_matrix, frame_params, frame_signal, is_speech, load_models, pipeline,
+    speech_frames, synthetic_speech,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SR = 22050
+
+
+def _frames(sig):
+    return frame_signal(np.asarray(sig, dtype=np.float32), *frame_params(SR))
+
+
+def test_speech_frames_reject_dead_air():
+    rng = np.random.default_rng(0)
+    t = np.arange(SR) / SR
+    assert speech_frames(_frames(synthetic_speech(1.0, SR)), SR).mean() > 0.3  # syllables and gaps
+    assert not speech_frames(_frames(0.3 * np.sin(2 * np.pi * 50 * t)), SR).any()  # loud mains hum
+    assert not speech_frames(_frames(0.3 * rng.uniform(-1, 1, SR)), SR).any()  # loud hiss
+    assert not speech_frames(_frames(0.002 * rng.standard_normal(SR)), SR).any()  # quiet room
+    assert not speech_frames(_frames(np.zeros(SR)), SR).any()
+
+
+def test_gated_windows_only_lose_their_pitch():
+    sig = synthetic_speech(30.0, SR, speech_ratio=0.4)
+    starts, plain = build_feature_matrix(sig, SR, SR, SR // 2)
+    gated_starts, gated = build_feature_matrix(sig, SR, SR, SR // 2, vad=True)
+    assert_array_equal(gated_starts, starts)
+    speech = is_speech(gated)
+    assert 0 < speech.sum() < speech.size
+    assert_array_equal(gated[speech], plain[speech])
+    assert np.isnan(gated[~speech, 0:4]).all()
+    assert_array_equal(gated[~speech, 4:], plain[~speech, 4:])
+    # the dead air (the last 6 s of every 10) is what gets gated
+    centres = (starts + SR // 2) / SR
+    assert not speech[(centres % 10.0 > 5.0) & (centres % 10.0 < 9.5)].any()
+
+
+@pytest.fixture(scope='module')
+def knn_models():
+    return load_models(os.path.join(ROOT, 'res', 'nlm'), knn=True, mlp=False, mlp_numpy=False)
+
+
+def test_silent_windows_are_labelled_silence_and_skip_the_model(tmp_path, knn_models):
+    path = str(tmp_path / 'pauses.wav')
+    sf.write(path, synthetic_speech(30.0, SR, speech_ratio=0.4), SR)
+    gated = pipeline.analyze_file(path, 'knn', knn_models, streaming=False, vad=True)
+    plain = pipeline.analyze_file(path, 'knn', knn_models, streaming=False, vad=False)
+    assert gated['ok'] and plain['ok']
+    labels = [e['label'] for e in gated['timeline']]
+    assert SILENCE_LABEL in labels and SILENCE_LABEL not in [e['label'] for e in plain['timeline']]
+    for g, p in zip(gated['timeline'], plain['timeline']):
+        if g['label'] != SILENCE_LABEL:
+            assert g == p
+    assert SILENCE_LABEL in gated['summary']
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+import soundfile as sf
+from numpy.testing import assert_array_equal
+
+from core.analysis import WavMap, open_audio, synthetic_speech
+
+SR = 16000
+
+
+def _write(tmp_path, subtype, channels=2, frames=SR + 123):
+    sig = synthetic_speech(frames / SR, SR)[:frames]
+    data = np.stack([sig, -0.5 * sig][:channels], axis=1)
+    path = str(tmp_path / f'{subtype}_{channels}.wav')
+    sf.write(path, data, SR, subtype=subtype)
+    return path
+
+
+@pytest.mark.parametrize('channels', [1, 2])
+@pytest.mark.parametrize('subtype', ['PCM_U8', 'PCM_16', 'PCM_32', 'FLOAT', 'DOUBLE'])
+def test_reads_what_soundfile_reads(tmp_path, subtype, channels):
+    path = _write(tmp_path, subtype, channels)
+    expected, sr = sf.read(path, dtype='float32', always_2d=True)
+    with WavMap(path) as wav:
+        assert (wav.samplerate, wav.channels, wav.frames) == (sr, channels, len(expected))
+        assert_array_equal(wav.read(always_2d=True), expected)
+        wav.seek(1000)
+        assert_array_equal(np.concatenate(list(wav.blocks(777, always_2d=True))), expected[1000:])
+        wav.seek(10)
+        out = np.zeros((500, channels), dtype=np.float32)
+        assert_array_equal(wav.read(out=out), expected[10:510])
+        assert wav.tell() == 510
+
+
+def test_envelope_brackets_the_mono_signal(tmp_path):
+    path = _write(tmp_path, 'PCM_16')
+    mono = sf.read(path, dtype='float32')[0].mean(axis=1)
+    with WavMap(path) as wav:
+        envelope = wav.envelope(200)
+    assert envelope.size == 200
+    assert envelope[0::2].min() == pytest.approx(mono.min())
+    assert envelope[1::2].max() == pytest.approx(mono.max())
+    assert np.all(envelope[0::2] <= envelope[1::2])
+
+
+def test_24_bit_and_compressed_files_fall_back_to_soundfile(tmp_path):
+    path = _write(tmp_path, 'PCM_24')
+    with pytest.raises(ValueError):
+        WavMap(path)
+    expected = sf.read(path, dtype='float32', always_2d=True)[0]
+    with open_audio(path) as f:
+        assert isinstance(f, sf.SoundFile)
+        assert_array_equal(f.read(dtype='float32', always_2d=True), expected)
+
+    flac = str(tmp_path / 'speech.flac')
+    sf.write(flac, expected, SR)
+    with open_audio(flac) as f:
+        assert isinstance(f, sf.SoundFile)
+    with open_audio(_write(tmp_path, 'PCM_16')) as f:
+        assert isinstance(f, WavMap)
@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from core.analysis import synthetic_speech, yin_benchmark
+
+librosa = pytest.importorskip('librosa')
+
+SR = 22050
+TOLERANCE = 1e-3  # yin_benchmark's default: the 'agree' column of `python -m wavemood bench yin`
+
+
+@pytest.mark.parametrize('frame_sec', [0.06, 0.6])  # the command's default --frame-sec
+@pytest.mark.parametrize('seed', [0, 1])
+def test_yin_agrees_with_librosa_on_speechlike_audio(frame_sec, seed):
+    r = yin_benchmark(synthetic_speech(10.0, SR, seed=seed), SR, int(frame_sec * SR), repeats=1, tolerance=TOLERANCE)
+    assert r['librosa_s'] is not None
+    assert r['agreement'] >= 0.999
+
+
+@pytest.mark.parametrize('f0', [82.0, 196.0, 440.0, 1000.0])
+def test_yin_matches_librosa_on_tones(f0):
+    t = np.arange(2 * SR) / SR
+    sig = 0.5 * np.sin(2 * np.pi * f0 * t) + 0.2 * np.sin(2 * np.pi * 2 * f0 * t)
+    r = yin_benchmark(sig, SR, int(0.06 * SR), repeats=1, tolerance=TOLERANCE)
+    assert r['agreement'] == 1.0
+    assert r['max_rel_err'] <= TOLERANCE
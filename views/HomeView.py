@@ -5,10 +5,7 @@ import wave
 from time import time
 from typing import List, Optional
 
-import joblib
 import numpy as np
-import sounddevice as sd
-import soundfile as sf
 from PyQt6.QtCore import QTimer, Qt, pyqtSignal, pyqtSlot, QRectF
 from PyQt6.QtWidgets import QHBoxLayout, QFrame, QSizePolicy, QFileDialog, QVBoxLayout, QSpacerItem, QWidget, \
     QProgressBar, QCheckBox, QMessageBox
@@ -16,6 +13,12 @@ from PyQt6.QtGui import QFont, QPainter, QPen, QBrush, QColor, QLinearGradient
 
 import pyqtgraph as pg
 
+from core.analysis import (
+    ANALYSIS_SR, AUDIO_CACHE_MAX_BYTES, DEFAULT_BATCH_SIZE, MODEL_CHOICES, MODELS_DIR, SILENCE_LABEL,
+    STREAMING_THRESHOLD_SEC, FeatureCache, LiveAnalyzer, ModelRegistry, WavMap, analyze_file, analyze_models,
+    audioCache, load_audio, low_power_choice, modelRegistry
+)
+from core.audio import AudioEngine, CallbackStats, audioEngine
 from enums import TopBarMode, Model
 from res import AppTheme
 from vvecon.qt.contrib.styles.Button import primaryButton, secondaryButton
@@ -47,6 +50,10 @@ class WaveformWidget(pg.PlotWidget):
     # Signal to be emitted when waveform data is ready
     # audio_data (1d ndarray), time_points (1d ndarray), duration (float), sample_rate (int), success (bool), error_msg (str)
     waveformLoaded = pyqtSignal(object, object, float, int, bool, str)
+    # Emitted with the time (seconds) under a left click on the waveform
+    seekRequested = pyqtSignal(float)
+    # longer WAV files are drawn as a min/max envelope of this many points
+    max_plot_points = 200000
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -89,8 +96,20 @@ class WaveformWidget(pg.PlotWidget):
         self.addItem(self.position_line)
         self.position_line.hide()
 
+        # Emotion segments shaded behind the waveform as analysis results arrive
+        self.analysis_regions = []
+
         # Connect signal to slot for UI updates
         self.waveformLoaded.connect(self._update_waveform_ui)
+        self.scene().sigMouseClicked.connect(self._onSceneClicked)
+
+    def _onSceneClicked(self, event):
+        """Left click on the plot: ask to seek playback to that time (drags still pan/zoom)."""
+        if event.button() != Qt.MouseButton.LeftButton or not self.duration:
+            return
+        x = self.getPlotItem().vb.mapSceneToView(event.scenePos()).x()
+        if 0 <= x <= self.duration:
+            self.seekRequested.emit(float(x))
 
     def load_waveform(self, file_path):
         """
@@ -98,14 +117,20 @@ class WaveformWidget(pg.PlotWidget):
         """
         # NOTE: this method runs in a worker thread. Do not touch UI here.
         try:
-            # Read using soundfile (works for wav/mp3/flac via libsndfile)
-            data, sr = sf.read(file_path, always_2d=True)
-            # Convert to mono if needed
-            if data.ndim > 1 and data.shape[1] > 1:
-                y = np.mean(data, axis=1)
+            try:
+                wav = WavMap(file_path)
+            except ValueError:
+                wav = None
+            if wav is not None and wav.frames > self.max_plot_points:
+                # long WAV recordings: a min/max envelope read through the memory map, nothing decoded
+                y = wav.envelope(self.max_plot_points)
+                sr = wav.samplerate
+                duration = wav.frames / sr
             else:
-                y = data.flatten()
-            duration = len(y) / sr
+                # mono float32 at the file's rate from the shared decode cache (read-only, reused by
+                # playback and analysis)
+                y, sr = load_audio(file_path, None)
+                duration = len(y) / sr
             # Create x-axis time points
             time_points = np.linspace(0, duration, len(y))
             # Emit result to the main thread (slot will update UI)
@@ -139,6 +164,7 @@ class WaveformWidget(pg.PlotWidget):
         # Clear previous plot if exists
         if self.waveform_plot is not None:
             self.removeItem(self.waveform_plot)
+        self.clear_analysis_segments()
 
         # Create the waveform plot
         self.waveform_plot = self.plot(
@@ -169,6 +195,25 @@ class WaveformWidget(pg.PlotWidget):
         """Called when waveform is successfully loaded and rendered"""
         pass
 
+    def add_analysis_segment(self, start_sec, end_sec, color):
+        """Shade [start_sec, end_sec] behind the waveform in an emotion colour"""
+        if end_sec <= start_sec:
+            return
+        brush = QColor(color)
+        brush.setAlpha(60)
+        region = pg.LinearRegionItem(
+            values=(start_sec, end_sec), brush=brush, pen=pg.mkPen(None), movable=False
+        )
+        region.setZValue(-10)
+        self.addItem(region)
+        self.analysis_regions.append(region)
+
+    def clear_analysis_segments(self):
+        """Remove all emotion segments added by add_analysis_segment"""
+        for region in self.analysis_regions:
+            self.removeItem(region)
+        self.analysis_regions.clear()
+
     def update_position(self, position_sec):
         """Update the position of the playback indicator line"""
         if 0 <= position_sec <= self.duration:
@@ -264,8 +309,30 @@ class VuMeterWidget(QWidget):
             painter.end()
 
 class HomeView(View):
+    # Emitted from the recording thread with {'label', 'summary', 'final'} while live analysis runs
+    liveAnalysisUpdated = pyqtSignal(object)
+    # Emitted from the analysis worker with (job id, partial result), throttled by analyze_file
+    analysisProgress = pyqtSignal(int, object)
+    # Emitted from the model registry (any thread) with (model choice, ModelRegistry state)
+    modelStateChanged = pyqtSignal(str, str)
+    # Emitted from the audio engine thread with (AudioEngine state, info) on every transport change
+    audioStateChanged = pyqtSignal(str, object)
+
     _sampleRate = 22050
     _frameRate = 44100
+    _analysisBatchSize = DEFAULT_BATCH_SIZE
+    _streamingThresholdSec = STREAMING_THRESHOLD_SEC  # analyse longer files block by block
+    _analysisSampleRate = ANALYSIS_SR  # files are resampled to this rate once, None analyses at the native rate
+    _analysisVad = True  # skip pitch and the model on windows without speech
+    _featureCache: Optional[FeatureCache] = None
+    _featureCacheMaxBytes = FeatureCache.DEFAULT_MAX_BYTES  # 0 disables the feature cache
+    _audioCacheMaxBytes = AUDIO_CACHE_MAX_BYTES  # decoded audio shared by the waveform and analysis
+    _analysisJobKey = 'HomeView.analysis'  # a new analysis supersedes the running one
+    _modelTrimIntervalMs = 30000  # how often to check for memory pressure
+    # core.analysis model choice for each model button
+    _modelChoices = {Model.MLP: 'mlp', Model.MLP_NUMPY: 'mlp_numpy', Model.KNN: 'knn'}
+    # models scored together by "Compare MLP and KNN"; the NumPy MLP stands in without TensorFlow
+    _compareModelChoices = ('mlp' if _tensorflow_available else 'mlp_numpy', 'knn')
     modelButtons: List[Button] = []
 
     # Predefined emotion list with emoji, pretty names, and color for progress bar
@@ -333,7 +400,7 @@ class HomeView(View):
         for model in Model:
             btn = Button(
                 model.value,
-                icon=ui.icon(AppTheme.images.getImage(model.value.lower())),
+                icon=ui.icon(AppTheme.images.getImage(model.name.lower())),
                 style=Qt.ToolButtonStyle.ToolButtonTextBesideIcon,
                 iconSize=ui.size(30, 30)
             )
@@ -670,8 +737,15 @@ class HomeView(View):
         self.vuWidget = VuMeterWidget(parent=self.vuFrame, num_bars=2)
         self.vuWidget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
 
+        # real-time callback health of the last playback / recording (CallbackStats)
+        self.audioStatsLabel = Label('', parent=self.vuFrame)
+        self.audioStatsLabel.setStyleSheet(label.update(
+            backgroundColor='transparent', color='#8A8F98', fontSize=11, fontWeight='500'
+        ).qss)
+
         self.vuLayout.addWidget(self.vuLabel)
         self.vuLayout.addWidget(self.vuWidget, stretch=1)
+        self.vuLayout.addWidget(self.audioStatsLabel)
         self.body.addWidget(self.vuFrame)
         self.body.addSpacing(ui.dp(20))
         # keep main stretch below
@@ -728,8 +802,6 @@ class HomeView(View):
 
         # Recording state
         self._recording = False
-        self._audioQueue = queue.Queue()
-        self._recordingThread = None
         self._audioData = None
 
         # lock to protect _audioData access between threads
@@ -755,22 +827,18 @@ class HomeView(View):
 
         # --- Playback state (initialize to avoid AttributeError) ---
         self._isPlaying = False
-        self._playbackThread = None
-        self._playbackStream = None
-        self._playbackPosition = 0.0
         self._playbackUpdateTimer = QTimer(self)
         self._playbackUpdateTimer.setInterval(50)  # 50ms updates
         self._playbackUpdateTimer.timeout.connect(self._updatePlaybackPosition)
 
-        # playback frame index and lock so we can resume/track progress safely
-        self._playbackFrameIndex = 0
-        self._playbackFrameLock = threading.Lock()
         # track current audio file path
         self._currentAudioFile = None
+        # transport runs in the shared AudioEngine; its state changes come back through a signal
+        self.audioStateChanged.connect(self._onAudioStateChanged)
+        audioEngine.addListener(self.audioStateChanged.emit)
+        self.waveformWidget.seekRequested.connect(self._onSeekRequested)
 
-        # VU meter state: thread-safe latest level (0..1)
-        self._vu_lock = threading.Lock()
-        self._vu_level = 0.0
+        # VU meter: the timer reads the engine's level (written by its output callback)
         self._vuTimer = QTimer(self)
         self._vuTimer.setInterval(50)  # 20 FPS
         self._vuTimer.timeout.connect(self._updateVuMeter)
@@ -799,8 +867,29 @@ class HomeView(View):
             }
         """)
 
+        self.liveAnalysisCheck = QCheckBox("Live analysis while recording")
+        self.liveAnalysisCheck.setChecked(False)
+        self.liveAnalysisCheck.setStyleSheet(self.autoSendCheck.styleSheet())
+
+        self.lowPowerCheck = QCheckBox("Low-memory mode (quantized models)")
+        self.lowPowerCheck.setToolTip("Smaller float16/int8 model weights; same speed as the full models")
+        self.lowPowerCheck.setChecked(False)
+        self.lowPowerCheck.setStyleSheet(self.autoSendCheck.styleSheet())
+
+        self.adaptiveCheck = QCheckBox("Adaptive resolution (faster on long files)")
+        self.adaptiveCheck.setChecked(False)
+        self.adaptiveCheck.setStyleSheet(self.autoSendCheck.styleSheet())
+
+        self.compareCheck = QCheckBox("Compare MLP and KNN (one pass, averaged)")
+        self.compareCheck.setChecked(False)
+        self.compareCheck.setStyleSheet(self.autoSendCheck.styleSheet())
+
         self.config.addWidget(self.comPortInput)
         self.config.addWidget(self.autoSendCheck)
+        self.config.addWidget(self.liveAnalysisCheck)
+        self.config.addWidget(self.lowPowerCheck)
+        self.config.addWidget(self.adaptiveCheck)
+        self.config.addWidget(self.compareCheck)
 
         # Add "Send to Arduino" button to results section
         self.sendArduinoBtn = Button(
@@ -817,12 +906,36 @@ class HomeView(View):
         # Track last predicted emotion for sending
         self._last_predicted_emotion = None
 
+        # Live analysis state (model choice is set when a live recording starts)
+        self._liveModelChoice = None
+        self._liveLowPower = False
+        self._liveSentEmotion = None
+        self._liveBlocks: Optional[queue.Queue] = None  # the live worker's queue; None ends it
+        self.liveAnalysisUpdated.connect(self._onLiveAnalysisUpdated)
+
+        # Progressive file analysis state; updates from older jobs are ignored
+        self._analysisJob = 0
+        self._analysisSegment = None
+        self.analysisProgress.connect(self._onAnalysisProgress)
+
+        # Shared models: warm up in the background once the window is shown, unload when memory runs low
+        modelRegistry.configure(MODELS_DIR, mlp=_tensorflow_available)
+        audioCache.configure(self._audioCacheMaxBytes)
+        self.modelStateChanged.connect(self._onModelStateChanged)
+        modelRegistry.addListener(self.modelStateChanged.emit)
+        self._modelTrimTimer = QTimer(self)
+        self._modelTrimTimer.setInterval(self._modelTrimIntervalMs)
+        self._modelTrimTimer.timeout.connect(self._trimModels)
+        self._modelTrimTimer.start()
+        QTimer.singleShot(0, self._preloadModels)
+
     # --- File selection ---
     def _onSelectFile(self):
         filePath, _ = QFileDialog.getOpenFileName(
             self, "Select Audio File", "", "Audio Files (*.wav *.mp3 *.flac)"
         )
         if filePath:
+            self._cancelAnalysis()
             self.selectedFileLabel.setText(filePath)
             self.playbackStatus.setText("Loading waveform...")
 
@@ -845,54 +958,40 @@ class HomeView(View):
         else:
             self.playbackStatus.setText("Error loading waveform")
 
-    # --- Recording logic ---
+    # --- Recording logic (AudioEngine -> audioStateChanged -> main thread) ---
     def _onStartRecording(self):
         self._recording = True
-        # clear queue and buffer safely
         with self._record_lock:
             # clear any previous data
             self._audioData = []
-        # clear underlying queue if needed
-        try:
-            while True:
-                self._audioQueue.get_nowait()
-        except queue.Empty:
-            pass
+        # live analysis uses the selected model (KNN when the MLP is unavailable)
+        self._liveModelChoice = None
+        self._liveSentEmotion = None
+        live_blocks = None
+        if self.liveAnalysisCheck.isChecked():
+            self._liveModelChoice = self._activeModelChoice()
+            self._liveLowPower = self.lowPowerCheck.isChecked()
+            self._init_emotion_rows()
+            # one pool worker analyses this recording's blocks, off the engine thread
+            live_blocks = queue.Queue()
+            threadPool.start(self._runLiveAnalysis, live_blocks)
+        self._liveBlocks = live_blocks
         self.recordBtn.setEnabled(False)
         self.stopBtn.setEnabled(True)
         self.recordingStatus.setText('Recording...')
         self.recordingGif.show()
         self.recordingGif.start()
-        self._recordingThread = threading.Thread(target=self._recordAudio, daemon=True)
-        self._recordingThread.start()
+        audioEngine.record(self._sampleRate, sink=self._recordingSink(live_blocks))
 
     def _onStopRecording(self):
-        # signal recording thread to stop
+        # the engine hands over the last blocks, then reports RECORDED and the file is saved
         self._recording = False
         self.recordBtn.setEnabled(True)
         self.stopBtn.setEnabled(False)
         self.recordingStatus.setText('Recording stopped')
         self.recordingGif.stop()
         self.recordingGif.hide()
-
-        # wait briefly for recording thread to consume remaining frames
-        if self._recordingThread and self._recordingThread.is_alive():
-            # join with timeout to avoid blocking UI indefinitely
-            self._recordingThread.join(timeout=3.0)
-            # after join attempt, make a final pass to drain queue into buffer
-            try:
-                while True:
-                    chunk = self._audioQueue.get_nowait()
-                    with self._record_lock:
-                        if self._audioData is None:
-                            self._audioData = []
-                        self._audioData.append(chunk)
-            except queue.Empty:
-                pass
-        # next: save (runs on main thread)
-        self._saveRecording()
-        # clear thread reference
-        self._recordingThread = None
+        audioEngine.stopRecording()
 
     def _toggleRedCircleGlow(self):
         # Animate glow by changing box-shadow intensity, not opacity
@@ -918,48 +1017,83 @@ class HomeView(View):
             """)
         self._redGlow = not self._redGlow
 
-    def _recordAudio(self):
-        def callback(indata, frames, time, status):
-            # protect callback from exceptions escaping into sounddevice internals
-            if status:
-                # non-fatal status information; keep as debug if needed
-                # print("Record status:", status)
-                pass
-            try:
-                if self._recording:
-                    # copy to own memory
-                    self._audioQueue.put(indata.copy(), block=False)
-            except queue.Full:
-                # queue full: drop frame
-                pass
-            except Exception:
-                # avoid raising in callback
-                pass
-        # run input stream in this thread. use float32 dtype for predictable behaviour.
+    def _recordingSink(self, live_blocks: Optional[queue.Queue]):
+        """Collects one recording's blocks (engine thread) and forwards them to its live analysis worker."""
+        chunks = []
+
+        def sink(block):
+            if block is None:
+                with self._record_lock:
+                    self._audioData = chunks
+            else:
+                chunks.append(block)
+            if live_blocks is not None:
+                live_blocks.put(block)
+
+        return sink
+
+    # --- Live analysis (pool worker -> liveAnalysisUpdated -> main thread) ---
+    def _runLiveAnalysis(self, blocks: queue.Queue):
+        """Feed one recording's blocks to a LiveAnalyzer until the engine ends it with None (pool worker)."""
+        live = self._createLiveAnalyzer()
+        while True:
+            block = blocks.get()
+            if block is None:
+                break
+            if live is not None:
+                self._feedLiveAnalyzer(live, block)
+        if live is not None:
+            self._feedLiveAnalyzer(live, None, final=True)
+
+    def _createLiveAnalyzer(self) -> Optional[LiveAnalyzer]:
+        """LiveAnalyzer for the current recording, or None when live analysis is off or models fail to load."""
+        if not self._liveModelChoice:
+            return None
+        model_choice = self._resolveModelChoice(self._liveModelChoice, self._liveLowPower)
+        ok, err = self._ensure_models_loaded(model_choice)
+        if not ok:
+            logger.error(f"Live analysis disabled, model load error: {err}")
+            return None
+        return LiveAnalyzer(
+            self._sampleRate, model_choice, self._loaded_models(model_choice), batch_size=self._analysisBatchSize,
+            vad=self._analysisVad
+        )
+
+    def _feedLiveAnalyzer(self, live: LiveAnalyzer, block, final: bool = False):
+        """Analyse the windows completed by `block` (runs in the live analysis worker)."""
         try:
-            with sd.InputStream(samplerate=self._sampleRate, channels=1, dtype='float32', callback=callback):
-                while self._recording:
-                    try:
-                        data = self._audioQueue.get(timeout=0.1)
-                        with self._record_lock:
-                            if self._audioData is None:
-                                self._audioData = []
-                            self._audioData.append(data)
-                    except queue.Empty:
-                        continue
-                # after stop requested, drain any remaining queued frames
-                try:
-                    while True:
-                        data = self._audioQueue.get_nowait()
-                        with self._record_lock:
-                            if self._audioData is None:
-                                self._audioData = []
-                            self._audioData.append(data)
-                except queue.Empty:
-                    pass
+            entries = live.finish() if final else live.push(block)
+        except Exception as e:
+            logger.error(f"Live analysis error: {e}")
+            return
+        if entries or final:
+            self.liveAnalysisUpdated.emit({
+                'label': entries[-1]['label'] if entries else None,
+                'summary': live.summary(),
+                'final': final,
+            })
+
+    @pyqtSlot(object)
+    def _onLiveAnalysisUpdated(self, update):
+        """Show live results; optionally forward emotion changes to the Arduino (main thread)."""
+        try:
+            summary = update.get('summary') or {}
+            self._update_emotion_rows(summary)
+            if update.get('label') and not update.get('final'):
+                self.recordingStatus.setText(f"Recording... live: {update['label']}")
+            # as in _onAnalysisComplete: dead air (SILENCE_LABEL) is neither the top emotion nor sent
+            emotions = {lbl: info for lbl, info in summary.items() if lbl != SILENCE_LABEL}
+            if emotions:
+                top_label, top_info = max(emotions.items(), key=lambda kv: kv[1]['duration_s'])
+                self._last_predicted_emotion = top_label
+                if update.get('final'):
+                    self.playbackStatus.setText(f"Top emotion: {top_label} ({top_info['pct']}%)")
+            label = update.get('label')
+            if label and label != SILENCE_LABEL and label != self._liveSentEmotion and self.autoSendCheck.isChecked():
+                self._liveSentEmotion = label
+                self._send_emotion_to_arduino(label)
         except Exception as e:
-            # record errors should not crash the app; update status on main thread if possible
-            print("InputStream error:", e)
+            logger.error(f"Error in _onLiveAnalysisUpdated: {e}")
 
     def _saveRecording(self):
         # Collect and write recorded buffers safely
@@ -992,6 +1126,7 @@ class HomeView(View):
             return
 
         # update UI
+        self._cancelAnalysis()
         self.selectedFileLabel.setText(filepath)
         self.recordingStatus.setText(f"Saved: {os.path.basename(filepath)}")
 
@@ -1004,7 +1139,7 @@ class HomeView(View):
             callback=lambda success: self._onWaveformLoaded(success, filepath)
         )
 
-    # --- Audio Playback Methods ---
+    # --- Audio Playback Methods (AudioEngine -> audioStateChanged -> main thread) ---
     def _togglePlayPause(self):
         if not self.selectedFileLabel.text() or self.selectedFileLabel.text() == 'No file selected':
             self.playbackStatus.setText('Please select an audio file first')
@@ -1016,496 +1151,233 @@ class HomeView(View):
             self._startPlayback()
 
     def _startPlayback(self):
-        self._isPlaying = True
-        self.playPauseBtn.setText('Pause')
-        self.playPauseBtn.setIcon(Icons.Filled.Rounded.pause.update(color='#0659ad'))
-        self.audioStopBtn.setEnabled(True)
-
         # Get file path from selectedFileLabel (prefer _currentAudioFile)
         file_path = self._currentAudioFile or self.selectedFileLabel.text()
         if not file_path or file_path == 'No file selected':
             self.playbackStatus.setText('Please select an audio file first')
-            self._isPlaying = False
-            self.playPauseBtn.setText('Play')
             return
 
-        # Start playback in a separate thread, resume from stored frame index
-        start_frame = 0
-        with self._playbackFrameLock:
-            start_frame = int(self._playbackFrameIndex or 0)
-        self._playbackThread = threading.Thread(target=self._playAudio, args=(file_path, start_frame), daemon=True)
-        self._playbackThread.start()
+        self._isPlaying = True
+        self.playPauseBtn.setText('Pause')
+        self.playPauseBtn.setIcon(Icons.Filled.Rounded.pause.update(color='#0659ad'))
+        self.audioStopBtn.setEnabled(True)
+
+        # resumes if the engine has this file paused, otherwise plays it from the start
+        self._currentAudioFile = file_path
+        audioEngine.play(file_path)
 
         # Start updating position indicator
         self._playbackUpdateTimer.start()
 
         # start VU UI timer (main thread) so bars update while playing
-        try:
-            self._vuTimer.start()
-        except Exception:
-            pass
+        self._vuTimer.start()
 
         self.playbackStatus.setText('Playing...')
 
-    def _pausePlayback(self):
-        # set playing flag false so callback will stop advancing
+    def _resetPlaybackControls(self, status: str):
         self._isPlaying = False
         self.playPauseBtn.setText('Play')
         self.playPauseBtn.setIcon(Icons.Filled.Rounded.play_arrow.update(color='#1e6e0f'))
-        self.playbackStatus.setText('Paused')
-
+        self.playbackStatus.setText(status)
         # Stop updating position indicator
         self._playbackUpdateTimer.stop()
-
         # stop VU updates and clear display
-        try:
-            self._vuTimer.stop()
-            with self._vu_lock:
-                self._vu_level = 0.0
-            if hasattr(self, 'vuWidget') and self.vuWidget:
-                self.vuWidget.update_levels([0.0] * self.vuWidget.num_bars)
-        except Exception:
-            pass
+        self._vuTimer.stop()
+        if hasattr(self, 'vuWidget') and self.vuWidget:
+            self.vuWidget.update_levels([0.0] * self.vuWidget.num_bars)
 
-        # If there's an active stream, stop+close it and join the thread.
-        # We keep _playbackFrameIndex so resume will continue from this point.
-        if self._playbackStream:
-            try:
-                self._playbackStream.stop()
-            except Exception:
-                pass
-            try:
-                self._playbackStream.close()
-            except Exception:
-                pass
-            self._playbackStream = None
-
-        # join the playback thread (non-blocking UI: short timeout)
-        if self._playbackThread and self._playbackThread.is_alive():
-            self._playbackThread.join(timeout=0.5)
-            if self._playbackThread.is_alive():
-                # leave it; it should exit soon
-                pass
-        self._playbackThread = None
+    def _pausePlayback(self):
+        # the engine keeps the file and position, so play resumes from this frame
+        self._resetPlaybackControls('Paused')
+        audioEngine.pause()
 
     def _stopPlayback(self):
-        self._isPlaying = False
-        self.playPauseBtn.setText('Play')
-        self.playPauseBtn.setIcon(Icons.Filled.Rounded.play_arrow.update(color='#1e6e0f'))
+        self._resetPlaybackControls('Stopped')
         self.audioStopBtn.setEnabled(False)
-        self.playbackStatus.setText('Stopped')
-
-        # Reset playback position and stop updating
-        self._playbackPosition = 0
-        self._playbackUpdateTimer.stop()
+        audioEngine.stop()
         # reset waveform cursor to start
         self.waveformWidget.update_position(0)
 
-        # stop and reset VU meter
-        try:
-            self._vuTimer.stop()
-            with self._vu_lock:
-                self._vu_level = 0.0
-            if hasattr(self, 'vuWidget') and self.vuWidget:
-                self.vuWidget.update_levels([0.0] * self.vuWidget.num_bars)
-        except Exception:
-            pass
-
-        # Stop and close the stream if it exists and reset frame index
-        if self._playbackStream:
-            try:
-                self._playbackStream.stop()
-            except Exception:
-                pass
-            try:
-                self._playbackStream.close()
-            except Exception:
-                pass
-            self._playbackStream = None
-
-        with self._playbackFrameLock:
-            # reset frame index so next play starts from zero
-            self._playbackFrameIndex = 0
-
-        # join the playback thread
-        if self._playbackThread and self._playbackThread.is_alive():
-            self._playbackThread.join(timeout=0.5)
-            self._playbackThread = None
-
-    def _playAudio(self, file_path, start_frame: int = 0):
-        try:
-            # Read audio file
-            import soundfile as sf
-            data, samplerate = sf.read(file_path, always_2d=True)
-            # store current audio file
-            self._currentAudioFile = file_path
-
-            # Reset playback position
-            # set initial frame index from argument
-            with self._playbackFrameLock:
-                frame_index = int(start_frame or 0)
-                self._playbackFrameIndex = frame_index
-            self._playbackPosition = frame_index / samplerate if samplerate else 0.0
-
-            # Define callback function
-            # Ensure data is 2D (frames, channels)
-            if data.ndim == 1:
-                data = np.expand_dims(data, axis=1)
-
-            def callback(outdata, frames, time, status):
-                nonlocal frame_index
-                if not self._isPlaying:
-                    outdata.fill(0)
-                    return
-
-                remaining = data.shape[0] - frame_index
-                if remaining <= 0:
-                    outdata.fill(0)
-                    # reached end - schedule main-thread stop
-                    QTimer.singleShot(0, self._autoStopPlayback)
-                    return
-
-                to_copy = min(frames, remaining)
-                current_data = data[frame_index:frame_index + to_copy]
-                outdata[:to_copy] = current_data
-                if to_copy < frames:
-                    outdata[to_copy:].fill(0)
-
-                # compute a simple RMS-based level for VU (thread-safe write)
-                try:
-                    flat = current_data.flatten().astype(np.float32)
-                    if flat.size:
-                        rms = np.sqrt(np.mean(flat * flat))
-                        # map rms -> normalized 0..1
-                        # use a simple linear gain mapping to be robust for various levels
-                        norm = max(0.0, min(1.0, rms * 20.0))
-                    else:
-                        norm = 0.0
-                except Exception:
-                    norm = 0.0
-                with self._vu_lock:
-                    self._vu_level = float(norm)
-
-                # update shared frame index and playback position
-                frame_index += to_copy
-                with self._playbackFrameLock:
-                    self._playbackFrameIndex = frame_index
-                # update approximate playback position (seconds)
-                self._playbackPosition = frame_index / samplerate if samplerate else 0.0
-
-            # Start output stream
-            self._playbackStream = sd.OutputStream(
-                samplerate=samplerate,
-                channels=data.shape[1],
-                dtype='float32',
-                callback=callback
-            )
-            # start stream and set playing flag (in case resumed)
-            self._playbackStream.start()
-
-            # VU timer is managed from main thread (_startPlayback/_pause/_stop)
-
-            # keep running while stream is active and playing flag may be toggled by pause/stop
-            # sounddevice handles the callback; return when stream is stopped/closed
-            while self._playbackStream and self._playbackStream.active:
-                # if not playing, sleep briefly; callback outputs silence
-                if not self._isPlaying:
-                    sd.sleep(50)
-                else:
-                    sd.sleep(20)
-            # ensure stream closed
-            try:
-                if self._playbackStream:
-                    self._playbackStream.stop()
-            except Exception:
-                pass
-            try:
-                if self._playbackStream:
-                    self._playbackStream.close()
-            except Exception:
-                pass
-            self._playbackStream = None
-
-            # VU timer will be stopped by main-thread stop/pause handlers
-
-        except Exception as e:
-            # Ensure UI updated on error
-            QTimer.singleShot(0, lambda: self.playbackStatus.setText(f"Error playing file: {str(e)}"))
-            self._isPlaying = False
-            QTimer.singleShot(0, lambda: self.playPauseBtn.setText('Play'))
-            QTimer.singleShot(0, lambda: self.playPauseBtn.setIcon(Icons.Filled.Rounded.play_arrow.update(color='#1e6e0f')))
-            QTimer.singleShot(0, lambda: self.audioStopBtn.setEnabled(False))
-            self._playbackUpdateTimer.stop()
-            # ensure VU timer stopped on error
-            QTimer.singleShot(0, lambda: self._vuTimer.stop())
-
     def _autoStopPlayback(self):
         """Called when playback reaches the end of the file"""
-        # Stop playing and ensure stream closed
-        self._isPlaying = False
-        self.playPauseBtn.setText('Play')
-        self.playPauseBtn.setIcon(Icons.Filled.Rounded.play_arrow.update(color='#1e6e0f'))
+        self._resetPlaybackControls('Playback completed')
         self.audioStopBtn.setEnabled(False)
-        self.playbackStatus.setText('Playback completed')
-        self._playbackUpdateTimer.stop()
-
-        # close and clear stream if exists and reset frame index
-        if self._playbackStream:
-            try:
-                self._playbackStream.stop()
-            except Exception:
-                pass
-            try:
-                self._playbackStream.close()
-            except Exception:
-                pass
-            self._playbackStream = None
-
-        with self._playbackFrameLock:
-            # reset frame index so next play starts from zero
-            self._playbackFrameIndex = 0
-
-        # join the playback thread
-        if self._playbackThread and self._playbackThread.is_alive():
-            self._playbackThread.join(timeout=0.5)
-            self._playbackThread = None
-
-        # fully reset playback to initial state so UI and cursor return to start
-        with self._playbackFrameLock:
-            self._playbackFrameIndex = 0
-        self._playbackPosition = 0
         # move waveform cursor to start
         self.waveformWidget.update_position(0)
-        # ensure VU cleared and timer stopped
+
+    def _onSeekRequested(self, position: float):
+        """Waveform click: move playback of the loaded file there (playing or paused)."""
+        if audioEngine.filePath is None:
+            return
+        self.waveformWidget.update_position(position)
+        audioEngine.seek(position)
+
+    @pyqtSlot(str, object)
+    def _onAudioStateChanged(self, state, info):
+        """Follow the audio engine: end of file, finished recordings and errors (main thread)."""
         try:
-            self._vuTimer.stop()
-            with self._vu_lock:
-                self._vu_level = 0.0
-            if hasattr(self, 'vuWidget') and self.vuWidget:
-                self.vuWidget.update_levels([0.0] * self.vuWidget.num_bars)
-        except Exception:
-            pass
-        # ensure playback thread reference cleared
-        if self._playbackThread and self._playbackThread.is_alive():
-            try:
-                self._playbackThread.join(timeout=0.5)
-            except Exception:
-                pass
-        self._playbackThread = None
+            if state == AudioEngine.FINISHED and not audioEngine.playing:
+                # (a play queued after the end of the file has already loaded the next one)
+                self._showAudioStats(audioEngine.playbackStats)
+                self._autoStopPlayback()
+            elif state == AudioEngine.STOPPED:
+                self._showAudioStats(audioEngine.playbackStats)
+            elif state == AudioEngine.RECORDED:
+                self._liveBlocks = None
+                self._showAudioStats(audioEngine.recordStats)
+                self._saveRecording()
+            elif state == AudioEngine.ERROR:
+                if info.get('command') == 'record':
+                    # the engine ends the sink too; make sure the live worker is released either way
+                    if self._liveBlocks is not None:
+                        self._liveBlocks.put(None)
+                        self._liveBlocks = None
+                    self._recording = False
+                    self.recordBtn.setEnabled(True)
+                    self.stopBtn.setEnabled(False)
+                    self.recordingStatus.setText(f"Recording error: {info.get('error')}")
+                    self.recordingGif.stop()
+                    self.recordingGif.hide()
+                else:
+                    self._resetPlaybackControls(f"Error playing file: {info.get('error')}")
+                    self.audioStopBtn.setEnabled(False)
+        except Exception as e:
+            logger.error(f"Error in _onAudioStateChanged: {e}")
 
     # --- Analysis / model helpers (new) ---
-    def _ensure_models_loaded(self):
-        """Lazy-load models/scalers/encoders in background thread. Returns (ok, err_msg)."""
-        if getattr(self, '_models_initialized', False):
-            return True, ''
+    def _ensure_models_loaded(self, model_choice: str = 'mlp'):
+        """
+        Make sure the shared registry holds the models for `model_choice`, waiting for the background
+        preload if it is still running (call from a worker thread). Returns (ok, err_msg).
+        """
         try:
-            base = os.getcwd()  # expect model files in project root or adjust as needed
-            # load mlp model if available and keras is importable
-            if load_model and _tensorflow_available and not hasattr(self, '_mlp_model'):
-                mlp_path = os.path.join(base, 'emotiondetector_mlp_model.h5')
-                if os.path.exists(mlp_path):
-                    self._mlp_model = load_model(mlp_path)
-            # scalers / encoders
-            scaler_path = os.path.join(base, 'emotion_scaler.pkl')
-            le_path = os.path.join(base, 'emotion_labelencoder.pkl')
-            knn_path = os.path.join(base, 'knn_emotion_model.pkl')
-            if os.path.exists(scaler_path) and not hasattr(self, '_scaler_mlp'):
-                self._scaler_mlp = joblib.load(scaler_path)
-            if os.path.exists(le_path) and not hasattr(self, '_le_encoder'):
-                self._le_encoder = joblib.load(le_path)
-            if os.path.exists(knn_path) and not hasattr(self, '_knn_model'):
-                self._knn_model = joblib.load(knn_path)
-            self._models_initialized = True
+            modelRegistry.get(model_choice)
             return True, ''
         except Exception as e:
             return False, str(e)
 
-    def _estimate_f0_autocorr(self, frame, sr, fmin=50, fmax=800):
-        """Estimate f0 for a short frame using autocorrelation. Returns f0 in Hz or 0.0."""
+    def _loaded_models(self, model_choice: str = 'mlp'):
+        """Models/scalers/encoders for `model_choice` from the shared registry, keyed for predict_windows."""
         try:
-            # window and zero-mean
-            x = frame - np.mean(frame)
-            if x.size < 3:
-                return 0.0
-            corr = np.correlate(x, x, mode='full')
-            corr = corr[corr.size // 2:]
-            # ignore zero-lag
-            corr[0] = 0.0
-            # define lag range
-            min_lag = int(sr / fmax) if fmax > 0 else 1
-            max_lag = int(sr / fmin) if fmin > 0 else len(corr) - 1
-            max_lag = min(max_lag, len(corr) - 1)
-            if max_lag <= min_lag:
-                return 0.0
-            peak_region = corr[min_lag:max_lag + 1]
-            if peak_region.size == 0:
-                return 0.0
-            peak = np.argmax(peak_region) + min_lag
-            if corr[peak] <= 0:
-                return 0.0
-            f0 = float(sr) / float(peak) if peak > 0 else 0.0
-            return float(f0)
+            return modelRegistry.get(model_choice)
         except Exception:
-            return 0.0
+            return {}
+
+    def _activeModelChoice(self) -> str:
+        choice = self._modelChoices.get(self._activeModel, 'knn')
+        return 'knn' if choice == 'mlp' and not _tensorflow_available else choice
 
-    def _extract_window_features(self, sig, sr):
+    def _resolveModelChoice(self, model_choice: str, low_power: bool) -> str:
         """
-        Given a 1-D signal for one window, split into small frames and compute arrays:
-        f0_contour, energy_contour — these mirror the original ML_feed expectations.
+        The quantized counterpart of `model_choice` in low-power mode, if its file could be loaded;
+        otherwise `model_choice` itself. May wait for the model to load (call from a worker thread).
         """
-        try:
-            frame_len = int(sr * 0.06)  # 60ms
-            hop = int(frame_len // 2)
-            if frame_len < 16:
-                frame_len = 256
-                hop = 128
-            frames = []
-            for start in range(0, max(1, len(sig) - frame_len + 1), hop):
-                frames.append(sig[start:start + frame_len])
-            if not frames:
-                frames = [sig]
-            f0s = []
-            energies = []
-            for fr in frames:
-                # energy (RMS)
-                frf = np.asarray(fr, dtype=np.float32)
-                if frf.size == 0:
-                    energies.append(0.0)
-                    f0s.append(0.0)
-                    continue
-                rms = float(np.sqrt(np.mean(frf * frf)))
-                energies.append(rms)
-                # estimate f0 via autocorr
-                f0 = self._estimate_f0_autocorr(frf, sr)
-                f0s.append(f0)
-            return np.array(f0s, dtype=np.float32), np.array(energies, dtype=np.float32)
-        except Exception:
-            return np.array([], dtype=np.float32), np.array([], dtype=np.float32)
+        if not low_power:
+            return model_choice
+        lp = low_power_choice(model_choice)
+        if self._loaded_models(lp).get(lp) is not None:
+            return lp
+        logger.warning(f"No low-power model for {model_choice}, using the full model")
+        return model_choice
+
+    def _preloadModels(self):
+        """Warm up the active model first, then the others, without blocking the UI."""
+        active = self._activeModelChoice()
+        others = [c for c in MODEL_CHOICES if c != active]
+        modelRegistry.preload([active] + others)
+
+    def _trimModels(self):
+        """Timer: under memory pressure, unload models other than the active one."""
+        active = self._activeModelChoice()
+        modelRegistry.trimMemory(keep=(active, low_power_choice(active)))
+
+    @pyqtSlot(str, str)
+    def _onModelStateChanged(self, model_choice, state):
+        """Reflect model readiness on the model buttons (main thread)."""
+        model = next((m for m, c in self._modelChoices.items() if c == model_choice), None)
+        btn = self._modelButtonMap.get(model)
+        if btn is None or not btn.isEnabled():
+            return
+        if state == ModelRegistry.FAILED:
+            btn.setToolTip(f"{model.value} model failed to load: {modelRegistry.error(model_choice)}")
+            if model == self._activeModel:
+                self.playbackStatus.setText(f"{model.value} model failed to load")
+        else:
+            btn.setToolTip(f"{model.value} model: {state}")
 
-    def _run_analysis(self, file_path, model_choice: str = 'mlp'):
+    def _getFeatureCache(self) -> Optional[FeatureCache]:
+        """Shared on-disk feature cache, or None if it is disabled or its folder is unusable."""
+        if self._featureCacheMaxBytes <= 0:
+            return None
+        if HomeView._featureCache is None:
+            try:
+                HomeView._featureCache = FeatureCache(max_bytes=self._featureCacheMaxBytes)
+            except Exception as e:
+                # disable for the rest of the session instead of retrying on every analysis
+                logger.error(f"Feature cache unavailable: {e}")
+                HomeView._featureCacheMaxBytes = 0
+        return HomeView._featureCache
+
+    def _run_analysis(
+        self, file_path, model_choice: str = 'mlp', batch_size: Optional[int] = None,
+        streaming: Optional[bool] = None, job: Optional[int] = None, cancel: Optional[threading.Event] = None,
+        low_power: bool = False, adaptive: bool = False, compare: bool = False
+    ):
         """
-        Worker function: segment file into overlapping windows, extract features per window,
-        predict per-window emotion and probabilities, aggregate results.
+        Worker function: run the core.analysis pipeline (see analyze_file) on `file_path` with
+        the models loaded for this view, the shared feature cache and the view's batch size,
+        streaming threshold and analysis sample rate. With a `job` id, partial results are emitted
+        through analysisProgress while the file is analysed; setting `cancel` stops the analysis at the
+        next block or batch. `low_power` swaps in the quantized model when one is available;
+        `adaptive` scores a coarse grid first and only refines where the emotion changes.
+        With `compare`, the MLP and the KNN score the same features in one pass (see analyze_models)
+        and the result's timeline and summary are their averaged ensemble.
         Returns a dict result.
         """
-        result = {'ok': False, 'error': '', 'timeline': [], 'summary': {}}
-        try:
-            ok, err = self._ensure_models_loaded()
-            if not ok:
-                result['error'] = f"Model load error: {err}"
-                return result
-
-            # read audio using soundfile
-            data, sr = sf.read(file_path, always_2d=True)
-            # mono
-            if data.ndim > 1 and data.shape[1] > 1:
-                sig = np.mean(data, axis=1)
-            else:
-                sig = data.flatten()
-            total_len = len(sig)
-            total_sec = total_len / float(sr) if sr else 0.0
-            # sliding windows
-            win_sec = 1.0
-            hop_sec = 0.5
-            win = int(win_sec * sr)
-            hop = int(hop_sec * sr)
-            if win <= 0:
-                win = total_len
-                hop = win
-            idx = 0
-            window_predictions = []
-            emotions = []
-            probs_list = []
-            windows_info = []
-            while idx < total_len:
-                wsig = sig[idx: idx + win]
-                if wsig.size == 0:
-                    break
-                f0s, energies = self._extract_window_features(wsig, sr)
-                # build ML_feed-like features
-                if f0s.size == 0 or energies.size == 0:
-                    features = np.zeros((1, 8), dtype=np.float32)
+        options = dict(
+            batch_size=batch_size or self._analysisBatchSize,
+            streaming=streaming,
+            streaming_threshold_sec=self._streamingThresholdSec,
+            cache=self._getFeatureCache(),
+            on_progress=(lambda update: self.analysisProgress.emit(job, update)) if job is not None else None,
+            cancel=cancel,
+            sample_rate=self._analysisSampleRate,
+            vad=self._analysisVad,
+        )
+        if compare:
+            models = {}
+            errors = []
+            for choice in self._compareModelChoices:
+                choice = self._resolveModelChoice(choice, low_power)
+                ok, err = self._ensure_models_loaded(choice)
+                if ok:
+                    models[choice] = self._loaded_models(choice)
                 else:
-                    feed = [
-                        float(np.mean(f0s)), float(np.var(f0s)), float(np.max(f0s)), float(np.min(f0s)),
-                        float(np.mean(energies)), float(np.var(energies)), float(np.max(energies)), float(np.min(energies))
-                    ]
-                    features = np.array(feed, dtype=np.float32).reshape(1, -1)
-                # predict
-                pred_label = None
-                pred_probs = None
-                try:
-                    if model_choice == 'mlp' and hasattr(self, '_mlp_model'):
-                        if hasattr(self, '_scaler_mlp'):
-                            features_scaled = self._scaler_mlp.transform(features)
-                        else:
-                            features_scaled = features
-                        probs = self._mlp_model.predict(features_scaled, verbose=0)
-                        probs = probs[0] if probs.ndim > 1 else probs
-                        if hasattr(self, '_le_encoder'):
-                            labels = list(self._le_encoder.classes_)
-                        else:
-                            labels = [str(i) for i in range(probs.shape[0])]
-                        pred_idx = int(np.argmax(probs))
-                        pred_label = labels[pred_idx]
-                        pred_probs = dict(zip(labels, [float(x) for x in probs]))
-                    elif model_choice == 'knn' and hasattr(self, '_knn_model'):
-                        if hasattr(self._knn_model, 'predict_proba'):
-                            probs = self._knn_model.predict_proba(features)[0]
-                            labels = list(self._le_encoder.classes_) if hasattr(self, '_le_encoder') else [str(i) for i in range(len(probs))]
-                            pred_probs = dict(zip(labels, [float(x) for x in probs]))
-                            pred_label = labels[int(np.argmax(probs))]
-                        else:
-                            pred_raw = self._knn_model.predict(features)[0]
-                            if hasattr(self, '_le_encoder'):
-                                pred_label = self._le_encoder.inverse_transform([pred_raw])[0]
-                            else:
-                                pred_label = str(pred_raw)
-                            pred_probs = None
-                    else:
-                        # fallback: use energy-based heuristic
-                        avg_rms = float(np.mean(energies)) if energies.size else 0.0
-                        if avg_rms < 0.02:
-                            pred_label = 'neutral'
-                        elif avg_rms < 0.08:
-                            pred_label = 'calm'
-                        else:
-                            pred_label = 'excited'
-                        pred_probs = {pred_label: 1.0}
-                except Exception as e:
-                    pred_label = 'error'
-                    pred_probs = {'error': 1.0}
-                # record
-                t_start = idx / float(sr)
-                t_end = min(total_sec, (idx + win) / float(sr))
-                window_predictions.append(pred_label)
-                probs_list.append(pred_probs)
-                windows_info.append({'start': t_start, 'end': t_end, 'label': pred_label, 'probs': pred_probs})
-                idx += hop
-
-            # aggregate durations
-            duration_map = {}
-            prob_accum = {}
-            for w in windows_info:
-                lbl = w['label']
-                dur = max(0.0, w['end'] - w['start'])
-                duration_map[lbl] = duration_map.get(lbl, 0.0) + dur
-                if w.get('probs'):
-                    for k, v in (w['probs'] or {}).items():
-                        prob_accum.setdefault(k, []).append(float(v))
-            # compute percentages
-            summary = {}
-            for lbl, dur in duration_map.items():
-                pct = (dur / total_sec) * 100.0 if total_sec > 1e-6 else 0.0
-                avg_prob = float(np.mean(prob_accum.get(lbl, [1.0]))) if prob_accum.get(lbl) else None
-                summary[lbl] = {'duration_s': round(dur, 3), 'pct': round(pct, 2), 'avg_prob': (round(avg_prob, 4) if avg_prob is not None else None)}
-            result['ok'] = True
-            result['timeline'] = windows_info
-            result['summary'] = summary
-            return result
-        except Exception as e:
-            result['error'] = str(e)
-            return result
+                    errors.append(err)
+                    logger.warning(f"Leaving {choice} out of the comparison: {err}")
+            if not models:
+                return {
+                    'ok': False, 'error': f"Model load error: {'; '.join(errors)}", 'cancelled': False,
+                    'timeline': [], 'summary': {}
+                }
+            return analyze_models(file_path, models, ensemble=len(models) > 1, **options)
+        model_choice = self._resolveModelChoice(model_choice, low_power)
+        ok, err = self._ensure_models_loaded(model_choice)
+        if not ok:
+            return {
+                'ok': False, 'error': f"Model load error: {err}", 'cancelled': False, 'timeline': [], 'summary': {}
+            }
+        return analyze_file(
+            file_path, model_choice, self._loaded_models(model_choice), adaptive=adaptive, **options
+        )
+
+    def _cancelAnalysis(self):
+        """Stop the running analysis job (if any) and drop its pending updates."""
+        if threadPool.cancelJob(self._analysisJobKey):
+            self._analysisJob += 1
+            self._analysisSegment = None
+            self.waveformWidget.clear_analysis_segments()
+            self._init_emotion_rows()
 
     def _init_emotion_rows(self):
         """Initialize emotion rows with zero values before analysis."""
@@ -1693,9 +1565,47 @@ class HomeView(View):
             return
         self._send_emotion_to_arduino(self._last_predicted_emotion)
 
-    # --- Analysis result hook ---
-    def _onAnalysisComplete(self, res, file_path):
+    # --- Analysis result hooks ---
+    @pyqtSlot(int, object)
+    def _onAnalysisProgress(self, job, update):
+        """Partial analysis result (main thread): refresh the rows and extend the waveform segments."""
+        if job != self._analysisJob:
+            return
+        total = update.get('total_sec') or 0.0
+        if total > 0:
+            pct = min(100.0, 100.0 * update.get('processed_sec', 0.0) / total)
+            self.playbackStatus.setText(f"Analyzing audio... {pct:.0f}%")
+        self._update_emotion_rows(update.get('summary', {}))
+        self._extendAnalysisSegments(update.get('entries', []))
+
+    def _extendAnalysisSegments(self, entries):
+        """Merge consecutive same-label windows and shade each finished run on the waveform."""
+        for w in entries:
+            seg = self._analysisSegment
+            if seg is not None and seg[0] == w['label'] and w['start'] <= seg[2]:
+                seg[2] = w['end']
+                continue
+            if seg is not None:
+                self._drawAnalysisSegment(seg[0], seg[1], min(seg[2], w['start']))
+            self._analysisSegment = [w['label'], w['start'], w['end']]
+
+    def _finishAnalysisSegments(self):
+        seg = self._analysisSegment
+        if seg is not None:
+            self._drawAnalysisSegment(*seg)
+        self._analysisSegment = None
+
+    def _drawAnalysisSegment(self, label, start, end):
+        color = next((info['color'] for info in self._emotion_list if info['key'] == label), '#888888')
+        self.waveformWidget.add_analysis_segment(start, end, color)
+
+    def _onAnalysisComplete(self, res, file_path, job: Optional[int] = None):
         """Callback on main thread after analysis completes."""
+        if job is not None and job != self._analysisJob:
+            return
+        self._finishAnalysisSegments()
+        if isinstance(res, dict) and res.get('cancelled'):
+            return
         try:
             if not isinstance(res, dict) or not res.get('ok'):
                 err = res.get('error') if isinstance(res, dict) else str(res)
@@ -1704,11 +1614,24 @@ class HomeView(View):
                 self._init_emotion_rows()
                 return
             summary = res.get('summary', {})
-            # pick top emotion by duration
-            if summary:
-                top = max(summary.items(), key=lambda kv: kv[1]['duration_s'])
+            # pick top emotion by duration; dead air (SILENCE_LABEL) is not an emotion
+            emotions = {lbl: info for lbl, info in summary.items() if lbl != SILENCE_LABEL}
+            if emotions:
+                top = max(emotions.items(), key=lambda kv: kv[1]['duration_s'])
                 top_label, top_info = top
-                self.playbackStatus.setText(f"Top emotion: {top_label} ({top_info['pct']}%)")
+                status = f"Top emotion: {top_label} ({top_info['pct']}%)"
+                # compare mode: the summary is the ensemble's, show what each model made of it too
+                per_model = []
+                for model, model_res in (res.get('models') or {}).items():
+                    model_emotions = {
+                        lbl: info for lbl, info in model_res['summary'].items() if lbl != SILENCE_LABEL
+                    }
+                    if model_emotions:
+                        model_top = max(model_emotions.items(), key=lambda kv: kv[1]['duration_s'])[0]
+                        per_model.append(f"{model}: {model_top}")
+                if len(per_model) > 1:
+                    status += f" — {', '.join(per_model)}"
+                self.playbackStatus.setText(status)
                 self._last_predicted_emotion = top_label
                 # Auto-send to Arduino if checked
                 if self.autoSendCheck.isChecked():
@@ -1744,14 +1667,20 @@ class HomeView(View):
                 logger.error("MLP model unavailable: TensorFlow DLL load failed")
                 self._init_emotion_rows()
                 return
-            model_choice = 'mlp'
-        else:
-            model_choice = 'knn'
+        model_choice = self._activeModelChoice()
         self.playbackStatus.setText('Analyzing audio...')
         self._init_emotion_rows()
-        # run analysis in background and call back on completion
-        threadPool.start(
-            self._run_analysis, file_path, model_choice, callback=lambda res: self._onAnalysisComplete(res, file_path)
+        self._analysisJob += 1
+        job = self._analysisJob
+        self._analysisSegment = None
+        self.waveformWidget.clear_analysis_segments()
+        # run analysis in background, cancelling any analysis still running;
+        # partial results arrive through analysisProgress
+        threadPool.startJob(
+            self._analysisJobKey, self._run_analysis, file_path, model_choice, job=job,
+            low_power=self.lowPowerCheck.isChecked(), adaptive=self.adaptiveCheck.isChecked(),
+            compare=self.compareCheck.isChecked(),
+            callback=lambda res: self._onAnalysisComplete(res, file_path, job)
         )
 
     def onCreate(self) -> None:
@@ -1763,7 +1692,7 @@ class HomeView(View):
     def _updatePlaybackPosition(self):
         """Called periodically by timer to move the waveform playback cursor."""
         try:
-            pos = getattr(self, '_playbackPosition', 0.0)
+            pos = audioEngine.position
             # only update if waveform widget exists
             if hasattr(self, 'waveformWidget') and self.waveformWidget is not None:
                 # ensure numeric value
@@ -1780,8 +1709,8 @@ class HomeView(View):
     def _updateVuMeter(self):
         """Timer-driven UI update for VU meter (main thread)."""
         try:
-            with self._vu_lock:
-                level = float(getattr(self, '_vu_level', 0.0))
+            level = audioEngine.level
+            self._showAudioStats(audioEngine.playbackStats)
             # produce two lively bars with small independent jitter
             rng = np.random.RandomState(int(time() * 1000) & 0xFFFF)
             bars = []
@@ -1793,6 +1722,14 @@ class HomeView(View):
         except Exception:
             pass
 
+    def _showAudioStats(self, stats: CallbackStats):
+        """Summarise real-time callback health (underflows, overflows, callback time) under the VU meter."""
+        s = stats.snapshot()
+        self.audioStatsLabel.setText(
+            f"{stats.name}: {s['underflows']} underflows · {s['overflows']} overflows · max {s['max_ms']:.2f} ms"
+        )
+        self.audioStatsLabel.setToolTip(stats.summary())
+
     def _onModelSelected(self, model: Model):
         """Mark selected model button as active (radio behavior) and store active model."""
         try:
@@ -1,4 +1,5 @@
-from typing import TypeVar, Dict, Callable, Optional
+import threading
+from typing import TypeVar, Dict, Callable, Optional, Hashable, Tuple
 from PyQt6.QtCore import QThreadPool
 from vvecon.qt.logger import logger
 
@@ -13,6 +14,7 @@ class ThreadPool:
     _instance: Optional[T] = None
     threadPool: QThreadPool = QThreadPool()
     _tasks: Dict[int, Worker] = dict()  # Use id(func) as key
+    _jobs: Dict[Hashable, Tuple[Worker, threading.Event]] = dict()  # cancellable jobs by caller key
 
     @classmethod
     def getInstance(cls) -> T:
@@ -59,6 +61,54 @@ class ThreadPool:
             if retry:
                 self.start(func, *args, delay=delay, callback=callback, retry=False, **kwargs)
 
+    def startJob(
+        self,
+        key: Hashable,
+        func: Callable,
+        *args,
+        callback: Optional[Callable] = None,
+        **kwargs
+    ) -> threading.Event:
+        """
+        Run func(*args, cancel=<threading.Event>, **kwargs) on a fresh Worker.
+        A job already registered under `key` is cancelled first: its event is set, its callback
+        is disconnected and, if it has not started yet, it is taken back out of the queue.
+        `func` is expected to check the event and return early, freeing its pool thread.
+        Returns the new job's cancellation event.
+        """
+        self.cancelJob(key)
+        cancel = threading.Event()
+        worker = Worker(func)
+        worker.setData(*args, cancel=cancel, **kwargs)
+        if callback:
+            worker.signals.finished.connect(callback)
+        worker.signals.finished.connect(lambda _result: self._jobFinished(key, worker))
+        self._jobs[key] = (worker, cancel)
+        self.threadPool.start(worker)
+        return cancel
+
+    def cancelJob(self, key: Hashable) -> bool:
+        """Cancel the job registered under `key`. Returns False if there was none."""
+        job = self._jobs.pop(key, None)
+        if job is None:
+            return False
+        worker, cancel = job
+        cancel.set()
+        try:
+            worker.signals.finished.disconnect()
+        except (TypeError, RuntimeError):
+            pass
+        try:
+            self.threadPool.tryTake(worker)
+        except RuntimeError as e:
+            logger.error(f"Error in ThreadPool.cancelJob: {e}")
+        return True
+
+    def _jobFinished(self, key: Hashable, worker: Worker):
+        job = self._jobs.get(key)
+        if job is not None and job[0] is worker:
+            del self._jobs[key]
+
     def stop(self, func: Callable):
         func_id = id(func)
         if func_id in self._tasks:
@@ -67,6 +117,8 @@ class ThreadPool:
                 runnable.stop()
 
     def stopAll(self):
+        for key in list(self._jobs):
+            self.cancelJob(key)
         try:
             for func_id, runnable in list(self._tasks.items()):
                 runnable.stop()
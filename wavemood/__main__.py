@@ -0,0 +1,402 @@
+"""
+Headless WaveMood entry point.
+
+    python -m wavemood analyze recording.wav [more files or folders ...] [--model knn|mlp|mlp_numpy] [--format json|csv]
+    python -m wavemood analyze recording.wav --model knn mlp_numpy --ensemble
+    python -m wavemood export-mlp emotiondetector_mlp_model.h5 --scaler scaler.pkl --encoder encoder.pkl
+    python -m wavemood quantize --models-dir res/nlm [--mlp-dtype float16] [--knn-dtype float16]
+    python -m wavemood bench resample|yin|vad|wav [recording.wav ...] [--rates 44100 48000]
+
+Only NumPy/soundfile and the selected model backend are imported: Qt is never loaded and
+TensorFlow only when --model mlp is requested.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+
+__all__ = ['main']
+
+_RESULT_FIELDS = ('file', 'start', 'end', 'label', 'prob')
+_SUMMARY_FIELDS = ('file', 'label', 'duration_s', 'pct', 'avg_prob')
+_MODEL_FIELD = 'model'  # leading csv column when several models are scored
+
+
+def _collect_files(paths):
+    from core.analysis import iter_audio_files
+
+    for path in paths:
+        if os.path.isdir(path):
+            yield from iter_audio_files(path)
+        else:
+            yield path
+
+
+def _iter_results(args, files):
+    from core.analysis import (
+        MODEL_CHOICES, BatchAnalyzer, FeatureCache, analyze_file, analyze_models, load_models, low_power_choice
+    )
+
+    choices = list(dict.fromkeys(low_power_choice(m) if args.low_power else m for m in args.model))
+    multi = len(choices) > 1 or args.ensemble
+    if len(files) > 1 and args.workers != 1:
+        analyzer = BatchAnalyzer(
+            choices if multi else choices[0], model_dir=args.models_dir, max_workers=args.workers,
+            batch_size=args.batch_size, use_cache=not args.no_cache, sample_rate=args.sample_rate or None,
+            vad=not args.no_vad, adaptive=args.adaptive, coarse_hop_sec=args.coarse_hop, ensemble=args.ensemble,
+            streaming=args.streaming
+        )
+        yield from analyzer.run(files)
+        return
+    models = {c: load_models(args.models_dir, **{k: k == c for k in MODEL_CHOICES}) for c in choices}
+    cache = None if args.no_cache else FeatureCache()
+    for path in files:
+        if multi:
+            yield path, analyze_models(
+                path, models, ensemble=args.ensemble, batch_size=args.batch_size, streaming=args.streaming,
+                cache=cache, sample_rate=args.sample_rate or None, vad=not args.no_vad
+            )
+            continue
+        yield path, analyze_file(
+            path, choices[0], models[choices[0]], batch_size=args.batch_size, streaming=args.streaming, cache=cache,
+            sample_rate=args.sample_rate or None, vad=not args.no_vad, adaptive=args.adaptive,
+            coarse_hop_sec=args.coarse_hop
+        )
+
+
+def _model_results(res):
+    """(model, {'timeline', 'summary'}) per scored model, then the ensemble if there is one."""
+    results = list(res.get('models', {}).items())
+    if res.get('ensemble') is not None:
+        from core.analysis import ENSEMBLE
+        results.append((ENSEMBLE, res['ensemble']))
+    return results
+
+
+def _write_json(out, results, summary_only):
+    doc = {}
+    for path, res in results:
+        entry = {'ok': res.get('ok', False), 'error': res.get('error', ''), 'summary': res.get('summary', {})}
+        if not summary_only:
+            entry['timeline'] = res.get('timeline', [])
+        if 'models' in res:
+            entry['models'] = {
+                model: (r['summary'] if summary_only else r) for model, r in _model_results(res)
+            }
+        doc[path] = entry
+    json.dump(doc, out, indent=2, default=float)
+    out.write('\n')
+
+
+def _write_csv(out, results, summary_only, multi=False):
+    writer = csv.writer(out)
+    fields = _SUMMARY_FIELDS if summary_only else _RESULT_FIELDS
+    writer.writerow(((_MODEL_FIELD,) if multi else ()) + fields)
+    for path, res in results:
+        if not res.get('ok'):
+            print(f"{path}: {res.get('error')}", file=sys.stderr)
+            continue
+        for model, r in (_model_results(res) if multi else [(None, res)]):
+            prefix = [model] if multi else []
+            if summary_only:
+                for label, info in r['summary'].items():
+                    writer.writerow(prefix + [path, label, info['duration_s'], info['pct'], info['avg_prob']])
+            else:
+                for w in r['timeline']:
+                    prob = (w['probs'] or {}).get(w['label']) if w['probs'] else None
+                    writer.writerow(prefix + [path, f"{w['start']:.3f}", f"{w['end']:.3f}", w['label'], prob])
+
+
+def analyze(args) -> int:
+    multi = len(set(args.model)) > 1 or args.ensemble
+    if multi and args.adaptive:
+        print('--adaptive refines per model; use it with a single --model.', file=sys.stderr)
+        return 2
+    files = list(_collect_files(args.paths))
+    if not files:
+        print('No audio files found.', file=sys.stderr)
+        return 2
+    failed = []
+
+    def results():
+        for path, res in _iter_results(args, files):
+            if not res.get('ok'):
+                failed.append(path)
+            yield path, res
+
+    out = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.format == 'csv':
+            _write_csv(out, results(), args.summary_only, multi)
+        else:
+            _write_json(out, results(), args.summary_only)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 1 if failed else 0
+
+
+def export_mlp(args) -> int:
+    import joblib
+    from core.analysis import MLP_NUMPY_FILE, NumpyMLP
+
+    scaler = joblib.load(args.scaler) if args.scaler else None
+    encoder = joblib.load(args.encoder) if args.encoder else None
+    mlp = NumpyMLP.fromKeras(args.model, scaler, encoder)
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.model)), MLP_NUMPY_FILE)
+    mlp.save(output)
+    print(f"Wrote {output} ({mlp.nFeatures} features -> {mlp.nClasses} classes, {len(mlp.layers)} dense layers)")
+    return 0
+
+
+def quantize(args) -> int:
+    import joblib
+    import numpy as np
+    from core.analysis import (
+        KNN_ENCODER_FILE, KNN_FILE, KNN_LOW_POWER_FILE, MLP_LOW_POWER_FILE, MLP_NUMPY_FILE, MODELS_DIR, NumpyKNN,
+        NumpyMLP, QuantizedKNN, QuantizedMLP, calibration_features, quantization_report
+    )
+
+    base = args.models_dir or MODELS_DIR
+    output = args.output_dir or base
+    knn = joblib.load(os.path.join(base, KNN_FILE))
+    encoder_path = args.encoder or os.path.join(base, KNN_ENCODER_FILE)
+    encoder = joblib.load(encoder_path) if os.path.exists(encoder_path) else None
+    knn_classes = encoder.inverse_transform(knn.classes_) if encoder is not None else knn.classes_
+    # calibrate on the given recordings, or on the KNN training matrix (which also has true labels)
+    if args.calibrate:
+        features = calibration_features(_collect_files(args.calibrate))
+        labels = None
+    else:
+        features = np.asarray(knn._fit_X, dtype=np.float32)
+        labels = np.asarray(knn_classes)[knn._y]
+    if not len(features):
+        print('No calibration features.', file=sys.stderr)
+        return 2
+
+    reports = {}
+    mlp_path = os.path.join(base, MLP_NUMPY_FILE)
+    if os.path.exists(mlp_path):
+        mlp = NumpyMLP.load(mlp_path)
+        q_mlp = QuantizedMLP.fromMLP(mlp, args.mlp_dtype)
+        q_mlp.save(os.path.join(output, MLP_LOW_POWER_FILE))
+        reports[f'mlp {args.mlp_dtype}'] = quantization_report(mlp, q_mlp, features, labels)
+    else:
+        print(f"{mlp_path} not found, run export-mlp first; skipping the MLP.", file=sys.stderr)
+    q_knn = QuantizedKNN.fromSklearn(
+        knn, args.knn_dtype, None if labels is not None else features, encoder, percentile=args.percentile
+    )
+    q_knn.save(os.path.join(output, KNN_LOW_POWER_FILE))
+    # against the NumpyKNN load_models runs for 'knn', not the sklearn estimator
+    reports[f'knn {args.knn_dtype}'] = quantization_report(
+        NumpyKNN.fromSklearn(knn), q_knn, features, labels, reference_classes=knn_classes
+    )
+
+    print(
+        f"{'model':<14}{'agree':>8}{'acc ref':>9}{'acc q':>8}{'ms ref':>9}{'ms q':>8}"
+        f"{'KB ref':>9}{'KB q':>8}{'KB file':>9}"
+    )
+    for name, r in reports.items():
+        acc = (f"{r['reference_accuracy']:>9.3f}{r['quantized_accuracy']:>8.3f}"
+               if 'reference_accuracy' in r else f"{'-':>9}{'-':>8}")
+        print(
+            f"{name:<14}{r['agreement']:>8.3f}{acc}{r['reference_ms']:>9.2f}{r['quantized_ms']:>8.2f}"
+            f"{r['reference_bytes'] / 1024:>9.1f}{r['quantized_bytes'] / 1024:>8.1f}"
+            f"{r['quantized_stored_bytes'] / 1024:>9.1f}"
+        )
+    print(
+        f"({len(features)} windows; ms per 1024 windows; KB ref/q resident in memory, KB file the quantized "
+        f"arrays before compression; written to {output})"
+    )
+    return 0
+
+
+def _bench_signals(args):
+    import soundfile as sf
+    from core.analysis import downmix, synthetic_speech
+
+    if args.files:
+        for path in _collect_files(args.files):
+            data, sr = sf.read(path, dtype='float32', always_2d=True)
+            yield os.path.basename(path), downmix(data), sr
+    else:
+        for sr in args.rates:
+            sig = synthetic_speech(args.duration, sr, speech_ratio=args.speech_ratio)
+            yield f'synthetic {args.duration:g}s', sig, sr
+
+
+def _bench_yin(args) -> int:
+    from core.analysis import resample, yin_benchmark
+
+    print(f"{'input':<24}{'frames':>8}{'yin s':>9}{'autocorr s':>12}{'librosa s':>11}{'max err':>10}{'agree':>8}")
+    for name, sig, sr in _bench_signals(args):
+        sig, sr = resample(sig, sr, args.sample_rate or sr), args.sample_rate or sr
+        for frame_sec in args.frame_sec:
+            r = yin_benchmark(sig, sr, int(frame_sec * sr), repeats=args.repeats)
+            label = f"{name[:14]} {frame_sec:g}s"
+            if r['librosa_s'] is None:
+                parity = f"{'-':>11}{'-':>10}{'-':>8}"
+            else:
+                parity = f"{r['librosa_s']:>11.3f}{r['max_rel_err']:>10.1e}{r['agreement']:>8.3f}"
+            print(f"{label:<24}{r['frames']:>8}{r['yin_s']:>9.3f}{r['autocorr_s']:>12.3f}{parity}")
+    print(f"(best of {args.repeats}; parity against librosa.yin where installed)")
+    return 0
+
+
+def _bench_vad(args) -> int:
+    from core.analysis import MODEL_CHOICES, load_models, resample, vad_benchmark
+
+    models = load_models(args.models_dir, **{c: c == args.model for c in MODEL_CHOICES})
+    print(f"{'input':<24}{'windows':>9}{'speech':>8}{'no vad s':>10}{'vad s':>8}{'speedup':>9}")
+    for name, sig, sr in _bench_signals(args):
+        sig, sr = resample(sig, sr, args.sample_rate or sr), args.sample_rate or sr
+        r = vad_benchmark(sig, sr, args.model, models, repeats=args.repeats)
+        print(
+            f"{name[:23]:<24}{r['windows']:>9}{r['speech_windows']:>8}{r['off_s']:>10.3f}{r['on_s']:>8.3f}"
+            f"{r['speedup']:>8.2f}x"
+        )
+    print(f"(features + {args.model} inference, best of {args.repeats})")
+    return 0
+
+
+def _bench_wav(args) -> int:
+    import tempfile
+    from core.analysis import wav_benchmark, write_synthetic_wav
+
+    def mb(n):
+        return f"{n / (1 << 20):.1f}" if n is not None else '-'
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.files:
+            files = list(_collect_files(args.files))
+        else:
+            path = os.path.join(tmp, 'synthetic.wav')
+            files = [write_synthetic_wav(path, args.duration, args.rates[0])]
+        print(
+            f"{'input':<24}{'MB':>9}{'sf first ms':>13}{'map first ms':>14}{'sf RSS MB':>11}{'map RSS MB':>12}"
+            f"{'sf scan s':>11}{'map scan s':>12}"
+        )
+        for path in files:
+            try:
+                r = wav_benchmark(path, repeats=args.repeats)
+            except ValueError as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                continue
+            print(
+                f"{os.path.basename(path)[:23]:<24}{mb(r['file_bytes']):>9}{r['sf_first_s'] * 1e3:>13.2f}"
+                f"{r['map_first_s'] * 1e3:>14.3f}{mb(r['sf_rss_bytes']):>11}{mb(r['map_rss_bytes']):>12}"
+                f"{r['sf_scan_s']:>11.3f}{r['map_scan_s']:>12.3f}"
+            )
+    print(f"(sf.read full decode vs memory-mapped WavMap, best of {args.repeats}, warm page cache)")
+    return 0
+
+
+def bench(args) -> int:
+    from core.analysis import resample_benchmark
+
+    if args.stage == 'yin':
+        return _bench_yin(args)
+    if args.stage == 'vad':
+        return _bench_vad(args)
+    if args.stage == 'wav':
+        return _bench_wav(args)
+    print(f"{'input':<24}{'rate':>7}{'native s':>10}{'resample s':>12}{'features s':>12}{'speedup':>9}")
+    for name, sig, sr in _bench_signals(args):
+        r = resample_benchmark(sig, sr, args.sample_rate, repeats=args.repeats)
+        print(
+            f"{name[:23]:<24}{sr:>7}{r['native_s']:>10.3f}{r['resample_s']:>12.3f}{r['features_s']:>12.3f}"
+            f"{r['speedup']:>8.2f}x"
+        )
+    print(f"(feature stage, best of {args.repeats}; resampled to {args.sample_rate} Hz)")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m wavemood', description='Headless WaveMood tools.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('analyze', help='Score audio files and print emotion timelines and summaries.')
+    p.add_argument('paths', nargs='+', help='audio files or folders (scanned recursively)')
+    p.add_argument(
+        '--model', choices=('knn', 'mlp', 'mlp_numpy'), nargs='+', default=['knn'],
+        help='classifier(s) to use; several are scored on the same features in one pass (default: knn)'
+    )
+    p.add_argument('--ensemble', action='store_true', help='also average the models\' probabilities per window')
+    p.add_argument('--format', choices=('json', 'csv'), default='json', help='output format (default: json)')
+    p.add_argument('-o', '--output', help='write to this file instead of stdout')
+    p.add_argument('--summary-only', action='store_true', help='omit the per-window timeline')
+    p.add_argument('--models-dir', default=None, help='folder holding the model files (default: res/nlm)')
+    p.add_argument('--workers', type=int, default=None, help='worker processes for several files (default: all cores)')
+    p.add_argument('--batch-size', type=int, default=1024, help='windows per model call')
+    p.add_argument('--streaming', action='store_true', default=None, help='always decode block by block')
+    p.add_argument('--no-cache', action='store_true', help='do not read or write the feature cache')
+    p.add_argument('--low-power', action='store_true', help='use the quantized model (see quantize)')
+    p.add_argument('--no-vad', action='store_true', help='run pitch and the model on silent windows too')
+    p.add_argument(
+        '--adaptive', action='store_true', help='score a coarse grid first, refine only where the emotion changes'
+    )
+    p.add_argument('--coarse-hop', type=float, default=4.0, help='adaptive first-pass hop in seconds (default: 4)')
+    p.add_argument(
+        '--sample-rate', type=int, default=22050, help='analysis rate to resample to, 0 for native (default: 22050)'
+    )
+    p.add_argument('-v', '--verbose', action='store_true', help='log debug output to stderr')
+    p.set_defaults(func=analyze)
+
+    p = commands.add_parser(
+        'export-mlp', help='Convert the Keras .h5 MLP (+ scaler, encoder) into a NumPy weights file.'
+    )
+    p.add_argument('model', help='Keras .h5 model file')
+    p.add_argument('--scaler', help='fitted StandardScaler pickle applied before the model')
+    p.add_argument('--encoder', help='fitted LabelEncoder pickle with the class names')
+    p.add_argument('-o', '--output', help='weights file to write (default: next to the model)')
+    p.set_defaults(func=export_mlp)
+
+    p = commands.add_parser(
+        'quantize', help='Build the low-power (quantized) MLP and KNN and report accuracy versus latency.'
+    )
+    p.add_argument('--models-dir', default=None, help='folder holding the model files (default: res/nlm)')
+    p.add_argument('--output-dir', default=None, help='where to write the low-power models (default: models dir)')
+    p.add_argument('--mlp-dtype', choices=('int8', 'float16'), default='float16', help='MLP weights (default: float16)')
+    p.add_argument(
+        '--knn-dtype', choices=('int8', 'float16'), default='float16', help='KNN training matrix (default: float16)'
+    )
+    p.add_argument('--encoder', help='LabelEncoder pickle naming the KNN classes')
+    p.add_argument('--calibrate', nargs='+', help='recordings to calibrate on (default: the KNN training matrix)')
+    p.add_argument('--percentile', type=float, default=99.99, help='KNN calibration range percentile')
+    p.set_defaults(func=quantize)
+
+    p = commands.add_parser('bench', help='Time analysis stages on synthetic audio or on the given recordings.')
+    p.add_argument(
+        'stage', choices=('resample', 'yin', 'vad', 'wav'),
+        help='resample: native-rate features vs resample + features; yin: pitch tracker speed and librosa parity; '
+             'vad: analysis with and without silence gating; wav: sf.read vs memory-mapped WAV access'
+    )
+    p.add_argument('files', nargs='*', help='audio files or folders (default: a synthetic speech-like signal)')
+    p.add_argument(
+        '--rates', type=int, nargs='+', default=[44100, 48000], help='synthetic input rates (wav: the first)'
+    )
+    p.add_argument('--duration', type=float, default=60.0, help='synthetic input length in seconds')
+    p.add_argument('--sample-rate', type=int, default=22050, help='analysis rate (default: 22050)')
+    p.add_argument('--repeats', type=int, default=3, help='runs per stage, the best is reported')
+    p.add_argument(
+        '--frame-sec', type=float, nargs='+', default=[0.06, 0.6], help='yin frame lengths (default: 0.06 0.6)'
+    )
+    p.add_argument(
+        '--speech-ratio', type=float, default=1.0, help='share of the synthetic input that is speech (vad: try 0.2)'
+    )
+    p.add_argument('--model', choices=('knn', 'mlp', 'mlp_numpy'), default='knn', help='vad: classifier to time')
+    p.add_argument('--models-dir', default=None, help='vad: folder holding the model files (default: res/nlm)')
+    p.set_defaults(func=bench)
+
+    args = parser.parse_args(argv)
+    from vvecon.qt.logger import logger
+    logger.setLevel(logging.DEBUG if getattr(args, 'verbose', False) else logging.WARNING)
+    # the app logger configures the root logger for DEBUG; keep third-party loggers (numba via librosa) quiet
+    logging.getLogger().setLevel(logging.WARNING)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())